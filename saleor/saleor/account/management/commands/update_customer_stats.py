@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ....order.utils import calculate_customer_stats
+from ...models import CustomerStats, User
+
+
+class Command(BaseCommand):
+    help = "Recalculate the stored order statistics of all customers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of customers updated in a single transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        user_ids = list(User.objects.order_by("pk").values_list("pk", flat=True))
+        updated = 0
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start : start + batch_size]
+            stats = calculate_customer_stats(batch)
+            with transaction.atomic():
+                CustomerStats.objects.filter(user_id__in=batch).delete()
+                CustomerStats.objects.bulk_create(stats.values())
+            updated += len(stats)
+        self.stdout.write("Updated statistics of %d customers" % updated)
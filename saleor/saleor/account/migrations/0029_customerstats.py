@@ -0,0 +1,96 @@
+import django.db.models.deletion
+import django_prices.models
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, Max, Sum
+from prices import Money
+
+import saleor.core.taxes
+
+
+def backfill_customer_stats(apps, schema_editor):
+    CustomerStats = apps.get_model("account", "CustomerStats")
+    Order = apps.get_model("order", "Order")
+    Transaction = apps.get_model("payment", "Transaction")
+
+    orders = Order.objects.filter(user__isnull=False).exclude(
+        status__in=["draft", "canceled"]
+    )
+    stats = {
+        row["user_id"]: row
+        for row in orders.values("user_id").annotate(
+            number_of_orders=Count("pk"),
+            money_spent=Sum(
+                "total_gross",
+                output_field=DecimalField(
+                    max_digits=settings.DEFAULT_MAX_DIGITS,
+                    decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+                ),
+            ),
+            last_order_date=Max("created"),
+        )
+    }
+    refunds = (
+        Transaction.objects.filter(
+            payment__order__in=orders, kind="refund", is_success=True
+        )
+        .values("payment__order__user_id")
+        .annotate(refunded=Sum("amount"))
+    )
+    for row in refunds:
+        stats[row["payment__order__user_id"]]["money_spent"] -= row["refunded"]
+    CustomerStats.objects.bulk_create(
+        [
+            CustomerStats(
+                user_id=user_id,
+                number_of_orders=row["number_of_orders"],
+                money_spent=Money(row["money_spent"], settings.DEFAULT_CURRENCY),
+                last_order_date=row["last_order_date"],
+            )
+            for user_id, row in stats.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0028_user_private_meta"),
+        ("order", "0072_order_customer_search_document"),
+        ("payment", "0012_transaction_customer_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CustomerStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "number_of_orders",
+                    models.PositiveIntegerField(db_index=True, default=0),
+                ),
+                (
+                    "money_spent",
+                    django_prices.models.MoneyField(
+                        currency="USD",
+                        db_index=True,
+                        decimal_places=2,
+                        default=saleor.core.taxes.zero_money,
+                        max_digits=12,
+                    ),
+                ),
+                ("last_order_date", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_customer_stats, migrations.RunPython.noop),
+    ]
@@ -13,10 +13,13 @@ from django.forms.models import model_to_dict
 from django.utils import timezone
 from django.utils.translation import pgettext_lazy
 from django_countries.fields import Country, CountryField
+from django_prices.models import MoneyField
 from phonenumber_field.modelfields import PhoneNumber, PhoneNumberField
 from versatileimagefield.fields import VersatileImageField
 
+from ..core.taxes import zero_money
 from ..core.utils.json_serializer import CustomJsonEncoder
+from ..order.search import update_user_orders_customer_search_document
 from . import CustomerEvents
 from .validators import validate_possible_number
 
@@ -79,6 +82,13 @@ class Address(models.Model):
 
     __hash__ = models.Model.__hash__
 
+    def save(self, *args, **kwargs):
+        is_new = self.pk is None
+        super().save(*args, **kwargs)
+        if not is_new:
+            for user in User.objects.filter(default_billing_address=self):
+                update_user_orders_customer_search_document(user)
+
     def as_data(self):
         """Return the address as a dict suitable for passing as kwargs.
 
@@ -157,6 +167,14 @@ class User(PermissionsMixin, AbstractBaseUser):
 
     objects = UserManager()
 
+    # Fields used to build the customer search document of user's orders
+    ORDER_SEARCH_FIELDS = {
+        "email",
+        "first_name",
+        "last_name",
+        "default_billing_address",
+    }
+
     class Meta:
         permissions = (
             (
@@ -170,6 +188,15 @@ class User(PermissionsMixin, AbstractBaseUser):
             ),
         )
 
+    def save(self, *args, **kwargs):
+        is_new = self.pk is None
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if not is_new and (
+            update_fields is None or self.ORDER_SEARCH_FIELDS & set(update_fields)
+        ):
+            update_user_orders_customer_search_document(self)
+
     def get_full_name(self):
         if self.first_name or self.last_name:
             return ("%s %s" % (self.first_name, self.last_name)).strip()
@@ -234,3 +261,31 @@ class CustomerEvent(models.Model):
 
     def __repr__(self):
         return f"{self.__class__.__name__}(type={self.type!r}, user={self.user!r})"
+
+
+class CustomerStats(models.Model):
+    """Order statistics of a customer, kept up to date by order operations.
+
+    Draft and canceled orders are not counted and refunds are subtracted from
+    the money spent.
+    """
+
+    user = models.OneToOneField(
+        User, related_name="stats", on_delete=models.CASCADE, primary_key=True
+    )
+    number_of_orders = models.PositiveIntegerField(default=0, db_index=True)
+    money_spent = MoneyField(
+        currency=settings.DEFAULT_CURRENCY,
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=zero_money,
+        db_index=True,
+    )
+    last_order_date = models.DateTimeField(blank=True, null=True)
+
+    def __repr__(self):
+        return "%s(user_id=%r, number_of_orders=%r)" % (
+            self.__class__.__name__,
+            self.user_id,
+            self.number_of_orders,
+        )
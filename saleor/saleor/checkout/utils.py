@@ -8,7 +8,6 @@ from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.models import Sum
-from django.utils import timezone
 from django.utils.encoding import smart_text
 from django.utils.translation import get_language, pgettext, pgettext_lazy
 from prices import TaxedMoneyRange
@@ -37,6 +36,7 @@ from ..discount import VoucherType
 from ..discount.models import NotApplicable, Voucher
 from ..discount.utils import (
     decrease_voucher_usage,
+    get_active_voucher,
     get_products_voucher_discount,
     get_shipping_voucher_discount,
     get_value_voucher_discount,
@@ -360,6 +360,21 @@ def update_checkout_quantity(checkout):
     checkout.quantity = total_lines
     checkout.save(update_fields=["quantity"])
 
+
+def get_default_param_file_name():
+    """Return a parameter file name based on the current time in milliseconds."""
+    tt = time.time()
+    local_time = time.localtime(tt)
+    data_head = time.strftime("%Y-%m-%d %H:%M:%S", local_time)
+    data_secs = (tt - int(tt)) * 1000
+    time_stamp = "%s.%03d" % (data_head, data_secs)
+    now_time = (
+        "".join(time_stamp.split()[0].split("-"))
+        + "".join(time_stamp.split()[1].split(":"))
+    ).replace(".", "")
+    return "saved_files/param_files/" + now_time + ".txt"
+
+
 # 在这里把接收参数添加上
 def add_variant_to_checkout(
     checkout, variant, quantity=1, replace=False, check_quantity=True, param_file=None, user_upload_name=''
@@ -372,12 +387,6 @@ def add_variant_to_checkout(
     If `replace` is truthy then any previous quantity is discarded instead
     of added to.
     """
-    tt = time.time()
-    local_time = time.localtime(tt)
-    data_head = time.strftime("%Y-%m-%d %H:%M:%S", local_time)
-    data_secs = (tt - int(tt)) * 1000
-    time_stamp = "%s.%03d" % (data_head, data_secs)
-    now_time = ("".join(time_stamp.split()[0].split("-"))+"".join(time_stamp.split()[1].split(":"))).replace('.', '')
     line, _ = checkout.lines.get_or_create(
         variant=variant, defaults={"quantity": 0, "data": {}}
     )
@@ -401,16 +410,67 @@ def add_variant_to_checkout(
         print("param_file的类型是：",type(param_file))
         line.user_upload_name = user_upload_name
         if param_file == None:
-            param_folder = settings.MEDIA_ROOT + '/saved_files/param_files/'
-            tmp_name = param_folder + now_time + '.txt'
-            #os.system("/usr/bin/zip -q -r " + zip_name + " " + tmp_name)
-            line.param_file = 'saved_files/param_files/' + now_time + '.txt'
+            line.param_file = get_default_param_file_name()
         # 执行保存到数据库时，添加上相应的字段,到这里以后，再去修改model,增加两个字段
         line.save(update_fields=["quantity", 'param_file', 'user_upload_name'])
 
     update_checkout_quantity(checkout)
 
 
+def add_variants_to_checkout(checkout, variants, quantities, replace=False):
+    """Add product variants to checkout in bulk.
+
+    Works like `add_variant_to_checkout` called for each variant, but existing
+    lines are fetched with one query, stock is checked against the already
+    fetched variants and lines are created, updated and deleted in bulk before
+    the checkout quantity is updated once.
+    """
+    lines = {}
+    for line in checkout.lines.filter(variant__in=variants):
+        lines.setdefault(line.variant_id, line)
+
+    variants_by_pk = {}
+    new_quantities = {}
+    for variant, quantity in zip(variants, quantities):
+        variants_by_pk[variant.pk] = variant
+        line = lines.get(variant.pk)
+        current_quantity = new_quantities.get(variant.pk, line.quantity if line else 0)
+        new_quantity = quantity if replace else (quantity + current_quantity)
+        if new_quantity < 0:
+            raise ValueError(
+                "%r is not a valid quantity (results in %r)" % (quantity, new_quantity)
+            )
+        new_quantities[variant.pk] = new_quantity
+
+    lines_to_create, lines_to_update, lines_to_delete = [], [], []
+    for variant_pk, new_quantity in new_quantities.items():
+        variant = variants_by_pk[variant_pk]
+        line = lines.get(variant_pk)
+        if new_quantity == 0:
+            if line is not None:
+                lines_to_delete.append(line.pk)
+            continue
+        variant.check_quantity(new_quantity)
+        if line is None:
+            line = CheckoutLine(checkout=checkout, variant=variant, data={})
+            lines_to_create.append(line)
+        else:
+            lines_to_update.append(line)
+        line.quantity = new_quantity
+        line.param_file = get_default_param_file_name()
+        line.user_upload_name = ""
+
+    if lines_to_delete:
+        CheckoutLine.objects.filter(pk__in=lines_to_delete).delete()
+    if lines_to_create:
+        CheckoutLine.objects.bulk_create(lines_to_create)
+    if lines_to_update:
+        CheckoutLine.objects.bulk_update(
+            lines_to_update, ["quantity", "param_file", "user_upload_name"]
+        )
+    update_checkout_quantity(checkout)
+
+
 def get_shipping_address_forms(checkout, user_addresses, data, country):
     """Forms initialized with data depending on shipping address in checkout."""
     shipping_address = (
@@ -841,16 +901,13 @@ def get_voucher_discount_for_checkout(voucher, checkout, discounts=None):
     raise NotImplementedError("Unknown discount type")
 
 
-def get_voucher_for_checkout(checkout, vouchers=None, with_lock=False):
+def get_voucher_for_checkout(checkout, vouchers=None):
     """Return voucher with voucher code saved in checkout if active or None."""
     if checkout.voucher_code is not None:
         if vouchers is None:
-            vouchers = Voucher.objects.active(date=timezone.now())
+            return get_active_voucher(checkout.voucher_code)
         try:
-            qs = vouchers
-            if with_lock:
-                qs = vouchers.select_for_update()
-            return qs.get(code=checkout.voucher_code)
+            return vouchers.get(code=checkout.voucher_code)
         except Voucher.DoesNotExist:
             return None
     return None
@@ -906,9 +963,8 @@ def add_voucher_code_to_checkout(checkout: Checkout, voucher_code: str, discount
 
     Raise InvalidPromoCode() if voucher of given type cannot be applied.
     """
-    try:
-        voucher = Voucher.objects.active(date=timezone.now()).get(code=voucher_code)
-    except Voucher.DoesNotExist:
+    voucher = get_active_voucher(voucher_code)
+    if voucher is None:
         raise InvalidPromoCode()
     try:
         add_voucher_to_checkout(checkout, voucher, discounts)
@@ -1000,19 +1056,18 @@ def _get_voucher_data_for_order(checkout):
 
     :raises NotApplicable: When the voucher is not applicable in the current checkout.
     """
-    voucher = get_voucher_for_checkout(checkout, with_lock=True)
+    if not checkout.voucher_code:
+        return {}
+
+    voucher = get_voucher_for_checkout(checkout)
 
-    if checkout.voucher_code and not voucher:
+    # The usage limit is checked atomically while increasing the usage
+    if not voucher or not increase_voucher_usage(voucher):
         msg = pgettext(
             "Voucher not applicable",
             "Voucher expired in meantime. Order placement aborted.",
         )
         raise NotApplicable(msg)
-
-    if not voucher:
-        return {}
-
-    increase_voucher_usage(voucher)
     return {
         "voucher": voucher,
         "discount_amount": checkout.discount_amount,
@@ -1171,7 +1226,7 @@ def create_order(*, checkout: Checkout, order_data: dict, user: User) -> Order:
     which language to use when sending email.
     """
     from ..product.utils import allocate_stock
-    from ..order.utils import add_gift_card_to_order
+    from ..order.utils import add_gift_card_to_order, update_customer_stats
 
     order = Order.objects.filter(checkout_token=checkout.token).first()
     if order is not None:
@@ -1197,6 +1252,7 @@ def create_order(*, checkout: Checkout, order_data: dict, user: User) -> Order:
     checkout.payments.update(order=order)
 
     postprocess_order_creation(order)
+    update_customer_stats([order.user_id])
 
     # Create the order placed
     events.order_created_event(order=order, user=user)
@@ -3,11 +3,10 @@ from functools import wraps
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
-from django.utils import timezone
 from django.utils.translation import pgettext
 from django.views.decorators.http import require_POST
 
-from ...discount.models import Voucher
+from ...discount.utils import get_active_voucher
 from ..forms import CheckoutVoucherForm
 from ..models import Checkout
 from ..utils import (
@@ -56,11 +55,7 @@ def validate_voucher(view):
     @wraps(view)
     def func(request, checkout):
         if checkout.voucher_code:
-            try:
-                Voucher.objects.active(date=timezone.now()).get(
-                    code=checkout.voucher_code
-                )
-            except Voucher.DoesNotExist:
+            if get_active_voucher(checkout.voucher_code) is None:
                 remove_voucher_from_checkout(checkout)
                 msg = pgettext(
                     "Checkout warning",
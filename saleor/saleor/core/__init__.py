@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.core.checks import Warning, register
 
+default_app_config = "saleor.core.apps.CoreAppConfig"
+
 TOKEN_PATTERN = (
     "(?P<token>[0-9a-z]{8}-[0-9a-z]{4}-[0-9a-z]{4}-[0-9a-z]{4}" "-[0-9a-z]{12})"
 )
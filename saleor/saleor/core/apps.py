@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CoreAppConfig(AppConfig):
+    name = "saleor.core"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
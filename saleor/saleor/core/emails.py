@@ -1,10 +1,74 @@
+import logging
+import os
+from smtplib import SMTPException, SMTPServerDisconnected
+
 from django.contrib.sites.models import Site
+from django.core.mail import get_connection
 from django.templatetags.static import static
 
 from ..core.utils import build_absolute_uri
 
+logger = logging.getLogger(__name__)
+
+# Email connection kept open by the current worker process, as (pid, connection)
+_pooled_connection = None
+
 
 def get_email_base_context():
     site = Site.objects.get_current()
     logo_url = build_absolute_uri(static("images/logo-light.svg"))
     return {"domain": site.domain, "logo_url": logo_url, "site_name": site.name}
+
+
+def get_pooled_email_connection():
+    """Return an email connection shared by all sends of the current process.
+
+    The connection is bound to the process id so forked workers never reuse
+    a socket opened by their parent.
+    """
+    global _pooled_connection
+    pid = os.getpid()
+    if _pooled_connection is None or _pooled_connection[0] != pid:
+        connection = get_connection()
+        # Opening the connection up front keeps it alive between batches,
+        # backends close connections they had to open themselves
+        connection.open()
+        _pooled_connection = (pid, connection)
+    return _pooled_connection[1]
+
+
+def close_pooled_email_connection():
+    global _pooled_connection
+    if _pooled_connection is not None:
+        _pooled_connection[1].close()
+        _pooled_connection = None
+
+
+def _send_email_message(message):
+    connection = get_pooled_email_connection()
+    try:
+        return connection.send_messages([message])
+    except SMTPServerDisconnected:
+        # The server dropped the idle connection; reconnect once and retry
+        close_pooled_email_connection()
+        return get_pooled_email_connection().send_messages([message])
+
+
+def send_email_messages(messages):
+    """Send messages one by one over the pooled connection.
+
+    A message refused by the server is logged and skipped, so it does not
+    prevent the remaining messages from being sent.
+
+    Returns the list of successfully delivered messages.
+    """
+    sent = []
+    for message in messages:
+        try:
+            delivered = _send_email_message(message)
+        except SMTPException:
+            logger.exception("Could not send an email to %s", ", ".join(message.to))
+            continue
+        if delivered:
+            sent.append(message)
+    return sent
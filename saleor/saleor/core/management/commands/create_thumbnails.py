@@ -1,32 +1,212 @@
+import json
 import logging
+import os
+import time
+from multiprocessing import Pool
 
-from django.core.management.base import BaseCommand
-from versatileimagefield.image_warmer import VersatileImageFieldWarmer
-
-from ....product.models import ProductImage
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max, Min, Q
 
 logger = logging.getLogger(__name__)
 
+# Rendition key set, model and image field of every image warmed by the command
+THUMBNAIL_TARGETS = [
+    ("products", "product.ProductImage", "image"),
+    ("background_images", "product.Category", "background_image"),
+    ("background_images", "product.Collection", "background_image"),
+    ("user_avatars", "account.User", "avatar"),
+]
+
+
+def get_chunk_key(chunk):
+    key_set, model_label, image_attr, start, stop = chunk
+    return "%s:%s:%s:%d-%d" % (key_set, model_label, image_attr, start, stop)
+
+
+def warm_image(image, size_keys):
+    """Create renditions of the image that do not exist in the storage yet.
+
+    Returns the numbers of created and skipped renditions and a list of paths
+    of renditions that failed to be created.
+    """
+    created, skipped, failed = 0, 0, []
+    for size_key in size_keys:
+        if size_key == "url":
+            continue
+        method, size = size_key.split("__")
+        image.create_on_demand = False
+        rendition = getattr(image, method)[size]
+        if image.storage.exists(rendition.name):
+            skipped += 1
+            continue
+        image.create_on_demand = True
+        try:
+            getattr(image, method)[size]
+        except Exception:
+            logger.exception("Thumbnail generation failed", extra={"path": image.name})
+            failed.append(rendition.name)
+        else:
+            created += 1
+    return created, skipped, failed
+
+
+def warm_chunk(chunk):
+    """Warm all images of a model within a primary key range."""
+    key_set, model_label, image_attr, start, stop = chunk
+    model = apps.get_model(model_label)
+    size_keys = [
+        size_key
+        for _, size_key in settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS[key_set]
+    ]
+    instances = model.objects.filter(pk__gte=start, pk__lt=stop).exclude(
+        Q(**{image_attr: ""}) | Q(**{"%s__isnull" % image_attr: True})
+    )
+    images, created, skipped, failed = 0, 0, 0, []
+    for instance in instances.iterator():
+        images += 1
+        image_created, image_skipped, image_failed = warm_image(
+            getattr(instance, image_attr), size_keys
+        )
+        created += image_created
+        skipped += image_skipped
+        failed += image_failed
+    return chunk, images, created, skipped, failed
+
+
+def _close_db_connections():
+    # Connections inherited from the parent process must not be shared
+    connections.close_all()
+
 
 class Command(BaseCommand):
-    help = "Generate thumbnails for all images"
+    help = (
+        "Generate thumbnails for all images. Images are split into primary key "
+        "ranges processed in parallel; finished ranges are recorded so an "
+        "interrupted run can be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of worker processes.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Size of the primary key range processed by a single job.",
+        )
+        parser.add_argument(
+            "--state-file",
+            default=".create_thumbnails_state.json",
+            help="File storing finished ranges, used to resume an interrupted run.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore progress recorded by a previous run.",
+        )
 
     def handle(self, *args, **options):
-        self.warm_products()
+        self.state_file = options["state_file"]
+        self.chunk_size = options["chunk_size"]
+        finished = set() if options["restart"] else self.load_finished_chunks()
+        self.check_key_sets()
+        chunks = [
+            chunk
+            for chunk in self.get_chunks(self.chunk_size)
+            if get_chunk_key(chunk) not in finished
+        ]
+        self.stdout.write(
+            "Thumbnails generation: %d ranges to process, %d already done"
+            % (len(chunks), len(finished))
+        )
+
+        started = time.monotonic()
+        totals = {"images": 0, "created": 0, "skipped": 0}
+        for chunk, images, created, skipped, failed in self.run_chunks(
+            chunks, options["processes"]
+        ):
+            finished.add(get_chunk_key(chunk))
+            self.save_finished_chunks(finished)
+            self.log_failed_images(failed)
+            totals["images"] += images
+            totals["created"] += created
+            totals["skipped"] += skipped
+            self.stdout.write(
+                "%s: %d images, %d created, %d skipped, %d failed"
+                % (get_chunk_key(chunk), images, created, skipped, len(failed))
+            )
+
+        # The run is complete, the next one should check all images again
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
 
-    def warm_products(self):
-        self.stdout.write("Products thumbnails generation:")
-        warmer = VersatileImageFieldWarmer(
-            instance_or_queryset=ProductImage.objects.all(),
-            rendition_key_set="products",
-            image_attr="image",
-            verbose=True,
+        elapsed = max(time.monotonic() - started, 0.001)
+        self.stdout.write(
+            "Processed %(images)d images, created %(created)d thumbnails, "
+            "skipped %(skipped)d existing" % totals
         )
-        num_created, failed_to_create = warmer.warm()
-        self.log_failed_images(failed_to_create)
+        self.stdout.write(
+            "Throughput: %.1f images/s, %.1f thumbnails/s"
+            % (totals["images"] / elapsed, totals["created"] / elapsed)
+        )
+
+    def check_key_sets(self):
+        covered = {key_set for key_set, _, _ in THUMBNAIL_TARGETS}
+        for key_set in settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS:
+            if key_set not in covered:
+                self.stderr.write("No images use the %s rendition key set" % key_set)
+
+    def get_chunks(self, chunk_size):
+        for key_set, model_label, image_attr in THUMBNAIL_TARGETS:
+            model = apps.get_model(model_label)
+            pk_range = model.objects.exclude(**{image_attr: ""}).aggregate(
+                start=Min("pk"), stop=Max("pk")
+            )
+            if pk_range["start"] is None:
+                continue
+            # Boundaries are multiples of the chunk size, so ranges recorded in
+            # the state file stay the same when the lowest primary key changes
+            first = pk_range["start"] // chunk_size * chunk_size
+            for start in range(first, pk_range["stop"] + 1, chunk_size):
+                yield key_set, model_label, image_attr, start, start + chunk_size
+
+    def run_chunks(self, chunks, processes):
+        if processes <= 1:
+            yield from map(warm_chunk, chunks)
+            return
+        _close_db_connections()
+        with Pool(processes, initializer=_close_db_connections) as pool:
+            yield from pool.imap_unordered(warm_chunk, chunks)
+
+    def load_finished_chunks(self):
+        if not os.path.exists(self.state_file):
+            return set()
+        with open(self.state_file) as state_file:
+            state = json.load(state_file)
+        if not isinstance(state, dict) or state.get("chunk_size") != self.chunk_size:
+            raise CommandError(
+                "The state file %s was created with a different chunk size. Run "
+                "the command with the same --chunk-size to resume or use --restart."
+                % self.state_file
+            )
+        return set(state["finished"])
+
+    def save_finished_chunks(self, finished):
+        tmp_path = "%s.tmp" % self.state_file
+        state = {"chunk_size": self.chunk_size, "finished": sorted(finished)}
+        with open(tmp_path, "w") as state_file:
+            json.dump(state, state_file)
+        os.replace(tmp_path, self.state_file)
 
     def log_failed_images(self, failed_to_create):
         if failed_to_create:
             self.stderr.write("Failed to generate thumbnails:")
-            for patch in failed_to_create:
-                self.stderr.write(patch)
+            for path in failed_to_create:
+                self.stderr.write(path)
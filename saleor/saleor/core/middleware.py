@@ -11,6 +11,10 @@ from django_countries.fields import Country
 from ..discount.utils import fetch_discounts
 from . import analytics
 from .utils import get_client_ip, get_country_by_ip, get_currency_for_country
+from .utils.translations import (
+    activate_translation_cache,
+    deactivate_translation_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -111,3 +115,16 @@ def taxes(get_response):
         return get_response(request)
 
     return middleware
+
+
+def translations(get_response):
+    """Cache translations fetched while handling a request."""
+
+    def middleware(request):
+        activate_translation_cache()
+        try:
+            return get_response(request)
+        finally:
+            deactivate_translation_cache()
+
+    return middleware
@@ -0,0 +1,58 @@
+"""Localized formatting of money amounts.
+
+A drop-in replacement of the `amount` filter of `django_prices`, which looks
+up the locale and parses its currency pattern for every formatted amount.
+Here the parsed patterns are cached by the language and the most recently
+formatted amounts are memoized.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from babel.core import Locale, UnknownLocaleError
+from babel.numbers import parse_pattern
+from django.conf import settings
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language, to_locale
+from django_babel.templatetags.babel import currencyfmt
+
+# Number of the most recently formatted amounts kept in memory
+FORMATTED_AMOUNTS_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=None)
+def get_formatter(language, html=False):
+    """Return the locale and the parsed currency pattern of a language."""
+    try:
+        locale = Locale.parse(to_locale(language))
+    except (ValueError, UnknownLocaleError):
+        # Invalid format or unknown locale, fall back to the default language
+        locale = Locale.parse(to_locale(settings.LANGUAGE_CODE))
+    pattern = locale.currency_formats["standard"].pattern
+    if html:
+        pattern = re.sub("(\xa4+)", '<span class="currency">\\1</span>', pattern)
+    return locale, parse_pattern(pattern)
+
+
+@lru_cache(maxsize=FORMATTED_AMOUNTS_CACHE_SIZE)
+def format_amount(value, currency, language, html=False):
+    locale, pattern = get_formatter(language, html)
+    return mark_safe(pattern.apply(value, locale, currency=currency))
+
+
+def format_price(value, currency, html=False):
+    """Format a decimal value as currency in the current language."""
+    try:
+        value = Decimal(value)
+    except (TypeError, InvalidOperation):
+        return ""
+    language = get_language() or settings.LANGUAGE_CODE
+    return format_amount(value, currency, language, html)
+
+
+def amount(obj, format="text"):
+    if format == "text":
+        return format_price(obj.amount, obj.currency, html=False)
+    if format == "html":
+        return format_price(obj.amount, obj.currency, html=True)
+    return currencyfmt(obj.amount, obj.currency)
@@ -0,0 +1,26 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from .utils.translations import get_translated_object_field, get_translation_cache
+
+
+def handle_translation_change(sender, instance, **kwargs):
+    cache = get_translation_cache()
+    if cache is not None:
+        cache.invalidate(instance)
+
+
+def connect_signals():
+    for model in apps.get_models():
+        if get_translated_object_field(model) is None:
+            continue
+        post_save.connect(
+            handle_translation_change,
+            sender=model,
+            dispatch_uid="translation_cache_save_%s" % model._meta.label_lower,
+        )
+        post_delete.connect(
+            handle_translation_change,
+            sender=model,
+            dispatch_uid="translation_cache_delete_%s" % model._meta.label_lower,
+        )
@@ -1,3 +1,4 @@
+import hashlib
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Union
@@ -30,6 +31,19 @@ def charge_taxes_on_shipping():
     return Site.objects.get_current().settings.charge_taxes_on_shipping
 
 
+def get_taxes_version(taxes) -> str:
+    """Return a key identifying the tax rates and the tax display settings.
+
+    Used in cache keys of data computed with taxes applied.
+    """
+    data = (
+        sorted(taxes.items()) if taxes else None,
+        include_taxes_in_prices(),
+        display_gross_prices(),
+    )
+    return hashlib.md5(repr(data).encode("utf-8")).hexdigest()
+
+
 def get_display_price(
     base: Union[TaxedMoney, TaxedMoneyRange], display_gross=None
 ) -> Money:
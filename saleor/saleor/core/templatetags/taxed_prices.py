@@ -1,6 +1,7 @@
 from django import template
 from prices import MoneyRange, TaxedMoney, TaxedMoneyRange
 
+from .. import money_format
 from ...core.taxes import get_display_price
 from ...core.taxes.vatlayer import DEFAULT_TAX_RATE_NAME
 
@@ -36,3 +37,9 @@ def price(context, base, display_gross=None, html=True):
 
     is_range = isinstance(base, MoneyRange)
     return {"price": base, "is_range": is_range, "html": html}
+
+
+@register.filter
+def amount(obj, format="text"):
+    """Format money in the current language, see `core.money_format`."""
+    return money_format.amount(obj, format)
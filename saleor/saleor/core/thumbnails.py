@@ -0,0 +1,244 @@
+import fcntl
+import hashlib
+import mimetypes
+import os
+import tempfile
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+# Model and image field of every image served by the thumbnail endpoint
+THUMBNAIL_MODELS = {
+    "product-image": ("product.ProductImage", "image"),
+    "category": ("product.Category", "background_image"),
+    "collection": ("product.Collection", "background_image"),
+}
+
+THUMBNAIL_STORED_KEY = "thumbnail-stored:%s:%s:%s"
+# Seconds for which a stored rendition is not checked in the storage again
+THUMBNAIL_STORED_TIMEOUT = 60 * 60 * 24
+# Seconds after which a missing rendition is checked again, as it could have
+# been pre-generated in the meantime
+THUMBNAIL_MISSING_TIMEOUT = 60 * 5
+
+LOCK_SUFFIX = ".lock"
+# File keeping the total size of the cached thumbnails
+SIZE_FILE = ".size"
+
+
+def is_size_allowed(method, size):
+    return "%s__%s" % (method, size) in settings.THUMBNAIL_ON_DEMAND_SIZES
+
+
+def get_model_key(image_file):
+    label = image_file.instance._meta.label
+    for model_key, (model_label, image_attr) in THUMBNAIL_MODELS.items():
+        if model_label == label and image_attr == image_file.field.name:
+            return model_key
+    return None
+
+
+def get_image_version(image_file):
+    """Return a version of the image which changes whenever the image does.
+
+    Thumbnail URLs include the version, so they can be cached for a long time.
+    """
+    ppoi = getattr(image_file, "ppoi", None)
+    value = "%s:%s" % (image_file.name, ppoi)
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:12]
+
+
+def get_on_demand_thumbnail_url(image_file, method, size):
+    """Return URL of the thumbnail endpoint or None if it cannot serve the image."""
+    if not is_size_allowed(method, size):
+        return None
+    model_key = get_model_key(image_file)
+    if model_key is None:
+        return None
+    return reverse(
+        "thumbnail",
+        kwargs={
+            "model_key": model_key,
+            "pk": image_file.instance.pk,
+            "version": get_image_version(image_file),
+            "method": method,
+            "size": size,
+        },
+    )
+
+
+def is_thumbnail_stored(image_file, method, size):
+    """Return whether the rendition was pre-generated in the image storage.
+
+    The result is cached, so the storage is not checked on every render.
+    """
+    key = THUMBNAIL_STORED_KEY % (get_image_version(image_file), method, size)
+    is_stored = cache.get(key)
+    if is_stored is None:
+        rendition = getattr(image_file, method)[size]
+        is_stored = image_file.storage.exists(rendition.name)
+        timeout = THUMBNAIL_STORED_TIMEOUT if is_stored else THUMBNAIL_MISSING_TIMEOUT
+        cache.set(key, is_stored, timeout)
+    return is_stored
+
+
+def get_image_file(model_key, pk):
+    """Return the image file of an instance or None if there is no image."""
+    if model_key not in THUMBNAIL_MODELS:
+        return None
+    model_label, image_attr = THUMBNAIL_MODELS[model_key]
+    instance = apps.get_model(model_label).objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    return getattr(instance, image_attr) or None
+
+
+def render_thumbnail(image_file, method, size):
+    """Render a thumbnail with the versatileimagefield sizer, without saving it."""
+    width, height = [int(value) for value in size.split("x")]
+    sizer = getattr(image_file, method)
+    image, _, image_format, _ = sizer.retrieve_image(image_file.name)
+    image, save_kwargs = sizer.preprocess(image, image_format)
+    content = sizer.process_image(
+        image=image,
+        image_format=image_format,
+        save_kwargs=save_kwargs,
+        width=width,
+        height=height,
+    )
+    return content.getvalue()
+
+
+class ThumbnailCache:
+    """Size-bounded disk cache of rendered thumbnails.
+
+    Entries are evicted in least recently used order; the access time of an
+    entry is refreshed on every hit so the cache does not depend on the
+    filesystem being mounted with atime support.
+    """
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+
+    @staticmethod
+    def get_key(image_file, method, size):
+        ppoi = getattr(image_file, "ppoi", None)
+        value = "%s:%s:%s:%s" % (image_file.name, method, size, ppoi)
+        return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+    def get_path(self, key, image_file):
+        file_ext = os.path.splitext(image_file.name)[1].lower()
+        return os.path.join(self.directory, key[:2], key + file_ext)
+
+    def touch(self, path):
+        os.utime(path, (time.time(), os.path.getmtime(path)))
+
+    def get_or_render(self, image_file, method, size):
+        """Return path of the cached thumbnail, rendering it on a miss.
+
+        Concurrent renders of the same thumbnail are serialized with a file
+        lock so each thumbnail is rendered only once.
+        """
+        key = self.get_key(image_file, method, size)
+        path = self.get_path(key, image_file)
+        if os.path.exists(path):
+            self.touch(path)
+            return key, path
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + LOCK_SUFFIX, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another request could have rendered it while we waited
+                if not os.path.exists(path):
+                    self.write(path, render_thumbnail(image_file, method, size))
+                    self.add_to_size(os.path.getsize(path), keep=path)
+                else:
+                    self.touch(path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return key, path
+
+    def write(self, path, content):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def get_entries(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if (
+                    name == SIZE_FILE
+                    or name.endswith(LOCK_SUFFIX)
+                    or name.startswith("tmp")
+                ):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+        return entries
+
+    def add_to_size(self, size, keep=None):
+        """Add the size of a new thumbnail to the total size of the cache.
+
+        The total is kept in a file shared by all processes, so the directory
+        is walked only when the file is missing or thumbnails are evicted.
+        """
+        size_path = os.path.join(self.directory, SIZE_FILE)
+        with open(size_path + LOCK_SUFFIX, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(size_path) as size_file:
+                        total_size = int(size_file.read()) + size
+                except (FileNotFoundError, ValueError):
+                    # The walk already counts the new thumbnail
+                    total_size = sum(size for _, size, _ in self.get_entries())
+                if total_size > self.max_size:
+                    total_size = self.evict(keep=keep)
+                self.write(size_path, str(total_size).encode("utf-8"))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def evict(self, keep=None):
+        """Remove least recently used thumbnails until the cache fits its size.
+
+        Returns the total size of the remaining thumbnails.
+        """
+        entries = self.get_entries()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+            for stale_path in (path, path + LOCK_SUFFIX):
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    pass
+            total_size -= size
+        return total_size
+
+
+def get_thumbnail_cache():
+    return ThumbnailCache(
+        settings.THUMBNAIL_CACHE_DIR, settings.THUMBNAIL_CACHE_MAX_SIZE
+    )
+
+
+def get_content_type(path):
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
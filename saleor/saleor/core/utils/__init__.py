@@ -1,5 +1,7 @@
 import decimal
 import logging
+import os
+from functools import lru_cache
 from json import JSONEncoder
 from urllib.parse import urljoin
 
@@ -17,6 +19,7 @@ from django_countries.fields import Country
 from django_prices_openexchangerates import exchange_currency
 from django_prices_openexchangerates.tasks import update_conversion_rates
 from geolite2 import geolite2
+from maxminddb import MODE_MMAP, open_database
 from prices import MoneyRange
 from versatileimagefield.image_warmer import VersatileImageFieldWarmer
 
@@ -24,9 +27,14 @@ from ...account.utils import get_random_avatar
 from ...celeryconf import app
 from ...core.i18n import COUNTRY_CODE_CHOICES
 
-georeader = geolite2.reader()
 logger = logging.getLogger(__name__)
 
+# Number of the most recently resolved IP addresses kept in memory
+COUNTRY_BY_IP_CACHE_SIZE = 4096
+
+_georeader = None
+_georeader_pid = None
+
 
 class CategoryChoiceField(forms.ModelChoiceField):
     def label_from_instance(self, obj):
@@ -58,20 +66,70 @@ def get_client_ip(request):
     return request.META.get("REMOTE_ADDR", None)
 
 
-def get_country_by_ip(ip_address):
-    geo_data = georeader.get(ip_address)
+def get_trusted_client_ip(request):
+    """Return the client IP address that cannot be set by the client.
+
+    Each proxy appends the address it received the request from to the
+    X-Forwarded-For header, so only the entries added by the trusted proxies
+    are used; the leftmost ones can be anything the client sent.
+    """
+    proxies_count = settings.TRUSTED_PROXIES_COUNT
+    if proxies_count:
+        forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")
+        if len(forwarded_for) >= proxies_count:
+            return forwarded_for[-proxies_count].strip()
+    return request.META.get("REMOTE_ADDR", None)
+
+
+def get_georeader():
+    """Return the reader of the GeoIP database.
+
+    The database is memory-mapped when it is first used in a process rather
+    than at import time, so each worker forked by the application server
+    opens its own reader.
+    """
+    global _georeader, _georeader_pid
+    pid = os.getpid()
+    if _georeader is None or _georeader_pid != pid:
+        _georeader = open_database(geolite2.filename, MODE_MMAP)
+        _georeader_pid = pid
+    return _georeader
+
+
+@lru_cache(maxsize=COUNTRY_BY_IP_CACHE_SIZE)
+def get_country_code_by_ip(ip_address):
+    geo_data = get_georeader().get(ip_address)
     if geo_data and "country" in geo_data and "iso_code" in geo_data["country"]:
         country_iso_code = geo_data["country"]["iso_code"]
         if country_iso_code in countries:
-            return Country(country_iso_code)
+            return country_iso_code
     return None
 
 
+def get_country_by_ip(ip_address):
+    try:
+        country_iso_code = get_country_code_by_ip(ip_address)
+    except ValueError:
+        # Not a valid IP address
+        return None
+    if country_iso_code:
+        return Country(country_iso_code)
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_country_currencies():
+    """Return the map of country codes to their main currency."""
+    country_currencies = {}
+    for code, _name in countries:
+        currencies = get_territory_currencies(code)
+        if currencies:
+            country_currencies[code] = currencies[0]
+    return country_currencies
+
+
 def get_currency_for_country(country):
-    currencies = get_territory_currencies(country.code)
-    if currencies:
-        return currencies[0]
-    return settings.DEFAULT_CURRENCY
+    return get_country_currencies().get(country.code, settings.DEFAULT_CURRENCY)
 
 
 def get_paginator_items(items, paginate_by, page_number):
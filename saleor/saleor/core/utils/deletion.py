@@ -0,0 +1,46 @@
+from django.db import models
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+
+def delete_without_signals(queryset):
+    """Delete objects of the queryset and their relations with SQL queries.
+
+    Unlike `QuerySet.delete`, the objects are not loaded into memory and
+    neither the delete signals are sent nor the `delete` methods are called;
+    use it only for models whose cascades have no receivers. `CASCADE`
+    relations are deleted and `SET_NULL` relations are cleared the same way.
+
+    Return the number of deleted objects of the queryset's model.
+    """
+    model = queryset.model
+    for related in get_candidate_relations_to_delete(model._meta):
+        field = related.field
+        on_delete = field.remote_field.on_delete
+        if on_delete == models.DO_NOTHING:
+            continue
+        if related.related_model is model:
+            raise ValueError(
+                "Cannot delete %s without signals, it references itself."
+                % model.__name__
+            )
+        related_queryset = related.related_model._base_manager.filter(
+            **{"%s__in" % field.name: queryset}
+        )
+        if on_delete == models.CASCADE:
+            delete_without_signals(related_queryset)
+        elif on_delete == models.SET_NULL:
+            related_queryset.update(**{field.name: None})
+        elif on_delete == models.PROTECT:
+            protected_objects = list(related_queryset[:1])
+            if protected_objects:
+                raise models.ProtectedError(
+                    "Cannot delete some instances of model %s because they are "
+                    "referenced through a protected foreign key." % model.__name__,
+                    protected_objects,
+                )
+        else:
+            raise ValueError(
+                "Cannot delete %s without signals, %s.%s is not supported."
+                % (model.__name__, related.related_model.__name__, field.name)
+            )
+    return queryset._raw_delete(queryset.db)
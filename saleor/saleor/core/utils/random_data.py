@@ -28,7 +28,7 @@ from ...discount.utils import fetch_discounts
 from ...giftcard.models import GiftCard
 from ...menu.models import Menu
 from ...order.models import Fulfillment, Order, OrderLine
-from ...order.utils import update_order_status
+from ...order.utils import update_customer_stats, update_order_status
 from ...page.models import Page
 from ...payment.utils import (
     create_payment,
@@ -439,6 +439,7 @@ def create_fake_order(discounts, max_order_lines=5):
 
     create_fake_payment(order=order)
     create_fulfillments(order)
+    update_customer_stats([order.user_id])
     return order
 
 
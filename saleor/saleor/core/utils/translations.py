@@ -1,12 +1,129 @@
+import threading
+from collections import defaultdict
+
+from django.db.models import prefetch_related_objects
 from django.utils.translation import get_language
 
+_local = threading.local()
+
+
+def get_translated_object_field(model):
+    """Return the foreign key of a translation model to the translated model.
+
+    Returns None for models that are not translations.
+    """
+    return next(
+        (
+            field
+            for field in model._meta.get_fields()
+            if field.many_to_one and field.remote_field.related_name == "translations"
+        ),
+        None,
+    )
+
+
+class TranslationCache:
+    """Store translations fetched during a single request.
+
+    Translations are keyed by (model, pk, language code). Missing translations
+    are cached as well so objects without a translation are not queried again.
+    """
+
+    def __init__(self):
+        self._translations = {}
+
+    @staticmethod
+    def _get_key(model, pk, language_code):
+        return model._meta.label, pk, language_code
+
+    def prefetch(self, instances, language_code):
+        """Load missing translations of instances with one query per model."""
+        pks_per_model = defaultdict(set)
+        for instance in instances:
+            model = instance._meta.concrete_model
+            key = self._get_key(model, instance.pk, language_code)
+            if key not in self._translations:
+                pks_per_model[model].add(instance.pk)
+
+        for model, pks in pks_per_model.items():
+            relation = model._meta.get_field("translations")
+            lookup = {"%s__in" % relation.field.name: pks}
+            translations = relation.related_model.objects.filter(
+                language_code=language_code, **lookup
+            )
+            for pk in pks:
+                self._translations[self._get_key(model, pk, language_code)] = None
+            for translation in translations:
+                pk = getattr(translation, relation.field.attname)
+                key = self._get_key(model, pk, language_code)
+                self._translations[key] = translation
+
+    def get(self, instance, language_code):
+        model = instance._meta.concrete_model
+        key = self._get_key(model, instance.pk, language_code)
+        if key not in self._translations:
+            self.prefetch([instance], language_code)
+        return self._translations[key]
+
+    def invalidate(self, translation):
+        """Drop the cached translation, so it is queried again on next use."""
+        field = get_translated_object_field(translation._meta.model)
+        model = field.related_model._meta.concrete_model
+        pk = getattr(translation, field.attname)
+        key = self._get_key(model, pk, translation.language_code)
+        self._translations.pop(key, None)
+
+
+def activate_translation_cache():
+    _local.cache = TranslationCache()
+
+
+def deactivate_translation_cache():
+    _local.cache = None
+
+
+def get_translation_cache():
+    return getattr(_local, "cache", None)
+
+
+def prefetch_translations(instances, language_code=None):
+    """Load translations of all instances in bulk.
+
+    Translations go to the request cache when it is active, otherwise they are
+    prefetched on the instances.
+    """
+    cache = get_translation_cache()
+    if cache is not None:
+        cache.prefetch(instances, language_code or get_language())
+        return
+    instances_per_model = defaultdict(list)
+    for instance in instances:
+        instances_per_model[instance._meta.concrete_model].append(instance)
+    for model_instances in instances_per_model.values():
+        prefetch_related_objects(model_instances, "translations")
+
+
+def get_translation(instance, language_code):
+    """Return translation of the instance in the given language or None.
+
+    Translations prefetched on the instance are used first, then the request
+    cache; without an active cache the translations are queried directly.
+    """
+    prefetched = getattr(instance, "_prefetched_objects_cache", {})
+    if "translations" not in prefetched:
+        cache = get_translation_cache()
+        if cache is not None:
+            return cache.get(instance, language_code)
+    return next(
+        (t for t in instance.translations.all() if t.language_code == language_code),
+        None,
+    )
+
 
 class TranslationWrapper:
     def __init__(self, instance, locale):
         self.instance = instance
-        self.translation = next(
-            (t for t in instance.translations.all() if t.language_code == locale), None
-        )
+        self.translation = get_translation(instance, locale)
 
     def __getattr__(self, item):
         if all(
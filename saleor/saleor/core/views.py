@@ -1,7 +1,12 @@
 import json
+import os
 
 from django.contrib import messages
+from django.http import FileResponse, Http404
+from django.shortcuts import redirect
 from django.template.response import TemplateResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from django.utils.translation import pgettext_lazy
 from impersonate.views import impersonate as orig_impersonate
 
@@ -10,6 +15,14 @@ from ..dashboard.views import staff_member_required
 from ..product.utils import products_for_homepage
 from ..product.utils.availability import products_with_availability
 from ..seo.schema.webpage import get_webpage_schema
+from .thumbnails import (
+    get_content_type,
+    get_image_file,
+    get_image_version,
+    get_on_demand_thumbnail_url,
+    get_thumbnail_cache,
+    is_size_allowed,
+)
 
 
 def home(request):
@@ -59,3 +72,29 @@ def handle_404(request, exception=None):
 
 def manifest(request):
     return TemplateResponse(request, "manifest.json", content_type="application/json")
+
+
+def thumbnail(request, model_key, pk, version, method, size):
+    """Serve a thumbnail rendered on first request and kept in the disk cache.
+
+    The URL contains the version of the image, so responses never change and
+    can be cached for a year; outdated URLs redirect to the current version.
+    """
+    if not is_size_allowed(method, size):
+        raise Http404("Thumbnail size is not allowed")
+    image_file = get_image_file(model_key, pk)
+    if image_file is None:
+        raise Http404("Image does not exist")
+    if version != get_image_version(image_file):
+        return redirect(get_on_demand_thumbnail_url(image_file, method, size))
+
+    key, path = get_thumbnail_cache().get_or_render(image_file, method, size)
+    etag = '"%s"' % key
+    last_modified = int(os.path.getmtime(path))
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = FileResponse(open(path, "rb"), content_type=get_content_type(path))
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365)
+    return response
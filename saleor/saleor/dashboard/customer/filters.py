@@ -11,6 +11,8 @@ SORT_BY_FIELDS = (
     ("email", "email"),
     ("first_name", "name"),
     ("default_billing_address__city", "location"),
+    ("stats__number_of_orders", "orders"),
+    ("stats__money_spent", "money_spent"),
 )
 
 SORT_BY_FIELDS_LABELS = {
@@ -21,6 +23,10 @@ SORT_BY_FIELDS_LABELS = {
     "default_billing_address__city": pgettext_lazy(
         "Customer list sorting option", "location"
     ),
+    "stats__number_of_orders": pgettext_lazy(
+        "Customer list sorting option", "number of orders"
+    ),
+    "stats__money_spent": pgettext_lazy("Customer list sorting option", "money spent"),
 }
 
 IS_ACTIVE_CHOICES = (
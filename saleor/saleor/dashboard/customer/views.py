@@ -25,8 +25,8 @@ def customer_list(request):
             Q(is_staff=False) | (Q(is_staff=True) & Q(orders__isnull=False))
         )
         .distinct()
-        .prefetch_related("orders", "addresses")
-        .select_related("default_billing_address", "default_shipping_address")
+        .prefetch_related("addresses")
+        .select_related("default_billing_address", "default_shipping_address", "stats")
         .order_by("email")
     )
     customer_filter = UserFilter(request.GET, queryset=customers)
@@ -13,6 +13,7 @@ from django_filters import (
 from ...core.filters import SortedFilterSet
 from ...order import OrderStatus
 from ...order.models import Order
+from ...order.search import search_orders_by_customer
 from ...payment import ChargeStatus
 from ..widgets import DateRangeWidget, MoneyRangeWidget
 
@@ -72,13 +73,7 @@ class OrderFilter(SortedFilterSet):
         fields = []
 
     def filter_by_order_customer(self, queryset, name, value):
-        return queryset.filter(
-            Q(user__email__icontains=value)
-            | Q(user__first_name__icontains=value)
-            | Q(user__last_name__icontains=value)
-            | Q(user__default_billing_address__first_name__icontains=value)
-            | Q(user__default_billing_address__last_name__icontains=value)
-        )
+        return search_orders_by_customer(queryset, value)
 
     def filter_by_payment_status(self, queryset, name, value):
         annotated_queryset = queryset.annotate(last_payment_pk=Max("payments__pk"))
@@ -23,6 +23,7 @@ from ...order.utils import (
     change_order_line_quantity,
     fulfill_order_line,
     recalculate_order,
+    update_customer_stats,
 )
 from ...payment import ChargeStatus, CustomPaymentChoices, PaymentError
 from ...payment.utils import (
@@ -108,6 +109,7 @@ class CreateOrderFromDraftForm(forms.ModelForm):
         super().save()
         if remove_shipping_address:
             self.instance.shipping_address.delete()
+        update_customer_stats([self.instance.user_id])
         return self.instance
 
 
@@ -109,6 +109,7 @@ urlpatterns = [
         name="fulfillment-packing-slips",
     ),
     url(r"^(?P<order_pk>\d+)/invoice/$", views.order_invoice, name="order-invoice"),
+    url(r"^invoices/$", views.order_invoices_bulk, name="order-invoices-bulk"),
     url(
         r"^(?P<order_pk>\d+)/mark-as-paid/$",
         views.mark_order_as_paid,
@@ -1,7 +1,5 @@
 from django.conf import settings
-from django.contrib.sites.models import Site
 from django.contrib.sites.shortcuts import get_current_site
-from django.template.loader import get_template
 from django.utils.translation import pgettext
 
 from ...checkout import AddressType
@@ -14,9 +12,6 @@ from ...discount.utils import (
     get_value_voucher_discount,
 )
 
-INVOICE_TEMPLATE = "dashboard/order/pdf/invoice.html"
-PACKING_SLIP_TEMPLATE = "dashboard/order/pdf/packing_slip.html"
-
 
 def get_statics_absolute_url(request):
     site = get_current_site(request)
@@ -28,31 +23,6 @@ def get_statics_absolute_url(request):
     return absolute_url
 
 
-def _create_pdf(rendered_template, absolute_url):
-    from weasyprint import HTML
-
-    pdf_file = HTML(string=rendered_template, base_url=absolute_url).write_pdf()
-    return pdf_file
-
-
-def create_invoice_pdf(order, absolute_url):
-    ctx = {"order": order, "site": Site.objects.get_current()}
-    rendered_template = get_template(INVOICE_TEMPLATE).render(ctx)
-    pdf_file = _create_pdf(rendered_template, absolute_url)
-    return pdf_file, order
-
-
-def create_packing_slip_pdf(order, fulfillment, absolute_url):
-    ctx = {
-        "order": order,
-        "fulfillment": fulfillment,
-        "site": Site.objects.get_current(),
-    }
-    rendered_template = get_template(PACKING_SLIP_TEMPLATE).render(ctx)
-    pdf_file = _create_pdf(rendered_template, absolute_url)
-    return pdf_file, order
-
-
 def update_order_with_user_addresses(order):
     """Update addresses in an order based on a user assigned to an order."""
     if order.shipping_address:
@@ -122,8 +92,7 @@ def get_prices_of_products_in_discounted_categories(order, discounted_categories
 
 
 def get_products_voucher_discount_for_order(order, voucher):
-    """Calculate products discount value for a voucher, depending on its type.
-    """
+    """Calculate products discount value for a voucher, depending on its type."""
     prices = None
     if voucher.type == VoucherType.PRODUCT:
         prices = get_prices_of_discounted_products(order, voucher.products.all())
@@ -1,26 +1,38 @@
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
+from django.core.files.storage import default_storage
 from django.db import transaction
 from django.db.models import F, Q
 from django.forms import modelformset_factory
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template.context_processors import csrf
 from django.template.response import TemplateResponse
-from django.utils.translation import npgettext_lazy, pgettext_lazy
+from django.utils.translation import get_language, npgettext_lazy, pgettext_lazy
 from django.views.decorators.http import require_POST
-from django_prices.templatetags import prices_i18n
 
+from ...core import money_format
 from ...core.exceptions import InsufficientStock
 from ...core.utils import get_paginator_items
 from ...order import OrderStatus, events
 from ...order.emails import (
+    queue_order_confirmations,
     send_fulfillment_confirmation_to_customer,
     send_fulfillment_update,
-    send_order_confirmation,
 )
 from ...order.models import Fulfillment, FulfillmentLine, Order
+from ...order.pdf import (
+    acquire_pdf_generation_lock,
+    get_bulk_invoices_pdf_path,
+    get_invoice_pdf_path,
+    get_packing_slip_pdf_path,
+)
+from ...order.tasks import (
+    generate_bulk_invoices_pdf,
+    generate_invoice_pdf,
+    generate_packing_slip_pdf,
+)
 from ...order.utils import update_order_prices, update_order_status
 from ...shipping.models import ShippingMethod
 from ..views import staff_member_required
@@ -50,12 +62,7 @@ from .forms import (
     RefundPaymentForm,
     VoidPaymentForm,
 )
-from .utils import (
-    create_invoice_pdf,
-    create_packing_slip_pdf,
-    get_statics_absolute_url,
-    save_address_in_order,
-)
+from .utils import get_statics_absolute_url, save_address_in_order
 
 
 @staff_member_required
@@ -108,7 +115,7 @@ def create_order_from_draft(request, order_pk):
         messages.success(request, msg)
 
         if form.cleaned_data.get("notify_customer"):
-            send_order_confirmation.delay(order.pk, request.user.pk)
+            queue_order_confirmations([order.pk], request.user.pk)
         return redirect("dashboard:order-details", order_pk=order.pk)
     elif form.errors:
         status = 400
@@ -189,7 +196,7 @@ def capture_payment(request, order_pk, payment_pk):
     if form.is_valid() and form.capture(request.user):
         msg = pgettext_lazy(
             "Dashboard message related to a payment", "Captured %(amount)s"
-        ) % {"amount": prices_i18n.amount(amount)}
+        ) % {"amount": money_format.amount(amount)}
         events.payment_captured_event(
             order=order, user=request.user, amount=amount.amount, payment=payment
         )
@@ -216,7 +223,7 @@ def refund_payment(request, order_pk, payment_pk):
         amount = form.cleaned_data["amount"]
         msg = pgettext_lazy(
             "Dashboard message related to a payment", "Refunded %(amount)s"
-        ) % {"amount": prices_i18n.amount(payment.get_captured_amount())}
+        ) % {"amount": money_format.amount(payment.get_captured_amount())}
         events.payment_refunded_event(
             order=order, user=request.user, amount=amount, payment=payment
         )
@@ -536,19 +543,59 @@ def order_voucher_remove(request, order_pk):
     return redirect("dashboard:order-voucher-edit", order_pk=order.pk)
 
 
+def _get_pdf_response(path, name, task, *task_args):
+    """Serve a stored PDF document or queue its rendering in the background.
+
+    Documents are rendered in the language of the request.
+    """
+    if not default_storage.exists(path) and acquire_pdf_generation_lock(path):
+        task.delay(*task_args, get_language())
+    if default_storage.exists(path):
+        with default_storage.open(path) as pdf_file:
+            response = HttpResponse(pdf_file.read(), content_type="application/pdf")
+        response["Content-Disposition"] = "filename=%s" % name
+        return response
+    msg = pgettext_lazy(
+        "Dashboard message",
+        "The document is being generated, the page will reload when it is ready.",
+    )
+    response = HttpResponse(msg, status=202, content_type="text/plain")
+    response["Refresh"] = "5"
+    return response
+
+
 @staff_member_required
 @permission_required("order.manage_orders")
 def order_invoice(request, order_pk):
     orders = Order.objects.confirmed().prefetch_related(
-        "user", "shipping_address", "billing_address", "voucher"
+        "user", "shipping_address", "billing_address", "voucher", "lines"
     )
     order = get_object_or_404(orders, pk=order_pk)
     absolute_url = get_statics_absolute_url(request)
-    pdf_file, order = create_invoice_pdf(order, absolute_url)
-    response = HttpResponse(pdf_file, content_type="application/pdf")
+    path = get_invoice_pdf_path(order)
     name = "invoice-%s.pdf" % order.id
-    response["Content-Disposition"] = "filename=%s" % name
-    return response
+    return _get_pdf_response(path, name, generate_invoice_pdf, order.pk, absolute_url)
+
+
+@staff_member_required
+@permission_required("order.manage_orders")
+def order_invoices_bulk(request):
+    order_pks = request.GET.getlist("orders")
+    orders = Order.objects.confirmed().prefetch_related(
+        "user", "shipping_address", "billing_address", "lines"
+    )
+    orders = list(orders.filter(pk__in=order_pks).order_by("pk"))
+    if not orders:
+        raise Http404
+    absolute_url = get_statics_absolute_url(request)
+    path = get_bulk_invoices_pdf_path(orders)
+    return _get_pdf_response(
+        path,
+        "invoices.pdf",
+        generate_bulk_invoices_pdf,
+        [order.pk for order in orders],
+        absolute_url,
+    )
 
 
 @staff_member_required
@@ -581,11 +628,11 @@ def fulfillment_packing_slips(request, order_pk, fulfillment_pk):
     fulfillments = order.fulfillments.prefetch_related("lines", "lines__order_line")
     fulfillment = get_object_or_404(fulfillments, pk=fulfillment_pk)
     absolute_url = get_statics_absolute_url(request)
-    pdf_file, order = create_packing_slip_pdf(order, fulfillment, absolute_url)
-    response = HttpResponse(pdf_file, content_type="application/pdf")
+    path = get_packing_slip_pdf_path(order, fulfillment)
     name = "packing-slip-%s.pdf" % (order.id,)
-    response["Content-Disposition"] = "filename=%s" % name
-    return response
+    return _get_pdf_response(
+        path, name, generate_packing_slip_pdf, order.pk, fulfillment.pk, absolute_url
+    )
 
 
 @staff_member_required
@@ -709,12 +756,7 @@ def change_fulfillment_tracking(request, order_pk, fulfillment_pk):
             fulfillment=fulfillment,
         )
         if form.cleaned_data.get("send_mail"):
-            events.email_sent_event(
-                order=order,
-                email_type=events.OrderEventsEmails.TRACKING_UPDATED,
-                user=request.user,
-            )
-            send_fulfillment_update.delay(order.pk, fulfillment.pk)
+            send_fulfillment_update.delay(order.pk, fulfillment.pk, request.user.pk)
 
         msg = pgettext_lazy(
             "Dashboard message", "Fulfillment #%(fulfillment)s tracking number updated"
@@ -1,9 +1,9 @@
 from django.conf import settings
 from django.template import Library
 from django.utils.translation import npgettext_lazy, pgettext_lazy
-from django_prices.templatetags import prices_i18n
 from prices import Money
 
+from ...core import money_format
 from ...order import events
 from ...order.models import OrderEvent
 
@@ -58,14 +58,14 @@ def display_order_event(order_event: OrderEvent):
         return pgettext_lazy(
             "Dashboard message related to an order",
             "Successfully refunded: %(amount)s"
-            % {"amount": prices_i18n.amount(amount)},
+            % {"amount": money_format.amount(amount)},
         )
     if event_type == events.OrderEvents.PAYMENT_CAPTURED:
         amount = get_money_from_params(params["amount"])
         return pgettext_lazy(
             "Dashboard message related to an order",
             "Successfully captured: %(amount)s"
-            % {"amount": prices_i18n.amount(amount)},
+            % {"amount": money_format.amount(amount)},
         )
     if event_type == events.OrderEvents.ORDER_MARKED_AS_PAID:
         return pgettext_lazy(
@@ -4,6 +4,8 @@ from typing import Any, List
 from django.conf import settings
 from django.utils.translation import pgettext_lazy
 
+default_app_config = "saleor.discount.apps.DiscountAppConfig"
+
 
 class DiscountValueType:
     FIXED = "fixed"
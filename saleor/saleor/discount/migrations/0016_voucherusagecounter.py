@@ -0,0 +1,37 @@
+# Generated by Django 2.2.3 on 2019-07-22 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("discount", "0015_voucher_min_quantity_of_products")]
+
+    operations = [
+        migrations.CreateModel(
+            name="VoucherUsageCounter",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("shard", models.PositiveSmallIntegerField()),
+                ("used", models.IntegerField(default=0)),
+                (
+                    "voucher",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="usage_counters",
+                        to="discount.Voucher",
+                    ),
+                ),
+            ],
+            options={"unique_together": {("voucher", "shard")}},
+        )
+    ]
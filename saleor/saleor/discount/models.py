@@ -8,9 +8,9 @@ from django.utils import timezone
 from django.utils.translation import pgettext, pgettext_lazy
 from django_countries.fields import CountryField
 from django_prices.models import MoneyField
-from django_prices.templatetags.prices_i18n import amount
 from prices import Money, fixed_discount, percentage_discount
 
+from ..core.money_format import amount
 from ..core.utils.translations import TranslationProxy
 from . import DiscountValueType, VoucherType
 
@@ -116,6 +116,14 @@ class Voucher(models.Model):
                 ) % {"discount": discount, "categories_num": categories}
         return pgettext("Voucher type", "%(discount)s off") % {"discount": discount}
 
+    def is_active(self, date):
+        """Check the conditions of `VoucherQueryset.active` on the instance."""
+        return (
+            (self.usage_limit is None or self.used < self.usage_limit)
+            and (self.end_date is None or self.end_date >= date)
+            and self.start_date <= date
+        )
+
     @property
     def is_free(self):
         return (
@@ -166,6 +174,23 @@ class Voucher(models.Model):
             )
 
 
+class VoucherUsageCounter(models.Model):
+    """Shard of the usage counter of a voucher without a usage limit.
+
+    Uses are spread over the shards so concurrent orders do not contend for a
+    single row; the shards are periodically folded into `Voucher.used`.
+    """
+
+    voucher = models.ForeignKey(
+        Voucher, related_name="usage_counters", on_delete=models.CASCADE
+    )
+    shard = models.PositiveSmallIntegerField()
+    used = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (("voucher", "shard"),)
+
+
 class SaleQueryset(models.QuerySet):
     def active(self, date):
         return self.filter(
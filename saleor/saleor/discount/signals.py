@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import Voucher
+from .utils import invalidate_vouchers, reconcile_voucher_usage
+
+
+def handle_voucher_save(sender, instance, **kwargs):
+    if instance.usage_limit is not None:
+        # The limit is enforced on `Voucher.used`, it has to include all uses
+        reconcile_voucher_usage(instance.pk)
+    invalidate_vouchers()
+
+
+def handle_voucher_delete(sender, instance, **kwargs):
+    invalidate_vouchers()
+
+
+def connect_signals():
+    post_save.connect(
+        handle_voucher_save, sender=Voucher, dispatch_uid="voucher_cache_save"
+    )
+    post_delete.connect(
+        handle_voucher_delete, sender=Voucher, dispatch_uid="voucher_cache_delete"
+    )
@@ -0,0 +1,7 @@
+from ..celeryconf import app
+from .utils import reconcile_voucher_usage
+
+
+@app.task
+def reconcile_voucher_usage_task():
+    reconcile_voucher_usage()
@@ -1,25 +1,138 @@
 import datetime
+import hashlib
+import random
 from collections import defaultdict
 from typing import Iterable
+from uuid import uuid4
 
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from django.utils.translation import pgettext
 
 from ..core.taxes import zero_money
 from . import DiscountInfo
-from .models import NotApplicable, Sale
+from .models import NotApplicable, Sale, Voucher, VoucherUsageCounter
+
+VOUCHERS_VERSION_KEY = "vouchers-version"
+VOUCHER_CACHE_TIMEOUT = 60 * 60
+VOUCHER_USAGE_SHARDS = 16
+
+
+def get_discounts_version(discounts: Iterable[DiscountInfo]) -> str:
+    """Return a key identifying the state of the given discounts.
+
+    Used in cache keys of data computed with the discounts applied, so cached
+    prices are not reused after a sale changes.
+    """
+    if not discounts:
+        return "none"
+    data = sorted(
+        (
+            discount.sale.pk,
+            discount.sale.type,
+            str(discount.sale.value),
+            sorted(discount.product_ids),
+            sorted(discount.category_ids),
+            sorted(discount.collection_ids),
+        )
+        for discount in discounts
+    )
+    return hashlib.md5(repr(data).encode("utf-8")).hexdigest()
+
+
+def get_vouchers_version():
+    version = cache.get(VOUCHERS_VERSION_KEY)
+    if version is None:
+        version = uuid4().hex
+        cache.set(VOUCHERS_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_vouchers():
+    """Make all cached vouchers stale."""
+    cache.set(VOUCHERS_VERSION_KEY, uuid4().hex, None)
+
+
+def get_voucher_cache_key(code):
+    return "voucher:%s:%s" % (get_vouchers_version(), code)
+
+
+def get_active_voucher(code, date=None):
+    """Return an active voucher with the given code or None.
+
+    Vouchers are cached by code, including codes that do not exist, so
+    checkout recalculations do not query the database for the voucher.
+    """
+    key = get_voucher_cache_key(code)
+    voucher = cache.get(key)
+    if voucher is None:
+        # False marks a code without a voucher, None is a cache miss
+        voucher = Voucher.objects.filter(code=code).first() or False
+        cache.set(key, voucher, VOUCHER_CACHE_TIMEOUT)
+    if voucher and voucher.is_active(date or timezone.now()):
+        return voucher
+    return None
 
 
 def increase_voucher_usage(voucher):
-    """Increase voucher uses by 1."""
-    voucher.used = F("used") + 1
-    voucher.save(update_fields=["used"])
+    """Increase voucher uses by 1.
+
+    Return False if the usage limit of the voucher is already reached. The
+    limit is enforced atomically with a conditional update of the voucher;
+    uses of vouchers without a limit are counted in sharded counters to
+    avoid contention on the voucher row.
+    """
+    if voucher.usage_limit is None:
+        _update_voucher_usage_counter(voucher, 1)
+        return True
+    increased = Voucher.objects.filter(pk=voucher.pk, used__lt=F("usage_limit")).update(
+        used=F("used") + 1
+    )
+    # The cached voucher holds a stale number of uses
+    cache.delete(get_voucher_cache_key(voucher.code))
+    return bool(increased)
 
 
 def decrease_voucher_usage(voucher):
     """Decrease voucher uses by 1."""
-    voucher.used = F("used") - 1
-    voucher.save(update_fields=["used"])
+    if voucher.usage_limit is None:
+        _update_voucher_usage_counter(voucher, -1)
+        return
+    Voucher.objects.filter(pk=voucher.pk, used__gt=0).update(used=F("used") - 1)
+    cache.delete(get_voucher_cache_key(voucher.code))
+
+
+def _update_voucher_usage_counter(voucher, value):
+    shard = random.randrange(VOUCHER_USAGE_SHARDS)
+    counters = VoucherUsageCounter.objects.filter(voucher=voucher, shard=shard)
+    if not counters.update(used=F("used") + value):
+        VoucherUsageCounter.objects.get_or_create(voucher=voucher, shard=shard)
+        counters.update(used=F("used") + value)
+
+
+def reconcile_voucher_usage(voucher_id=None):
+    """Fold sharded usage counters into `Voucher.used`.
+
+    Reconciles the given voucher or all vouchers with pending uses.
+    """
+    counters = VoucherUsageCounter.objects.exclude(used=0)
+    if voucher_id is not None:
+        counters = counters.filter(voucher_id=voucher_id)
+    for pk in counters.values_list("voucher_id", flat=True).distinct():
+        with transaction.atomic():
+            voucher_counters = list(
+                VoucherUsageCounter.objects.select_for_update()
+                .filter(voucher_id=pk)
+                .exclude(used=0)
+            )
+            used = sum(counter.used for counter in voucher_counters)
+            Voucher.objects.filter(pk=pk).update(used=Greatest(F("used") + used, 0))
+            VoucherUsageCounter.objects.filter(
+                pk__in=[counter.pk for counter in voucher_counters]
+            ).update(used=0)
 
 
 def are_product_collections_on_sale(product, discount: DiscountInfo):
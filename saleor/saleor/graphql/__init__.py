@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_json_backend(app_configs, **kwargs):
+    from .encoding import BACKENDS
+
+    errors = []
+    backend = settings.GRAPHQL_JSON_BACKEND
+    if backend is not None and backend not in BACKENDS:
+        errors.append(
+            Warning(
+                "GRAPHQL_JSON_BACKEND %r is not available" % backend,
+                "Install the library or use one of: %s. Until then the API "
+                "falls back to the fastest available one."
+                % ", ".join(sorted(BACKENDS)),
+                "saleor.W002",
+            )
+        )
+    return errors
@@ -1,5 +1,4 @@
 import graphene
-from django.core.exceptions import ValidationError
 
 from ...account import models
 from ..core.mutations import BaseBulkMutation, ModelBulkDeleteMutation
@@ -24,9 +23,9 @@ class CustomerBulkDelete(CustomerDeleteMixin, UserBulkDelete):
 
     @classmethod
     def perform_mutation(cls, root, info, **data):
-        count, errors = super().perform_mutation(root, info, **data)
+        count, errors, job = super().perform_mutation(root, info, **data)
         cls.post_process(info, count)
-        return count, errors
+        return count, errors, job
 
 
 class StaffBulkDelete(StaffDeleteMixin, UserBulkDelete):
@@ -51,15 +50,17 @@ class UserBulkSetActive(BaseBulkMutation):
         permissions = ("account.manage_users",)
 
     @classmethod
-    def clean_instance(cls, info, instance):
-        if info.context.user == instance:
-            raise ValidationError(
-                {"is_active": "Cannot activate or deactivate your own account."}
-            )
-        elif instance.is_superuser:
-            raise ValidationError(
-                {"is_active": "Cannot activate or deactivate superuser's account."}
-            )
+    def clean_queryset(cls, info, queryset):
+        return [
+            (
+                queryset.filter(pk=info.context.user.pk),
+                "Cannot activate or deactivate your own account.",
+            ),
+            (
+                queryset.filter(is_superuser=True),
+                "Cannot activate or deactivate superuser's account.",
+            ),
+        ]
 
     @classmethod
     def bulk_action(cls, queryset, is_active):
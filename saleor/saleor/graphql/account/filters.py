@@ -1,5 +1,6 @@
 import django_filters
-from django.db.models import Count, Sum
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 
 from ...account.models import User
 from ..core.filters import EnumFilter, ObjectTypeFilter
@@ -18,7 +19,7 @@ def filter_date_joined(qs, _, value):
 
 
 def filter_money_spent(qs, _, value):
-    qs = qs.annotate(money_spent=Sum("orders__total_gross"))
+    qs = qs.annotate(money_spent=Coalesce("stats__money_spent", Value(0)))
     money_spent_lte, money_spent_gte = value.get("lte"), value.get("gte")
     if money_spent_lte:
         qs = qs.filter(money_spent__lte=money_spent_lte)
@@ -28,7 +29,7 @@ def filter_money_spent(qs, _, value):
 
 
 def filter_number_of_orders(qs, _, value):
-    qs = qs.annotate(total_orders=Count("orders"))
+    qs = qs.annotate(total_orders=Coalesce("stats__number_of_orders", Value(0)))
     gte, lte = value.get("gte"), value.get("lte")
     if gte:
         qs = qs.filter(total_orders__gte=gte)
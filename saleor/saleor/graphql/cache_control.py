@@ -0,0 +1,135 @@
+"""HTTP caching of persisted GraphQL queries executed with GET requests.
+
+The maximum age of a query is the lowest `maxAge` hint of the fields in its
+selection; see `GRAPHQL_CACHE_CONTROL` in settings. Objects resolved during
+the execution are collected to build the surrogate keys of the response, so
+a proxy can purge the responses containing an object when it changes.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .query_cost import QueryCostAnalyzer, get_named_type
+
+PERSISTED_QUERY_KEY = "graphql-persisted-query:%s"
+# Number of seconds a persisted query is stored for since it was last sent
+PERSISTED_QUERY_TIMEOUT = 60 * 60 * 24
+# Queries longer than this number of characters are executed but not stored
+PERSISTED_QUERY_MAX_LENGTH = 10000
+
+# Surrogate key prefixes of GraphQL types and functions returning the ids of
+# their objects. Responses are tagged with the prefix of each type they
+# contain, e.g. `product`, and the key of each object, e.g. `product-12`.
+SURROGATE_KEYS = {
+    "Category": ("category", lambda category: category.pk),
+    "Collection": ("collection", lambda collection: collection.pk),
+    "Menu": ("menu", lambda menu: menu.pk),
+    "MenuItem": ("menu", lambda menu_item: menu_item.menu_id),
+    "Page": ("page", lambda page: page.pk),
+    "Product": ("product", lambda product: product.pk),
+    "ProductVariant": ("product", lambda variant: variant.product_id),
+    "Shop": ("shop", None),
+}
+
+
+class CacheControlAnalyzer(QueryCostAnalyzer):
+    def get_max_age(self, operation_name=None):
+        """Return the number of seconds the result of the operation can be
+        cached for.
+        """
+        operation = self.get_operation(operation_name)
+        if operation is None or operation.operation != "query":
+            return 0
+        max_age = self.get_selection_set_max_age(
+            operation.selection_set, self.get_root_type(operation), None
+        )
+        return max_age or 0
+
+    def get_selection_set_max_age(self, selection_set, parent_type, max_age):
+        """Return the lowest max age of fields in the selection set.
+
+        Fields without a hint inherit the max age of their parent field;
+        `None` is returned if no field has a hint.
+        """
+        result = max_age
+        for field, field_parent_type in self.get_fields(selection_set, parent_type):
+            result = min_max_age(
+                result, self.get_field_max_age(field, field_parent_type, max_age)
+            )
+        return result
+
+    def get_field_max_age(self, field, parent_type, max_age):
+        name = field.name.value
+        field_definitions = getattr(parent_type, "fields", None) or {}
+        if name.startswith("__") or name not in field_definitions:
+            return max_age
+        field_type = get_named_type(field_definitions[name].type)
+        hint = get_hint("%s.%s" % (parent_type.name, name))
+        if hint is None and field.selection_set:
+            hint = get_hint(field_type.name, settings.GRAPHQL_CACHE_DEFAULT_MAX_AGE)
+        max_age = min_max_age(max_age, hint)
+        if field.selection_set:
+            max_age = self.get_selection_set_max_age(
+                field.selection_set, field_type, max_age
+            )
+        return max_age
+
+
+def min_max_age(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return min(first, second)
+
+
+def get_hint(name, default=None):
+    if name.endswith(("Connection", "Edge")):
+        # Pagination types inherit the max age of their parent
+        return None
+    return settings.GRAPHQL_CACHE_CONTROL.get(name, default)
+
+
+class SurrogateKeyMiddleware:
+    """Collect surrogate keys of objects resolved in a cacheable request."""
+
+    def resolve(self, next, root, info, **args):
+        surrogate_keys = getattr(info.context, "graphql_surrogate_keys", None)
+        if surrogate_keys is not None:
+            surrogate_key = SURROGATE_KEYS.get(info.parent_type.name)
+            if surrogate_key is not None and root is not None:
+                prefix, get_id = surrogate_key
+                surrogate_keys.add(prefix)
+                if get_id is not None:
+                    surrogate_keys.add("%s-%s" % (prefix, get_id(root)))
+        return next(root, info, **args)
+
+
+def get_persisted_query_hash(extensions):
+    persisted_query = (extensions or {}).get("persistedQuery") or {}
+    return persisted_query.get("sha256Hash")
+
+
+def get_persisted_query(query, extensions):
+    """Return the query of an automatic persisted query.
+
+    A client sends a hash of the query; the query is stored if it is sent
+    along with its hash. Clients resend the query along with its hash when
+    the hash is not found, e.g. after it expired or if it was too large to be
+    stored.
+    """
+    query_hash = get_persisted_query_hash(extensions)
+    if not query_hash:
+        return query
+    key = PERSISTED_QUERY_KEY % query_hash
+    if query is None:
+        query = cache.get(key)
+        if query is None:
+            raise ValueError("PersistedQueryNotFound")
+        return query
+    if hashlib.sha256(query.encode("utf-8")).hexdigest() != query_hash:
+        raise ValueError("Provided sha256Hash does not match the query.")
+    if len(query) <= PERSISTED_QUERY_MAX_LENGTH:
+        cache.set(key, query, PERSISTED_QUERY_TIMEOUT)
+    return query
@@ -2,13 +2,12 @@ import graphene
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.utils import timezone
 
 from ...checkout import models
 from ...checkout.utils import (
     abort_order_data,
     add_promo_code_to_checkout,
-    add_variant_to_checkout,
+    add_variants_to_checkout,
     add_voucher_to_checkout,
     change_billing_address_in_checkout,
     change_shipping_address_in_checkout,
@@ -26,6 +25,7 @@ from ...core.exceptions import InsufficientStock
 from ...core.taxes.errors import TaxError
 from ...core.taxes.interface import calculate_checkout_subtotal
 from ...discount import models as voucher_model
+from ...discount.utils import get_active_voucher
 from ...payment import PaymentError
 from ...payment.interface import AddressData
 from ...payment.utils import gateway_process_payment, store_customer_id
@@ -82,15 +82,19 @@ def check_lines_quantity(variants, quantities):
         try:
             variant.check_quantity(quantity)
         except InsufficientStock as e:
-            message = (
-                "Could not add item "
-                + "%(item_name)s. Only %(remaining)d remaining in stock."
-                % {
-                    "remaining": e.item.quantity_available,
-                    "item_name": e.item.display_product(),
-                }
-            )
-            raise ValidationError({"quantity": message})
+            raise get_insufficient_stock_error(e)
+
+
+def get_insufficient_stock_error(error):
+    message = (
+        "Could not add item "
+        + "%(item_name)s. Only %(remaining)d remaining in stock."
+        % {
+            "remaining": error.item.quantity_available,
+            "item_name": error.item.display_product(),
+        }
+    )
+    return ValidationError({"quantity": message})
 
 
 class CheckoutLineInput(graphene.InputObjectType):
@@ -181,8 +185,10 @@ class CheckoutCreate(ModelMutation, I18nMixin):
         variants = cleaned_input.get("variants")
         quantities = cleaned_input.get("quantities")
         if variants and quantities:
-            for variant, quantity in zip(variants, quantities):
-                add_variant_to_checkout(instance, variant, quantity)
+            try:
+                add_variants_to_checkout(instance, variants, quantities)
+            except InsufficientStock as e:
+                raise get_insufficient_stock_error(e)
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
@@ -244,8 +250,12 @@ class CheckoutLinesAdd(BaseMutation):
         )
 
         if variants and quantities:
-            for variant, quantity in zip(variants, quantities):
-                add_variant_to_checkout(checkout, variant, quantity, replace=replace)
+            try:
+                add_variants_to_checkout(
+                    checkout, variants, quantities, replace=replace
+                )
+            except InsufficientStock as e:
+                raise get_insufficient_stock_error(e)
 
         recalculate_checkout_discount(checkout, info.context.discounts)
 
@@ -558,11 +568,8 @@ class CheckoutUpdateVoucher(BaseMutation):
         )
 
         if voucher_code:
-            try:
-                voucher = voucher_model.Voucher.objects.active(date=timezone.now()).get(
-                    code=voucher_code
-                )
-            except voucher_model.Voucher.DoesNotExist:
+            voucher = get_active_voucher(voucher_code)
+            if voucher is None:
                 raise ValidationError(
                     {"voucher_code": "Voucher with given code does not exist."}
                 )
@@ -0,0 +1,48 @@
+"""Progress of bulk mutations processed in the background.
+
+Jobs are kept in the cache, so their progress can be polled from the API
+with the `bulkJob` query while a worker processes them chunk by chunk.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.utils.translation import pgettext_lazy
+
+BULK_JOB_KEY = "graphql-bulk-job:%s"
+# Number of seconds the progress of a job can be polled for
+BULK_JOB_TIMEOUT = 60 * 60 * 24
+
+
+class BulkJobStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILED = "failed"
+
+    CHOICES = [
+        (PENDING, pgettext_lazy("Status of a job waiting for a worker", "Pending")),
+        (RUNNING, pgettext_lazy("Status of a job being processed", "Running")),
+        (SUCCESS, pgettext_lazy("Status of a processed job", "Success")),
+        (FAILED, pgettext_lazy("Status of a job stopped by an error", "Failed")),
+    ]
+
+
+def create_bulk_job(total):
+    job = {
+        "id": uuid.uuid4().hex,
+        "status": BulkJobStatus.PENDING,
+        "processed": 0,
+        "total": total,
+    }
+    cache.set(BULK_JOB_KEY % job["id"], job, BULK_JOB_TIMEOUT)
+    return job
+
+
+def get_bulk_job(job_id):
+    return cache.get(BULK_JOB_KEY % job_id)
+
+
+def update_bulk_job(job, **fields):
+    job.update(fields)
+    cache.set(BULK_JOB_KEY % job["id"], job, BULK_JOB_TIMEOUT)
+    return job
@@ -3,6 +3,7 @@ import graphene
 from ...core.permissions import MODELS_PERMISSIONS
 from ...core.taxes.vatlayer import TaxRateType as CoreTaxRateType
 from ...core.weight import WeightUnits
+from .bulk_jobs import BulkJobStatus
 from .utils import str_to_enum
 
 # FIXME CoreTaxRateType should be removed after we will drop old api fields dedicated
@@ -59,3 +60,6 @@ PermissionEnum = graphene.Enum(
 WeightUnitsEnum = graphene.Enum(
     "WeightUnitsEnum", [(str_to_enum(unit[0]), unit[0]) for unit in WeightUnits.CHOICES]
 )
+
+
+BulkJobStatusEnum = to_enum(BulkJobStatus)
@@ -2,12 +2,14 @@ from itertools import chain
 from typing import Tuple
 
 import graphene
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import (
     NON_FIELD_ERRORS,
     ImproperlyConfigured,
     ValidationError,
 )
+from django.db import transaction
 from django.db.models.fields.files import FileField
 from graphene.types.mutation import MutationOptions
 from graphene_django.registry import get_global_registry
@@ -17,8 +19,10 @@ from graphql_jwt.exceptions import JSONWebTokenError, PermissionDenied
 
 from ...account import models
 from ..account.types import User
-from ..utils import get_nodes
-from .types import Error, Upload
+from ..tasks import run_bulk_mutation
+from ..utils import get_database_ids, get_nodes
+from .bulk_jobs import create_bulk_job
+from .types import BulkJob, Error, Upload
 from .utils import snake_to_camel_case
 
 registry = get_global_registry()
@@ -123,7 +127,7 @@ class BaseMutation(graphene.Mutation):
     def get_nodes_or_error(cls, ids, field, only_type=None):
         try:
             instances = get_nodes(ids, only_type)
-        except GraphQLError as e:
+        except (AssertionError, GraphQLError) as e:
             raise ValidationError({field: str(e)})
         return instances
 
@@ -393,9 +397,26 @@ class ModelDeleteMutation(ModelMutation):
 
 
 class BaseBulkMutation(BaseMutation):
+    """Perform an action on a list of model instances.
+
+    Mutations that do not override `clean_instance` work on sets of instances:
+    the instances are validated with SQL queries in `clean_queryset` and are
+    never loaded, and mutations of many instances are processed in the
+    background. Their arguments other than `ids` have to be serializable to
+    JSON. Either way, the action is performed on chunks of instances, each in
+    its own transaction.
+    """
+
     count = graphene.Int(
         required=True, description="Returns how many objects were affected."
     )
+    job = graphene.Field(
+        BulkJob,
+        description=(
+            "The job processing the objects in the background, if there are "
+            "too many of them to process them at once."
+        ),
+    )
 
     class Meta:
         abstract = True
@@ -418,20 +439,30 @@ class BaseBulkMutation(BaseMutation):
         bulk action on the instance.
         """
 
+    @classmethod
+    def clean_queryset(cls, info, queryset):
+        """Return the instances of the queryset the action can't be performed on.
+
+        Override this method to validate the instances with SQL queries; it
+        returns a list of pairs of a queryset of invalid instances and the
+        error message.
+        """
+        return []
+
+    @classmethod
+    def is_set_based(cls):
+        return cls.clean_instance.__func__ is BaseBulkMutation.clean_instance.__func__
+
     @classmethod
     def bulk_action(cls, queryset, **kwargs):
         """Implement action performed on queryset."""
         raise NotImplementedError
 
     @classmethod
-    def perform_mutation(cls, _root, info, ids, **data):
-        """Perform a mutation that deletes a list of model instances."""
+    def clean_instances(cls, info, ids):
+        """Validate instances one by one and return the valid primary keys."""
         clean_instance_ids, errors = [], {}
-        # Allow to pass empty list for dummy mutation
-        if not ids:
-            return 0, errors
-        instance_model = cls._meta.model
-        model_type = registry.get_type_for_model(instance_model)
+        model_type = registry.get_type_for_model(cls._meta.model)
         instances = cls.get_nodes_or_error(ids, "id", model_type)
         for instance, node_id in zip(instances, ids):
             instance_errors = []
@@ -451,24 +482,97 @@ class BaseBulkMutation(BaseMutation):
                 ValidationError({node_id: instance_errors_msg}).update_error_dict(
                     errors
                 )
+        return clean_instance_ids, errors
+
+    @classmethod
+    def clean_ids(cls, info, ids):
+        """Validate instances with SQL queries and return the valid primary keys."""
+        errors = {}
+        model_type = registry.get_type_for_model(cls._meta.model)
+        try:
+            pks = get_database_ids(ids, model_type)
+        except (AssertionError, ValueError) as e:
+            raise ValidationError({"id": str(e)})
+        node_ids = dict(zip(pks, ids))
+        queryset = cls._meta.model.objects.filter(pk__in=pks)
+        existing_pks = {str(pk) for pk in queryset.values_list("pk", flat=True)}
+        for pk in node_ids:
+            if pk not in existing_pks:
+                raise ValidationError(
+                    {
+                        "id": "There is no node of type {} with pk {}".format(
+                            model_type, pk
+                        )
+                    }
+                )
+
+        invalid_pks = set()
+        for invalid_queryset, message in cls.clean_queryset(info, queryset):
+            for pk in invalid_queryset.values_list("pk", flat=True):
+                pk = str(pk)
+                invalid_pks.add(pk)
+                ValidationError({node_ids[pk]: message}).update_error_dict(errors)
+        clean_instance_ids = [pk for pk in node_ids if pk not in invalid_pks]
+        return clean_instance_ids, errors
+
+    @classmethod
+    def get_chunks(cls, pks):
+        chunk_size = settings.GRAPHQL_BULK_MUTATION_CHUNK_SIZE
+        for start in range(0, len(pks), chunk_size):
+            yield pks[start : start + chunk_size]
+
+    @classmethod
+    def run_bulk_action(cls, pks, data):
+        with transaction.atomic():
+            queryset = cls._meta.model.objects.filter(pk__in=pks)
+            cls.bulk_action(queryset=queryset, **data)
+
+    @classmethod
+    def start_bulk_job(cls, pks, data):
+        job = create_bulk_job(total=len(pks))
+        mutation_path = "%s.%s" % (cls.__module__, cls.__name__)
+        # The task has to see the changes of the current transaction
+        transaction.on_commit(
+            lambda: run_bulk_mutation.delay(mutation_path, pks, data, job["id"])
+        )
+        return job
+
+    @classmethod
+    def perform_mutation(cls, _root, info, ids, **data):
+        """Perform a mutation that deletes a list of model instances.
+
+        Return the number of instances, the validation errors and the job
+        processing the instances in the background, if any.
+        """
+        clean_instance_ids, errors, job = [], {}, None
+        # Allow to pass empty list for dummy mutation
+        if not ids:
+            return 0, errors, job
+        if cls.is_set_based():
+            clean_instance_ids, errors = cls.clean_ids(info, ids)
+        else:
+            clean_instance_ids, errors = cls.clean_instances(info, ids)
 
         if errors:
             errors = ValidationError(errors)
         count = len(clean_instance_ids)
-        if count:
-            qs = instance_model.objects.filter(pk__in=clean_instance_ids)
-            cls.bulk_action(queryset=qs, **data)
-        return count, errors
+        background_threshold = settings.GRAPHQL_BULK_MUTATION_BACKGROUND_THRESHOLD
+        if cls.is_set_based() and count > background_threshold:
+            job = cls.start_bulk_job(clean_instance_ids, data)
+        else:
+            for chunk in cls.get_chunks(clean_instance_ids):
+                cls.run_bulk_action(chunk, data)
+        return count, errors, job
 
     @classmethod
     def mutate(cls, root, info, **data):
         if not cls.check_permissions(info.context.user):
             raise PermissionDenied()
 
-        count, errors = cls.perform_mutation(root, info, **data)
+        count, errors, job = cls.perform_mutation(root, info, **data)
         if errors:
             errors = validation_error_to_error_type(errors)
-        return cls(errors=errors, count=count)
+        return cls(errors=errors, count=count, job=job)
 
 
 class ModelBulkDeleteMutation(BaseBulkMutation):
@@ -477,6 +581,15 @@ class ModelBulkDeleteMutation(BaseBulkMutation):
 
     @classmethod
     def bulk_action(cls, queryset):
+        cls.delete_queryset(queryset)
+
+    @classmethod
+    def delete_queryset(cls, queryset):
+        """Delete the instances of the queryset.
+
+        Override this method to delete the instances with
+        `delete_without_signals` if no signal receivers depend on them.
+        """
         queryset.delete()
 
 
@@ -1,9 +1,11 @@
 import graphene
 import graphql_jwt
+from graphql_jwt.decorators import staff_member_required
 
 from ...core.taxes import interface as tax_interface
+from .bulk_jobs import get_bulk_job
 from .mutations import CreateToken, VerifyToken
-from .types.common import TaxType
+from .types.common import BulkJob, TaxType
 
 
 class CoreMutations(graphene.ObjectType):
@@ -13,10 +15,19 @@ class CoreMutations(graphene.ObjectType):
 
 
 class CoreQueries(graphene.ObjectType):
+    bulk_job = graphene.Field(
+        BulkJob,
+        id=graphene.Argument(graphene.ID, required=True),
+        description="Progress of a bulk mutation processed in the background.",
+    )
     tax_types = graphene.List(
         TaxType, description="List of all tax rates available from tax gateway"
     )
 
+    @staff_member_required
+    def resolve_bulk_job(self, _info, id):
+        return get_bulk_job(id)
+
     def resolve_tax_types(self, _info):
         return [
             TaxType(description=tax.description, tax_code=tax.code)
@@ -1,5 +1,6 @@
 # flake8: noqa
 from .common import (
+    BulkJob,
     CountryDisplay,
     Error,
     Image,
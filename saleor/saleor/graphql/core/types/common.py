@@ -2,10 +2,22 @@ import graphene
 
 from ....product.templatetags.product_images import get_thumbnail
 from ...translations.enums import LanguageCodeEnum
-from ..enums import PermissionEnum
+from ..enums import BulkJobStatusEnum, PermissionEnum
 from .money import VAT
 
 
+class BulkJob(graphene.ObjectType):
+    id = graphene.ID(description="ID of the job.", required=True)
+    status = BulkJobStatusEnum(description="Status of the job.", required=True)
+    processed = graphene.Int(
+        description="Number of objects processed so far.", required=True
+    )
+    total = graphene.Int(description="Number of objects to process.", required=True)
+
+    class Meta:
+        description = "Represents a bulk mutation processed in the background."
+
+
 class CountryDisplay(graphene.ObjectType):
     code = graphene.String(description="Country code.", required=True)
     country = graphene.String(description="Country name.", required=True)
@@ -1,6 +1,6 @@
 import graphene
-from django_prices.templatetags import prices_i18n
 
+from ....core import money_format
 from ..enums import TaxRateType
 
 
@@ -16,7 +16,7 @@ class Money(graphene.ObjectType):
 
     @staticmethod
     def resolve_localized(root, _info):
-        return prices_i18n.amount(root)
+        return money_format.amount(root)
 
 
 class MoneyRange(graphene.ObjectType):
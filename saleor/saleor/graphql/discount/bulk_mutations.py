@@ -1,6 +1,8 @@
 import graphene
 
+from ...core.utils.deletion import delete_without_signals
 from ...discount import models
+from ...discount.utils import invalidate_vouchers
 from ..core.mutations import ModelBulkDeleteMutation
 
 
@@ -15,6 +17,10 @@ class SaleBulkDelete(ModelBulkDeleteMutation):
         model = models.Sale
         permissions = ("discount.manage_discounts",)
 
+    @classmethod
+    def delete_queryset(cls, queryset):
+        delete_without_signals(queryset)
+
 
 class VoucherBulkDelete(ModelBulkDeleteMutation):
     class Arguments:
@@ -26,3 +32,9 @@ class VoucherBulkDelete(ModelBulkDeleteMutation):
         description = "Deletes vouchers."
         model = models.Voucher
         permissions = ("discount.manage_discounts",)
+
+    @classmethod
+    def delete_queryset(cls, queryset):
+        delete_without_signals(queryset)
+        # Replaces the receiver of the voucher delete signal
+        invalidate_vouchers()
@@ -0,0 +1,82 @@
+"""JSON encoding of GraphQL requests and responses.
+
+Responses of the API are encoded straight to bytes with the fastest JSON
+library available; `orjson` is used when it is installed, the standard
+library `json` otherwise. The library can be forced with the
+`GRAPHQL_JSON_BACKEND` setting; if it is not installed, the fastest available
+one is used instead.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.conf import settings
+from django.utils.functional import Promise
+from prices import Money
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def default(obj):
+    """Serialize objects that the JSON libraries do not support natively."""
+    if isinstance(obj, decimal.Decimal):
+        # Same as the `Decimal` scalar of the API
+        return float(obj)
+    if isinstance(obj, Money):
+        return {"amount": float(obj.amount), "currency": obj.currency}
+    if isinstance(obj, dict):
+        # Results are made of OrderedDicts, which older versions of `orjson`
+        # do not serialize natively
+        return dict(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError("Object of type %s is not JSON serializable" % type(obj).__name__)
+
+
+def json_dumps(data):
+    return json.dumps(
+        data, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def json_loads(data):
+    return json.loads(data)
+
+
+def orjson_dumps(data):
+    return orjson.dumps(data, default=default)
+
+
+def orjson_loads(data):
+    return orjson.loads(data)
+
+
+BACKENDS = {"json": (json_dumps, json_loads)}
+if orjson is not None:
+    BACKENDS["orjson"] = (orjson_dumps, orjson_loads)
+
+
+def get_backend():
+    name = settings.GRAPHQL_JSON_BACKEND
+    if name not in BACKENDS:
+        # A backend that is not installed is reported by the saleor.W002 check
+        name = "orjson" if "orjson" in BACKENDS else "json"
+    return BACKENDS[name]
+
+
+def dumps(data):
+    """Return the data encoded as UTF-8 JSON bytes."""
+    return get_backend()[0](data)
+
+
+def loads(data):
+    """Decode JSON given as bytes or a string."""
+    return get_backend()[1](data)
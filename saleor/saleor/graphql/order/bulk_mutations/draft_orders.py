@@ -1,5 +1,4 @@
 import graphene
-from django.core.exceptions import ValidationError
 
 from ....order import OrderStatus, models
 from ...core.mutations import ModelBulkDeleteMutation
@@ -17,9 +16,13 @@ class DraftOrderBulkDelete(ModelBulkDeleteMutation):
         permissions = ("order.manage_orders",)
 
     @classmethod
-    def clean_instance(cls, info, instance):
-        if instance.status != OrderStatus.DRAFT:
-            raise ValidationError({"id": "Cannot delete non-draft orders."})
+    def clean_queryset(cls, info, queryset):
+        return [
+            (
+                queryset.exclude(status=OrderStatus.DRAFT),
+                "Cannot delete non-draft orders.",
+            )
+        ]
 
 
 class DraftOrderLinesBulkDelete(ModelBulkDeleteMutation):
@@ -34,6 +37,10 @@ class DraftOrderLinesBulkDelete(ModelBulkDeleteMutation):
         permissions = ("order.manage_orders",)
 
     @classmethod
-    def clean_instance(cls, _info, instance):
-        if instance.order.status != OrderStatus.DRAFT:
-            raise ValidationError({"id": "Cannot delete line for non-draft orders."})
+    def clean_queryset(cls, info, queryset):
+        return [
+            (
+                queryset.exclude(order__status=OrderStatus.DRAFT),
+                "Cannot delete line for non-draft orders.",
+            )
+        ]
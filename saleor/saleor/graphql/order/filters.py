@@ -2,10 +2,10 @@ import django_filters
 from django.db.models import Sum
 
 from ...order.models import Order
+from ...order.search import search_orders_by_customer
 from ..core.filters import ListObjectTypeFilter, ObjectTypeFilter
 from ..core.types.common import DateRangeInput
 from ..payment.enums import PaymentChargeStatusEnum
-from ..utils import filter_by_query_param
 from .enums import OrderStatusFilter
 
 
@@ -36,13 +36,8 @@ def filter_status(qs, _, value):
 
 
 def filter_customer(qs, _, value):
-    customer_fields = [
-        "user_email",
-        "user__first_name",
-        "user__last_name",
-        "user__email",
-    ]
-    qs = filter_by_query_param(qs, value, customer_fields)
+    if value:
+        qs = search_orders_by_customer(qs, value)
     return qs
 
 
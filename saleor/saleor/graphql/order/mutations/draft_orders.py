@@ -12,6 +12,7 @@ from ....order.utils import (
     change_order_line_quantity,
     delete_order_line,
     recalculate_order,
+    update_customer_stats,
     update_order_prices,
 )
 from ...account.i18n import I18nMixin
@@ -19,6 +20,7 @@ from ...account.types import AddressInput
 from ...core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ...core.scalars import Decimal
 from ...product.types import ProductVariant
+from ...utils import get_database_ids
 from ..types import Order, OrderLine
 from ..utils import validate_draft_order
 
@@ -244,6 +246,7 @@ class DraftOrderComplete(BaseMutation):
                 order.shipping_address.delete()
 
         order.save()
+        update_customer_stats([order.user_id])
 
         oversold_items = []
         for line in order:
@@ -291,11 +294,16 @@ class DraftOrderLinesCreate(BaseMutation):
             raise ValidationError({"id": "Only draft orders can be edited."})
 
         lines_to_add = []
-        for input_line in data.get("input"):
-            variant_id = input_line["variant_id"]
-            variant = cls.get_node_or_error(
-                info, variant_id, "variant_id", only_type=ProductVariant
-            )
+        input_lines = data.get("input")
+        variant_ids = [input_line["variant_id"] for input_line in input_lines]
+        # Fetch all variants with a single query
+        variants = cls.get_nodes_or_error(
+            variant_ids, "variant_id", only_type=ProductVariant
+        )
+        variants = {str(variant.pk): variant for variant in variants}
+        variant_pks = get_database_ids(variant_ids, only_type=ProductVariant)
+        for input_line, variant_pk in zip(input_lines, variant_pks):
+            variant = variants.get(variant_pk)
             quantity = input_line["quantity"]
             if quantity > 0:
                 if variant:
@@ -1,11 +1,9 @@
 import graphene
 import graphene_django_optimizer as gql_optimizer
 
-from ...order import OrderStatus, models
-from ...order.events import OrderEvents
-from ...order.models import OrderEvent
-from ...order.utils import sum_order_totals
-from ..utils import filter_by_period, filter_by_query_param
+from ...order import models
+from ...order.statistics import get_homepage_events, get_orders_total
+from ..utils import filter_by_period, filter_by_query_param, reporting_period_to_date
 from .enums import OrderStatusFilter
 from .types import Order
 
@@ -40,9 +38,7 @@ def resolve_draft_orders(info, created, query):
 
 
 def resolve_orders_total(_info, period):
-    qs = models.Order.objects.confirmed().exclude(status=OrderStatus.CANCELED)
-    qs = filter_by_period(qs, period, "created")
-    return sum_order_totals(qs)
+    return get_orders_total(reporting_period_to_date(period))
 
 
 def resolve_order(info, order_id):
@@ -55,13 +51,7 @@ def resolve_order(info, order_id):
 
 
 def resolve_homepage_events():
-    # Filter only selected events to be displayed on homepage.
-    types = [
-        OrderEvents.PLACED,
-        OrderEvents.PLACED_FROM_DRAFT,
-        OrderEvents.ORDER_FULLY_PAID,
-    ]
-    return OrderEvent.objects.filter(type__in=types)
+    return get_homepage_events()
 
 
 def resolve_order_by_token(token):
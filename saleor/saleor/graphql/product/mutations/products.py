@@ -232,16 +232,20 @@ class CollectionReorderProducts(BaseMutation):
         operations = []
         current_rel_pos = None
 
-        for move_info in moves:
-            product_id = from_global_id_strict_type(
+        product_ids = [
+            from_global_id_strict_type(
                 info, move_info.product_id, only_type=Product, field="moves"
             )
+            for move_info in moves
+        ]
+        nodes = models.CollectionProduct.objects.filter(
+            product_id__in=product_ids, collection_id=collection_id
+        )
+        nodes = {str(node.product_id): node for node in nodes}
 
-            try:
-                node = models.CollectionProduct.objects.get(
-                    product_id=product_id, collection_id=collection_id
-                )
-            except models.CollectionProduct.DoesNotExist:
+        for move_info, product_id in zip(moves, product_ids):
+            node = nodes.get(product_id)
+            if node is None:
                 raise ValidationError(
                     {"moves": "Couldn't resolve to a product: %s" % product_id}
                 )
@@ -847,17 +851,15 @@ class ProductImageReorder(BaseMutation):
         if len(images_ids) != product.images.count():
             raise ValidationError({"order": "Incorrect number of image IDs provided."})
 
-        images = []
-        for image_id in images_ids:
-            image = cls.get_node_or_error(
-                info, image_id, field="order", only_type=ProductImage
-            )
-            if image and image.product != product:
+        images = cls.get_nodes_or_error(images_ids, "order", only_type=ProductImage)
+        if len(images) != len(images_ids):
+            raise ValidationError({"order": "Incorrect number of image IDs provided."})
+        for image_id, image in zip(images_ids, images):
+            if image.product_id != product.pk:
                 raise ValidationError(
                     {"order": "Image %(image_id)s does not belong to this product."},
                     params={"image_id": image_id},
                 )
-            images.append(image)
 
         for order, image in enumerate(images):
             image.sort_order = order
@@ -5,7 +5,7 @@ from django.db.models import Q, Sum
 from ...order import OrderStatus
 from ...product import models
 from ...search.backends import picker
-from ..utils import filter_by_period, filter_by_query_param, get_database_id, get_nodes
+from ..utils import filter_by_period, filter_by_query_param, get_database_ids, get_nodes
 from .filters import (
     filter_products_by_attributes,
     filter_products_by_categories,
@@ -135,9 +135,7 @@ def resolve_product_variants(info, ids=None):
     )
     qs = models.ProductVariant.objects.filter(product__id__in=visible_products)
     if ids:
-        db_ids = [
-            get_database_id(info, node_id, only_type=ProductVariant) for node_id in ids
-        ]
+        db_ids = get_database_ids(ids, only_type=ProductVariant)
         qs = qs.filter(pk__in=db_ids)
     return gql_optimizer.query(qs, info)
 
@@ -0,0 +1,178 @@
+"""Static cost analysis of GraphQL queries.
+
+The cost of a query estimates the number of objects it resolves. Fields of
+list types multiply the cost of their selections by the `first` or `last`
+argument of the connection they belong to or by a default size of a list.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from graphene_django.settings import graphene_settings
+from graphql import GraphQLList, GraphQLNonNull
+from graphql.language import ast
+
+
+class QueryCostAnalyzer:
+    def __init__(self, schema, document_ast, variables=None):
+        self.schema = schema
+        self.variables = variables if isinstance(variables, dict) else {}
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document_ast.definitions
+            if isinstance(definition, ast.FragmentDefinition)
+        }
+        self.operations = [
+            definition
+            for definition in document_ast.definitions
+            if isinstance(definition, ast.OperationDefinition)
+        ]
+
+    def get_operation(self, operation_name=None):
+        for operation in self.operations:
+            if operation_name is None or (
+                operation.name and operation.name.value == operation_name
+            ):
+                return operation
+        return None
+
+    def get_root_type(self, operation):
+        if operation.operation == "mutation":
+            return self.schema.get_mutation_type()
+        if operation.operation == "subscription":
+            return self.schema.get_subscription_type()
+        return self.schema.get_query_type()
+
+    def analyze(self, operation_name=None):
+        """Return the estimated cost and the depth of the operation.
+
+        Invalid operations are not analyzed, they are rejected by the
+        validation before they are executed.
+        """
+        operation = self.get_operation(operation_name)
+        if operation is None:
+            return 0, 0
+        return self.get_selection_set_cost(
+            operation.selection_set, self.get_root_type(operation)
+        )
+
+    def get_selection_set_cost(self, selection_set, parent_type, limit=None):
+        cost, depth = 0, 0
+        for field, field_parent_type in self.get_fields(selection_set, parent_type):
+            field_cost, field_depth = self.get_field_cost(
+                field, field_parent_type, limit
+            )
+            cost += field_cost
+            depth = max(depth, field_depth)
+        return cost, depth
+
+    def get_fields(self, selection_set, parent_type, visited_fragments=()):
+        """Yield fields of a selection set with the types they are selected on."""
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                yield selection, parent_type
+                continue
+            if isinstance(selection, ast.FragmentSpread):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                if fragment is None or name in visited_fragments:
+                    continue
+                visited_fragments += (name,)
+            else:
+                fragment = selection
+            fragment_type = parent_type
+            if fragment.type_condition:
+                fragment_type = self.schema.get_type_map().get(
+                    fragment.type_condition.name.value
+                )
+            yield from self.get_fields(
+                fragment.selection_set, fragment_type, visited_fragments
+            )
+
+    def get_field_cost(self, field, parent_type, limit):
+        name = field.name.value
+        field_definitions = getattr(parent_type, "fields", None) or {}
+        if name.startswith("__") or name not in field_definitions:
+            return 0, 0
+        if not field.selection_set:
+            return 0, 1
+
+        field_type = field_definitions[name].type
+        multiplier = 1
+        if is_list_type(field_type):
+            if name == "edges" and is_connection_type(parent_type):
+                multiplier = limit or graphene_settings.RELAY_CONNECTION_MAX_LIMIT
+            else:
+                multiplier = settings.GRAPHQL_QUERY_DEFAULT_LIST_SIZE
+
+        children_cost, children_depth = self.get_selection_set_cost(
+            field.selection_set, get_named_type(field_type), self.get_limit(field)
+        )
+        return multiplier * (1 + children_cost), children_depth + 1
+
+    def get_limit(self, field):
+        for argument in field.arguments or []:
+            if argument.name.value not in ("first", "last"):
+                continue
+            value = argument.value
+            if isinstance(value, ast.Variable):
+                value = self.variables.get(value.name.value)
+            elif isinstance(value, ast.IntValue):
+                value = value.value
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+        return None
+
+
+def get_named_type(graphql_type):
+    while isinstance(graphql_type, (GraphQLList, GraphQLNonNull)):
+        graphql_type = graphql_type.of_type
+    return graphql_type
+
+
+def is_list_type(graphql_type):
+    if isinstance(graphql_type, GraphQLNonNull):
+        graphql_type = graphql_type.of_type
+    return isinstance(graphql_type, GraphQLList)
+
+
+def is_connection_type(graphql_type):
+    fields = getattr(graphql_type, "fields", None) or {}
+    return "edges" in fields and "pageInfo" in fields
+
+
+def count_objects(data):
+    if isinstance(data, dict):
+        return 1 + sum(count_objects(value) for value in data.values())
+    if isinstance(data, list):
+        return sum(count_objects(item) for item in data)
+    return 0
+
+
+def get_result_cost(data):
+    """Return the number of objects in the result data of a query."""
+    if not data:
+        return 0
+    # The root object is not counted in the estimated cost
+    return count_objects(data) - 1
+
+
+def consume_query_cost(client_key, cost):
+    """Add the cost to the cost used by the client in the current minute.
+
+    Return False if the client has exceeded its budget.
+    """
+    budget = settings.GRAPHQL_QUERY_COST_LIMIT_PER_MINUTE
+    if not budget:
+        return True
+    key = "graphql-cost:%s:%d" % (client_key, time.time() // 60)
+    cache.add(key, 0, 60)
+    try:
+        used = cache.incr(key, cost)
+    except ValueError:
+        # The counter expired in the meantime
+        used = cost
+        cache.set(key, used, 60)
+    return used <= budget
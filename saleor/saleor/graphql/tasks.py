@@ -0,0 +1,23 @@
+from django.utils.module_loading import import_string
+
+from ..celeryconf import app
+from .core.bulk_jobs import BulkJobStatus, get_bulk_job, update_bulk_job
+
+
+@app.task
+def run_bulk_mutation(mutation_path, pks, data, job_id):
+    """Run the action of a bulk mutation on objects chunk by chunk.
+
+    The job is updated after each chunk, so its progress can be polled.
+    """
+    mutation = import_string(mutation_path)
+    job = get_bulk_job(job_id) or {"id": job_id, "total": len(pks)}
+    update_bulk_job(job, status=BulkJobStatus.RUNNING, processed=0)
+    try:
+        for chunk in mutation.get_chunks(pks):
+            mutation.run_bulk_action(chunk, data)
+            update_bulk_job(job, processed=job["processed"] + len(chunk))
+    except Exception:
+        update_bulk_job(job, status=BulkJobStatus.FAILED)
+        raise
+    update_bulk_job(job, status=BulkJobStatus.SUCCESS)
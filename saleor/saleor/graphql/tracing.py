@@ -0,0 +1,200 @@
+"""Tracing of resolvers of the GraphQL API.
+
+A sample of requests is traced: the wall time and the number of SQL queries
+of every resolver are recorded and aggregated by the resolver path, with
+list indexes removed. The totals are collected by operation name in the
+cache and exposed in the Prometheus text format.
+"""
+import random
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from graphql.language import ast
+from promise import is_thenable
+
+TRACING_HEADER = "HTTP_X_GRAPHQL_TRACING"
+TRACING_OPERATIONS_KEY = "graphql-tracing:operations"
+TRACING_CACHE_TIMEOUT = 60 * 60 * 24
+ANONYMOUS_OPERATION = "anonymous"
+# Maximum number of operations whose totals are kept; traces of other
+# operations are recorded as anonymous
+TRACING_MAX_OPERATIONS = 100
+
+
+class Tracer:
+    def __init__(self, operation_name=None):
+        self.operation_name = operation_name or ANONYMOUS_OPERATION
+        self.start = None
+        self.duration = 0
+        self.queries = 0
+        # path -> [calls, duration, queries]
+        self.resolvers = defaultdict(lambda: [0, 0.0, 0])
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self._query_wrapper = connection.execute_wrapper(self.count_query)
+        self._query_wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._query_wrapper.__exit__(*exc_info)
+        self.duration = time.perf_counter() - self.start
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def add_resolver(self, path, duration, queries):
+        add_stats(self.resolvers[path], (1, duration, queries))
+
+    def get_report(self):
+        return {
+            "operationName": self.operation_name,
+            "duration": self.duration,
+            "queries": self.queries,
+            "resolvers": [
+                {"path": path, "calls": calls, "duration": duration, "queries": queries}
+                for path, (calls, duration, queries) in self.resolvers.items()
+            ],
+        }
+
+
+class TracingMiddleware:
+    """Record resolvers of requests traced by the GraphQL view.
+
+    Requests that are not traced only pay for a single attribute lookup.
+    """
+
+    def resolve(self, next, root, info, **args):
+        tracer = getattr(info.context, "graphql_tracer", None)
+        if tracer is None:
+            return next(root, info, **args)
+
+        path = get_resolver_path(info.path)
+        queries = tracer.queries
+        start = time.perf_counter()
+        result = next(root, info, **args)
+        if is_thenable(result):
+
+            def record(value):
+                tracer.add_resolver(
+                    path, time.perf_counter() - start, tracer.queries - queries
+                )
+                return value
+
+            return result.then(record)
+        tracer.add_resolver(path, time.perf_counter() - start, tracer.queries - queries)
+        return result
+
+
+def get_operation_name(document_ast, operation_name=None):
+    """Return the name of the executed operation as defined in the document.
+
+    Names sent by clients that do not match an operation of the document are
+    not recorded, so they cannot add arbitrary entries to the totals.
+    """
+    names = [
+        definition.name.value
+        for definition in document_ast.definitions
+        if isinstance(definition, ast.OperationDefinition) and definition.name
+    ]
+    if operation_name is None and len(names) == 1:
+        return names[0]
+    if operation_name in names:
+        return operation_name
+    return ANONYMOUS_OPERATION
+
+
+def get_resolver_path(path):
+    return ".".join(str(key) for key in path if not isinstance(key, int))
+
+
+def is_tracing_requested(request):
+    """Return True if the client asked for the tracing in the response.
+
+    Only staff members can see the tracing, as it reveals how the data is
+    fetched.
+    """
+    return bool(request.META.get(TRACING_HEADER)) and request.user.is_staff
+
+
+def should_trace():
+    sample_rate = settings.GRAPHQL_TRACING_SAMPLE_RATE
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def get_operation_key(operation_name):
+    return "graphql-tracing:operation:%s" % operation_name
+
+
+def record_trace(tracer):
+    """Add a trace to the totals of its operation.
+
+    Concurrent updates may lose a trace; the totals are statistics of a
+    sample anyway.
+    """
+    operation_name = tracer.operation_name
+    operations = cache.get(TRACING_OPERATIONS_KEY) or set()
+    if operation_name not in operations:
+        if len(operations) >= TRACING_MAX_OPERATIONS:
+            operation_name = ANONYMOUS_OPERATION
+        if operation_name not in operations:
+            operations.add(operation_name)
+            cache.set(TRACING_OPERATIONS_KEY, operations, TRACING_CACHE_TIMEOUT)
+
+    key = get_operation_key(operation_name)
+    totals = cache.get(key) or {"requests": [0, 0.0, 0], "resolvers": {}}
+    add_stats(totals["requests"], (1, tracer.duration, tracer.queries))
+    for path, stats in tracer.resolvers.items():
+        add_stats(totals["resolvers"].setdefault(path, [0, 0.0, 0]), stats)
+    cache.set(key, totals, TRACING_CACHE_TIMEOUT)
+
+
+def add_stats(totals, stats):
+    for index, value in enumerate(stats):
+        totals[index] += value
+
+
+def get_traces():
+    """Return totals of traced requests by the operation name."""
+    operations = cache.get(TRACING_OPERATIONS_KEY) or set()
+    keys = {get_operation_key(name): name for name in operations}
+    return {keys[key]: totals for key, totals in cache.get_many(keys).items()}
+
+
+def escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = [
+    ("requests_total", "Number of traced requests.", 0),
+    ("request_seconds_total", "Time spent executing traced requests.", 1),
+    ("request_queries_total", "SQL queries run by traced requests.", 2),
+    ("resolver_calls_total", "Number of traced resolver calls.", 0),
+    ("resolver_seconds_total", "Time spent in traced resolvers.", 1),
+    ("resolver_queries_total", "SQL queries run by traced resolvers.", 2),
+]
+
+
+def format_metrics(traces):
+    """Return the totals of traces in the Prometheus text format."""
+    lines = []
+    for name, description, index in METRICS:
+        metric = "saleor_graphql_%s" % name
+        lines.append("# HELP %s %s" % (metric, description))
+        lines.append("# TYPE %s counter" % metric)
+        for operation_name, totals in sorted(traces.items()):
+            operation_label = 'operation="%s"' % escape_label(operation_name)
+            if name.startswith("request"):
+                samples = [(operation_label, totals["requests"])]
+            else:
+                samples = [
+                    ('%s,path="%s"' % (operation_label, escape_label(path)), stats)
+                    for path, stats in sorted(totals["resolvers"].items())
+                ]
+            for labels, stats in samples:
+                lines.append("%s{%s} %s" % (metric, labels, stats[index]))
+    return "\n".join(lines) + "\n"
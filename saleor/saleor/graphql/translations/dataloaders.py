@@ -0,0 +1,32 @@
+from promise import Promise
+from promise.dataloader import DataLoader
+
+from ...core.utils.translations import get_translation, prefetch_translations
+
+
+class TranslationByLanguageLoader(DataLoader):
+    """Load translations of objects in a single language.
+
+    Objects requested while resolving a level of the query are batched, so
+    their translations are loaded with a single query per model.
+    """
+
+    def __init__(self, language_code):
+        super().__init__()
+        self.language_code = language_code
+
+    def batch_load_fn(self, instances):
+        prefetch_translations(instances, self.language_code)
+        return Promise.resolve(
+            [get_translation(instance, self.language_code) for instance in instances]
+        )
+
+
+def get_translation_loader(context, language_code):
+    """Return the loader of translations in a language for the request."""
+    loaders = getattr(context, "translation_loaders", None)
+    if loaders is None:
+        loaders = context.translation_loaders = {}
+    if language_code not in loaders:
+        loaders[language_code] = TranslationByLanguageLoader(language_code)
+    return loaders[language_code]
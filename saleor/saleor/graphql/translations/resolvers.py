@@ -2,11 +2,15 @@ import graphene_django_optimizer as gql_optimizer
 
 from ...product import models as product_models
 from ...shipping import models as shipping_models
+from .dataloaders import get_translation_loader
 
 
-def resolve_translation(instance, _info, language_code):
-    """Gets translation object from instance based on language code."""
-    return instance.translations.filter(language_code=language_code).first()
+def resolve_translation(instance, info, language_code):
+    """Gets translation object from instance based on language code.
+
+    Translations are loaded in batches of the objects resolved together.
+    """
+    return get_translation_loader(info.context, language_code).load(instance)
 
 
 def resolve_shipping_methods(info):
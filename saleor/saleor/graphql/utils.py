@@ -12,6 +12,8 @@ ERROR_COULD_NO_RESOLVE_GLOBAL_ID = (
     "Could not resolve to a node with the global id list of '%s'."
 )
 registry = get_global_registry()
+# Graphene types by name, filled from the registry on lookups
+graphene_types = {}
 
 
 def get_database_id(info, node_id, only_type):
@@ -23,6 +25,22 @@ def get_database_id(info, node_id, only_type):
     return _id
 
 
+def get_database_ids(node_ids, only_type):
+    """Get database IDs from a list of node IDs of given type.
+
+    Type names are unique in the schema, so the types are compared by name
+    without looking them up in the schema for each ID.
+    """
+    type_name = only_type._meta.name
+    db_ids = []
+    for node_id in node_ids:
+        _type, _id = graphene.relay.Node.from_global_id(node_id)
+        if _type != type_name:
+            raise AssertionError("Must receive a %s id." % type_name)
+        db_ids.append(_id)
+    return db_ids
+
+
 def _check_graphene_type(requested_graphene_type, received_type):
     if requested_graphene_type:
         assert str(requested_graphene_type) == received_type, (
@@ -31,9 +49,14 @@ def _check_graphene_type(requested_graphene_type, received_type):
 
 
 def _resolve_nodes(ids, graphene_type=None):
+    """Decode global IDs and check that they are all of the same type.
+
+    Return the type and the list of primary keys. The IDs are decoded first,
+    so the type is checked once per distinct type rather than for each ID.
+    """
     pks = []
+    node_types = {}
     invalid_ids = []
-    used_type = graphene_type
 
     for graphql_id in ids:
         if not graphql_id:
@@ -45,9 +68,13 @@ def _resolve_nodes(ids, graphene_type=None):
             invalid_ids.append(graphql_id)
             continue
 
+        node_types.setdefault(node_type, None)
+        pks.append(_id)
+
+    used_type = graphene_type
+    for node_type in node_types:
         _check_graphene_type(used_type, node_type)
         used_type = node_type
-        pks.append(_id)
 
     if invalid_ids:
         raise GraphQLError(ERROR_COULD_NO_RESOLVE_GLOBAL_ID % invalid_ids)
@@ -56,10 +83,15 @@ def _resolve_nodes(ids, graphene_type=None):
 
 
 def _resolve_graphene_type(type_name):
-    for _, _type in registry._registry.items():
-        if _type._meta.name == type_name:
-            return _type
-    raise AssertionError("Could not resolve the type {}".format(type_name))
+    graphene_type = graphene_types.get(type_name)
+    if graphene_type is None:
+        # Types are registered when they are imported, refresh the map
+        for _type in registry._registry.values():
+            graphene_types.setdefault(_type._meta.name, _type)
+        graphene_type = graphene_types.get(type_name)
+    if graphene_type is None:
+        raise AssertionError("Could not resolve the type {}".format(type_name))
+    return graphene_type
 
 
 def get_nodes(ids, graphene_type=None):
@@ -78,18 +110,17 @@ def get_nodes(ids, graphene_type=None):
     if nodes_type and not graphene_type:
         graphene_type = _resolve_graphene_type(nodes_type)
 
-    nodes = list(graphene_type._meta.model.objects.filter(pk__in=pks))
-    nodes.sort(key=lambda e: pks.index(str(e.pk)))  # preserve order in pks
-
+    nodes = graphene_type._meta.model.objects.in_bulk(pks)
     if not nodes:
         raise GraphQLError(ERROR_COULD_NO_RESOLVE_GLOBAL_ID % ids)
 
-    nodes_pk_list = [str(node.pk) for node in nodes]
+    nodes = {str(pk): node for pk, node in nodes.items()}
     for pk in pks:
-        assert pk in nodes_pk_list, "There is no node of type {} with pk {}".format(
+        assert pk in nodes, "There is no node of type {} with pk {}".format(
             graphene_type, pk
         )
-    return nodes
+    # Preserve the order of pks, without duplicates
+    return [nodes[pk] for pk in dict.fromkeys(pks)]
 
 
 def filter_by_query_param(queryset, query, search_fields):
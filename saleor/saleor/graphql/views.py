@@ -3,8 +3,19 @@ import logging
 import traceback
 
 from django.conf import settings
-from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseNotAllowed,
+)
 from django.shortcuts import render_to_response
+from django.utils.cache import (
+    add_never_cache_headers,
+    patch_cache_control,
+    patch_vary_headers,
+)
 from django.views.generic import View
 from graphene_django.settings import graphene_settings
 from graphene_django.views import instantiate_middleware
@@ -16,6 +27,24 @@ from graphql.error import (
 )
 from graphql.execution import ExecutionResult
 
+from ..core.utils import get_trusted_client_ip
+from . import encoding
+from .cache_control import (
+    CacheControlAnalyzer,
+    get_persisted_query,
+    get_persisted_query_hash,
+)
+from .query_cost import QueryCostAnalyzer, consume_query_cost, get_result_cost
+from .tracing import (
+    Tracer,
+    format_metrics,
+    get_operation_name,
+    get_traces,
+    is_tracing_requested,
+    record_trace,
+    should_trace,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,32 +82,32 @@ class GraphQLView(View):
 
     def dispatch(self, request, *args, **kwargs):
         # Handle options method the GraphQlView restricts it.
-        if request.method == "GET":
+        is_query_in_url = "query" in request.GET or "extensions" in request.GET
+        if request.method == "GET" and not is_query_in_url:
             if settings.DEBUG:
                 return render_to_response("graphql/playground.html")
             return HttpResponseNotAllowed(["OPTIONS", "POST"])
 
         if request.method == "OPTIONS":
             response = self.options(request, *args, **kwargs)
-        elif request.method == "POST":
+        elif request.method in ["GET", "POST"]:
             response = self.handle_query(request)
         else:
             return HttpResponseNotAllowed(["GET", "OPTIONS", "POST"])
         # Add access control headers
         response["Access-Control-Allow-Origin"] = settings.ALLOWED_GRAPHQL_ORIGINS
-        response["Access-Control-Allow-Methods"] = "POST, OPTIONS"
+        response["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
         response[
             "Access-Control-Allow-Headers"
-        ] = "Origin, Content-Type, Accept, Authorization"
+        ] = "Origin, Content-Type, Accept, Authorization, X-GraphQL-Tracing"
         return response
 
     def handle_query(self, request: HttpRequest):
         try:
             data = self.parse_body(request)
         except ValueError:
-            return JsonResponse(
-                data={"errors": [self.format_error("Unable to parse query.")]},
-                status=400,
+            return self.json_response(
+                {"errors": [self.format_error("Unable to parse query.")]}, status=400
             )
 
         if isinstance(data, list):
@@ -87,7 +116,37 @@ class GraphQLView(View):
             status_code = max((code for response, code in responses), default=200)
         else:
             result, status_code = self.get_response(request, data)
-        return JsonResponse(data=result, status=status_code, safe=False)
+        response = self.json_response(result, status=status_code)
+        if request.method == "GET":
+            self.add_cache_headers(request, response, result)
+        return response
+
+    @staticmethod
+    def add_cache_headers(request: HttpRequest, response: HttpResponse, result):
+        """Allow HTTP caches to store successful results of public persisted
+        queries.
+        """
+        max_age = getattr(request, "graphql_cache_max_age", 0)
+        is_cacheable = (
+            max_age > 0
+            and response.status_code == 200
+            and "errors" not in result
+            and not request.user.is_authenticated
+        )
+        if is_cacheable:
+            patch_cache_control(response, public=True, max_age=max_age)
+            response["Surrogate-Key"] = " ".join(sorted(request.graphql_surrogate_keys))
+        else:
+            add_never_cache_headers(response)
+        patch_vary_headers(response, ["Accept-Language", "Authorization"])
+
+    @staticmethod
+    def json_response(data, status=200):
+        # The data is encoded straight to bytes, without the copies made by
+        # `JsonResponse`
+        return HttpResponse(
+            encoding.dumps(data), status=status, content_type="application/json"
+        )
 
     def get_response(self, request: HttpRequest, data: dict):
         execution_result = self.execute_graphql_request(request, data)
@@ -102,6 +161,8 @@ class GraphQLView(View):
                 status_code = 400
             else:
                 response["data"] = execution_result.data
+            if execution_result.extensions:
+                response["extensions"] = execution_result.extensions
             result = response
         else:
             result = None
@@ -133,36 +194,129 @@ class GraphQLView(View):
 
     def execute_graphql_request(self, request: HttpRequest, data: dict):
         query, variables, operation_name = self.get_graphql_params(request, data)
+        # Only queries sent by their hash are cached; caching ad-hoc queries
+        # would let clients fill HTTP caches with unique query strings
+        is_persisted_query = query is None and bool(
+            get_persisted_query_hash(data.get("extensions"))
+        )
+        try:
+            query = get_persisted_query(query, data.get("extensions"))
+        except ValueError as e:
+            return ExecutionResult(errors=[e], invalid=True)
 
         document, error = self.parse_query(query)
         if error:
             return error
 
+        if request.method == "GET":
+            if document.get_operation_type(operation_name) != "query":
+                error = GraphQLError("Only queries can be executed with GET requests.")
+                return ExecutionResult(errors=[error], invalid=True)
+            if is_persisted_query:
+                request.graphql_cache_max_age = CacheControlAnalyzer(
+                    self.schema, document.document_ast, variables
+                ).get_max_age(operation_name)
+                # Filled by the surrogate key middleware
+                request.graphql_surrogate_keys = set()
+
+        cost, depth = QueryCostAnalyzer(
+            self.schema, document.document_ast, variables
+        ).analyze(operation_name)
+        error = self.check_query_cost(request, cost, depth)
+        if error:
+            return error
+
         extra_options = {}
         if self.executor:
             # We only include it optionally since
             # executor is not a valid argument in all backends
             extra_options["executor"] = self.executor
+        tracing_requested = is_tracing_requested(request)
+        tracer = None
+        if tracing_requested or should_trace():
+            tracer = Tracer(get_operation_name(document.document_ast, operation_name))
+        # Read by the tracing middleware; batched queries are traced separately
+        request.graphql_tracer = tracer
         try:
-            return document.execute(
-                root=self.get_root_value(),
-                variables=variables,
-                operation_name=operation_name,
-                context=request,
-                middleware=self.middleware,
-                **extra_options,
-            )
+            if tracer:
+                with tracer:
+                    result = self.execute_document(
+                        request, document, variables, operation_name, extra_options
+                    )
+            else:
+                result = self.execute_document(
+                    request, document, variables, operation_name, extra_options
+                )
         except Exception as e:
             return ExecutionResult(errors=[e], invalid=True)
+        finally:
+            request.graphql_tracer = None
+
+        actual_cost = get_result_cost(result.data)
+        logger.debug("Query cost: %d estimated, %d actual", cost, actual_cost)
+        result.extensions = {
+            "cost": {
+                "requestedQueryCost": cost,
+                "actualQueryCost": actual_cost,
+                "maximumAvailable": settings.GRAPHQL_QUERY_MAX_COST,
+            }
+        }
+        if tracer:
+            record_trace(tracer)
+            if tracing_requested:
+                result.extensions["tracing"] = tracer.get_report()
+        return result
+
+    def execute_document(
+        self, request, document, variables, operation_name, extra_options
+    ):
+        return document.execute(
+            root=self.get_root_value(),
+            variables=variables,
+            operation_name=operation_name,
+            context=request,
+            middleware=self.middleware,
+            **extra_options,
+        )
+
+    @staticmethod
+    def check_query_cost(request: HttpRequest, cost: int, depth: int):
+        """Return an error result if the query is too expensive to execute."""
+        error = None
+        if depth > settings.GRAPHQL_QUERY_MAX_DEPTH:
+            error = "Query depth %d exceeds the maximum depth of %d." % (
+                depth,
+                settings.GRAPHQL_QUERY_MAX_DEPTH,
+            )
+        elif cost > settings.GRAPHQL_QUERY_MAX_COST:
+            error = "Query cost %d exceeds the maximum cost of %d." % (
+                cost,
+                settings.GRAPHQL_QUERY_MAX_COST,
+            )
+        else:
+            if request.user.is_authenticated:
+                client_key = "user-%s" % request.user.pk
+            else:
+                client_key = "ip-%s" % get_trusted_client_ip(request)
+            if not consume_query_cost(client_key, cost):
+                error = "Query cost limit per minute exceeded, retry later."
+        if error:
+            return ExecutionResult(errors=[GraphQLError(error)], invalid=True)
+        return None
 
     @staticmethod
     def parse_body(request: HttpRequest):
+        if request.method == "GET":
+            data = request.GET.dict()
+            for key in ["variables", "extensions"]:
+                if key in data:
+                    data[key] = encoding.loads(data[key])
+            return data
         content_type = request.content_type
         if content_type == "application/graphql":
             return {"query": request.body.decode("utf-8")}
         if content_type == "application/json":
-            body = request.body.decode("utf-8")
-            return json.loads(body)
+            return encoding.loads(request.body)
         if content_type in ["application/x-www-form-urlencoded", "multipart/form-data"]:
             return request.POST
         return {}
@@ -210,6 +364,26 @@ class GraphQLView(View):
         return result
 
 
+def metrics(request):
+    """Return totals of traced GraphQL requests in the Prometheus text format.
+
+    The endpoint is available to staff members and to clients sending
+    the `GRAPHQL_METRICS_TOKEN` as a bearer token.
+    """
+    token = settings.GRAPHQL_METRICS_TOKEN
+    if not settings.GRAPHQL_TRACING_SAMPLE_RATE:
+        raise Http404()
+    authorization = request.META.get("HTTP_AUTHORIZATION", "")
+    is_authorized = request.user.is_staff or (
+        token and authorization == "Bearer %s" % token
+    )
+    if not is_authorized:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        format_metrics(get_traces()), content_type="text/plain; version=0.0.4"
+    )
+
+
 def get_key(key):
     try:
         int_key = int(key)
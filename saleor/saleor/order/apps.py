@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class OrderAppConfig(AppConfig):
+    name = "saleor.order"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
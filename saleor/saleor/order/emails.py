@@ -1,9 +1,9 @@
 from django.conf import settings
 from django.urls import reverse
-from templated_email import send_templated_mail
+from templated_email import get_templated_mail
 
 from ..celeryconf import app
-from ..core.emails import get_email_base_context
+from ..core.emails import get_email_base_context, send_email_messages
 from ..core.utils import build_absolute_uri
 from ..seo.schema.email import get_order_confirmation_markup
 from . import events
@@ -14,6 +14,14 @@ CONFIRM_FULFILLMENT_TEMPLATE = "order/confirm_fulfillment"
 UPDATE_FULFILLMENT_TEMPLATE = "order/update_fulfillment"
 CONFIRM_PAYMENT_TEMPLATE = "order/payment/confirm_payment"
 
+# Type of the email sent event recorded for each template
+EMAIL_TYPES = {
+    CONFIRM_ORDER_TEMPLATE: events.OrderEventsEmails.ORDER,
+    CONFIRM_FULFILLMENT_TEMPLATE: events.OrderEventsEmails.FULFILLMENT,
+    UPDATE_FULFILLMENT_TEMPLATE: events.OrderEventsEmails.TRACKING_UPDATED,
+    CONFIRM_PAYMENT_TEMPLATE: events.OrderEventsEmails.PAYMENT,
+}
+
 
 def collect_data_for_email(order_pk, template):
     """Collects data required for email sending.
@@ -23,6 +31,16 @@ def collect_data_for_email(order_pk, template):
         template (str): email template path
     """
     order = Order.objects.get(pk=order_pk)
+    return get_email_data_for_order(order, template)
+
+
+def get_email_data_for_order(order, template):
+    """Collects data required for email sending of an already fetched order.
+
+    Args:
+        order (Order): order instance
+        template (str): email template path
+    """
     recipient_email = order.get_user_current_email()
     email_context = get_email_base_context()
     email_context["order_details_url"] = build_absolute_uri(
@@ -44,8 +62,13 @@ def collect_data_for_email(order_pk, template):
 
 
 def collect_data_for_fullfillment_email(order_pk, template, fulfillment_pk):
+    order = Order.objects.get(pk=order_pk)
     fulfillment = Fulfillment.objects.get(pk=fulfillment_pk)
-    email_data = collect_data_for_email(order_pk, template)
+    return get_email_data_for_fulfillment(order, template, fulfillment)
+
+
+def get_email_data_for_fulfillment(order, template, fulfillment):
+    email_data = get_email_data_for_order(order, template)
     lines = fulfillment.lines.all()
     physical_lines = [line for line in lines if not line.order_line.is_digital]
     digital_lines = [line for line in lines if line.order_line.is_digital]
@@ -60,52 +83,92 @@ def collect_data_for_fullfillment_email(order_pk, template, fulfillment_pk):
     return email_data
 
 
+def get_order_email_message(order, template, fulfillment=None):
+    """Render an order email without sending it."""
+    if fulfillment is None:
+        email_data = get_email_data_for_order(order, template)
+    else:
+        email_data = get_email_data_for_fulfillment(order, template, fulfillment)
+    return get_templated_mail(
+        template_name=email_data["template_name"],
+        context=email_data["context"],
+        from_email=email_data["from_email"],
+        to=email_data["recipient_list"],
+    )
+
+
+def send_order_emails(template, order_pks, user_pk=None, fulfillment_pk=None):
+    """Render the emails of orders and send them over the pooled connection.
+
+    Email sent events are bulk created only for the delivered messages.
+    """
+    orders = (
+        Order.objects.filter(pk__in=order_pks)
+        .select_related("user", "shipping_address", "billing_address")
+        .prefetch_related("lines__variant__product")
+    )
+    orders = [order for order in orders if order.get_user_current_email()]
+    fulfillment = None
+    if fulfillment_pk is not None:
+        fulfillment = Fulfillment.objects.prefetch_related(
+            "lines__order_line__variant__digital_content"
+        ).get(pk=fulfillment_pk)
+
+    messages = [
+        (get_order_email_message(order, template, fulfillment), order)
+        for order in orders
+    ]
+    sent = send_email_messages([message for message, _ in messages])
+    sent_ids = {id(message) for message in sent}
+    sent_orders = [order for message, order in messages if id(message) in sent_ids]
+
+    email_types = [EMAIL_TYPES[template]]
+    # The fulfillment confirmation includes the links to the digital lines
+    if template == CONFIRM_FULFILLMENT_TEMPLATE and any(
+        line.order_line.is_digital for line in fulfillment.lines.all()
+    ):
+        email_types.append(events.OrderEventsEmails.DIGITAL_LINKS)
+    for email_type in email_types:
+        events.email_sent_events(
+            orders=sent_orders, user_pk=user_pk, email_type=email_type
+        )
+
+
 @app.task
 def send_order_confirmation(order_pk, user_pk=None):
     """Sends order confirmation email."""
-    email_data = collect_data_for_email(order_pk, CONFIRM_ORDER_TEMPLATE)
-    send_templated_mail(**email_data)
-    events.email_sent_event(
-        order=email_data["context"]["order"],
-        user=None,
-        user_pk=user_pk,
-        email_type=events.OrderEventsEmails.ORDER,
-    )
+    send_order_emails(CONFIRM_ORDER_TEMPLATE, [order_pk], user_pk)
 
 
-@app.task
-def send_fulfillment_confirmation(order_pk, fulfillment_pk):
-    email_data = collect_data_for_fullfillment_email(
-        order_pk, CONFIRM_FULFILLMENT_TEMPLATE, fulfillment_pk
-    )
-    send_templated_mail(**email_data)
+@app.task(rate_limit=settings.EMAIL_RATE_LIMIT)
+def send_order_confirmations(order_pks, user_pk=None):
+    """Sends order confirmation emails in batches over a pooled connection."""
+    send_order_emails(CONFIRM_ORDER_TEMPLATE, order_pks, user_pk)
 
 
-def send_fulfillment_confirmation_to_customer(order, fulfillment, user):
-    send_fulfillment_confirmation.delay(order.pk, fulfillment.pk)
+def queue_order_confirmations(order_pks, user_pk=None):
+    """Schedule confirmation emails of many orders split into batches."""
+    order_pks = list(order_pks)
+    batch_size = settings.EMAIL_BATCH_SIZE
+    for start in range(0, len(order_pks), batch_size):
+        send_order_confirmations.delay(order_pks[start : start + batch_size], user_pk)
 
-    events.email_sent_event(
-        order=order, user=user, email_type=events.OrderEventsEmails.FULFILLMENT
-    )
 
-    # If digital lines were sent in the fulfillment email,
-    # trigger the event
-    if any((line for line in order if line.variant.is_digital())):
-        events.email_sent_event(
-            order=order, user=user, email_type=events.OrderEventsEmails.DIGITAL_LINKS
-        )
+@app.task
+def send_fulfillment_confirmation(order_pk, fulfillment_pk, user_pk=None):
+    send_order_emails(CONFIRM_FULFILLMENT_TEMPLATE, [order_pk], user_pk, fulfillment_pk)
+
+
+def send_fulfillment_confirmation_to_customer(order, fulfillment, user):
+    send_fulfillment_confirmation.delay(order.pk, fulfillment.pk, user.pk)
 
 
 @app.task
-def send_fulfillment_update(order_pk, fulfillment_pk):
-    email_data = collect_data_for_fullfillment_email(
-        order_pk, UPDATE_FULFILLMENT_TEMPLATE, fulfillment_pk
-    )
-    send_templated_mail(**email_data)
+def send_fulfillment_update(order_pk, fulfillment_pk, user_pk=None):
+    send_order_emails(UPDATE_FULFILLMENT_TEMPLATE, [order_pk], user_pk, fulfillment_pk)
 
 
 @app.task
 def send_payment_confirmation(order_pk):
     """Sends payment confirmation email."""
-    email_data = collect_data_for_email(order_pk, CONFIRM_PAYMENT_TEMPLATE)
-    send_templated_mail(**email_data)
+    send_order_emails(CONFIRM_PAYMENT_TEMPLATE, [order_pk])
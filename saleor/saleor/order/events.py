@@ -51,6 +51,26 @@ def email_sent_event(
     )
 
 
+def email_sent_events(
+    *, orders: List[Order], email_type: OrderEventsEmails, user_pk: int = None
+) -> List[OrderEvent]:
+    """Record an email sent event for each order in a single query."""
+    return OrderEvent.objects.bulk_create(
+        [
+            OrderEvent(
+                order=order,
+                user_id=user_pk,
+                type=OrderEvents.EMAIL_SENT,
+                parameters={
+                    "email": order.get_user_current_email(),
+                    "email_type": email_type,
+                },
+            )
+            for order in orders
+        ]
+    )
+
+
 def email_resent_event(
     *, order: Order, user: UserType, email_type: OrderEventsEmails
 ) -> OrderEvent:
@@ -0,0 +1,46 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+FILL_CUSTOMER_SEARCH_DOCUMENT = """
+UPDATE order_order o
+SET customer_search_document = concat_ws(
+    ' ',
+    NULLIF(o.user_email, ''),
+    NULLIF(u.email, ''),
+    NULLIF(u.first_name, ''),
+    NULLIF(u.last_name, ''),
+    NULLIF(a.first_name, ''),
+    NULLIF(a.last_name, '')
+)
+FROM account_user u
+LEFT JOIN account_address a ON a.id = u.default_billing_address_id
+WHERE o.user_id = u.id;
+
+UPDATE order_order
+SET customer_search_document = user_email
+WHERE user_id IS NULL;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("order", "0071_order_gift_cards")]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="order",
+            name="customer_search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunSQL(FILL_CUSTOMER_SEARCH_DOCUMENT, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="order",
+            index=GinIndex(
+                fields=["customer_search_document"],
+                name="order_customer_search_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
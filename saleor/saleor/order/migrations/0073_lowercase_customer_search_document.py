@@ -0,0 +1,14 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("order", "0072_order_customer_search_document")]
+
+    operations = [
+        migrations.RunSQL(
+            "UPDATE order_order "
+            "SET customer_search_document = lower(customer_search_document);",
+            migrations.RunSQL.noop,
+        )
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("order", "0073_lowercase_customer_search_document")]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="orderevent",
+            index=models.Index(
+                fields=["type", "date"], name="order_event_type_date_idx"
+            ),
+        )
+    ]
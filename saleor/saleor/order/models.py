@@ -4,6 +4,7 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models import F, Max, Sum
@@ -24,6 +25,7 @@ from ..giftcard.models import GiftCard
 from ..payment import ChargeStatus, TransactionKind
 from ..shipping.models import ShippingMethod
 from . import FulfillmentStatus, OrderEvents, OrderStatus
+from .search import prepare_order_customer_search_document
 
 
 class OrderQueryset(models.QuerySet):
@@ -141,10 +143,18 @@ class Order(models.Model):
     weight = MeasurementField(
         measurement=Weight, unit_choices=WeightUnits.CHOICES, default=zero_weight
     )
+    customer_search_document = models.TextField(blank=True, default="", editable=False)
     objects = OrderQueryset.as_manager()
 
     class Meta:
         ordering = ("-pk",)
+        indexes = [
+            GinIndex(
+                fields=["customer_search_document"],
+                name="order_customer_search_gin",
+                opclasses=["gin_trgm_ops"],
+            )
+        ]
         permissions = (
             (
                 "manage_orders",
@@ -155,6 +165,13 @@ class Order(models.Model):
     def save(self, *args, **kwargs):
         if not self.token:
             self.token = str(uuid4())
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"user", "user_email"} & set(update_fields):
+            self.customer_search_document = prepare_order_customer_search_document(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = list(update_fields) + [
+                    "customer_search_document"
+                ]
         return super().save(*args, **kwargs)
 
     def is_fully_paid(self):
@@ -458,6 +475,9 @@ class OrderEvent(models.Model):
 
     class Meta:
         ordering = ("date",)
+        indexes = [
+            models.Index(fields=["type", "date"], name="order_event_type_date_idx")
+        ]
 
     def __repr__(self):
         return f"{self.__class__.__name__}(type={self.type!r}, user={self.user!r})"
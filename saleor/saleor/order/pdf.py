@@ -0,0 +1,175 @@
+"""Rendering of order PDF documents and their storage by content hash."""
+import hashlib
+import json
+from functools import lru_cache
+
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template.loader import get_template
+from django.utils.translation import get_language
+
+INVOICE_TEMPLATE = "dashboard/order/pdf/invoice.html"
+PACKING_SLIP_TEMPLATE = "dashboard/order/pdf/packing_slip.html"
+# Templates rendered in the documents, including the extended and included ones
+PDF_TEMPLATES = [
+    "dashboard/order/pdf/base_pdf.html",
+    INVOICE_TEMPLATE,
+    PACKING_SLIP_TEMPLATE,
+    "dashboard/includes/_address.html",
+]
+PDF_STORAGE_DIR = "order-pdfs"
+# Seconds for which a document waiting to be rendered is not queued again
+PDF_GENERATION_LOCK_TIMEOUT = 60
+
+
+def _create_pdf(rendered_template, absolute_url):
+    from weasyprint import HTML
+
+    pdf_file = HTML(string=rendered_template, base_url=absolute_url).write_pdf()
+    return pdf_file
+
+
+def _render_invoice(order):
+    ctx = {"order": order, "site": Site.objects.get_current()}
+    return get_template(INVOICE_TEMPLATE).render(ctx)
+
+
+def _render_packing_slip(order, fulfillment):
+    ctx = {
+        "order": order,
+        "fulfillment": fulfillment,
+        "site": Site.objects.get_current(),
+    }
+    return get_template(PACKING_SLIP_TEMPLATE).render(ctx)
+
+
+def create_invoice_pdf(order, absolute_url):
+    rendered_template = _render_invoice(order)
+    pdf_file = _create_pdf(rendered_template, absolute_url)
+    return pdf_file, order
+
+
+def create_packing_slip_pdf(order, fulfillment, absolute_url):
+    rendered_template = _render_packing_slip(order, fulfillment)
+    pdf_file = _create_pdf(rendered_template, absolute_url)
+    return pdf_file, order
+
+
+def create_bulk_invoices_pdf(orders, absolute_url):
+    """Render invoices of many orders merged into a single PDF document."""
+    from weasyprint import HTML
+
+    documents = [
+        HTML(string=_render_invoice(order), base_url=absolute_url).render()
+        for order in orders
+    ]
+    pages = [page for document in documents for page in document.pages]
+    return documents[0].copy(pages).write_pdf()
+
+
+def _hash_data(data):
+    serialized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_templates_version():
+    """Return a hash of the sources of the templates rendered in documents.
+
+    Templates are read once per process, so documents stored before a
+    deployment changing them are not served anymore.
+    """
+    return _hash_data(
+        [get_template(template).template.source for template in PDF_TEMPLATES]
+    )
+
+
+def get_order_content_hash(order, fulfillment=None):
+    """Return a hash of all order data rendered in its PDF documents.
+
+    Documents are stored under this hash so they are rendered again only when
+    the content of the order, the active language or the templates change.
+    """
+    data = {
+        "language": get_language(),
+        "templates_version": get_templates_version(),
+        "id": order.pk,
+        "created": order.created,
+        "billing_address": (
+            order.billing_address.as_data() if order.billing_address else None
+        ),
+        "shipping_address": (
+            order.shipping_address.as_data() if order.shipping_address else None
+        ),
+        "shipping_method_name": order.shipping_method_name,
+        "shipping_price": order.shipping_price,
+        "discount_amount": order.discount_amount,
+        "discount_name": order.discount_name,
+        "translated_discount_name": order.translated_discount_name,
+        "total": order.total,
+        "lines": [
+            (
+                line.pk,
+                line.product_name,
+                line.product_sku,
+                line.quantity,
+                line.unit_price,
+                line.tax_rate,
+            )
+            for line in order
+        ],
+    }
+    if fulfillment is not None:
+        data["fulfillment"] = {
+            "id": fulfillment.pk,
+            "name": str(fulfillment),
+            "lines": [
+                (
+                    line.order_line.product_name,
+                    line.order_line.product_sku,
+                    line.quantity,
+                )
+                for line in fulfillment.lines.all()
+            ],
+        }
+    return _hash_data(data)
+
+
+def get_invoice_pdf_path(order):
+    return "%s/invoice-%s-%s.pdf" % (
+        PDF_STORAGE_DIR,
+        order.pk,
+        get_order_content_hash(order),
+    )
+
+
+def get_packing_slip_pdf_path(order, fulfillment):
+    return "%s/packing-slip-%s-%s.pdf" % (
+        PDF_STORAGE_DIR,
+        order.pk,
+        get_order_content_hash(order, fulfillment),
+    )
+
+
+def get_bulk_invoices_pdf_path(orders):
+    orders_hash = _hash_data([get_order_content_hash(order) for order in orders])
+    return "%s/invoices-%s.pdf" % (PDF_STORAGE_DIR, orders_hash)
+
+
+def get_pdf_lock_key(path):
+    return "order-pdf-lock:%s" % path
+
+
+def acquire_pdf_generation_lock(path):
+    """Return True if the caller should queue rendering of the document."""
+    return cache.add(get_pdf_lock_key(path), True, PDF_GENERATION_LOCK_TIMEOUT)
+
+
+def store_pdf(path, pdf_file):
+    """Save a rendered document unless it was already stored under the path."""
+    if not default_storage.exists(path):
+        default_storage.save(path, ContentFile(pdf_file))
+    cache.delete(get_pdf_lock_key(path))
+    return path
@@ -0,0 +1,45 @@
+def prepare_search_document(parts):
+    """Join the non-empty parts of a search document.
+
+    Documents are stored lowercased, so they are searched with a
+    case-sensitive `LIKE` that the trigram index serves.
+    """
+    return " ".join(part for part in parts if part).lower()
+
+
+def prepare_user_search_document_value(user):
+    """Return the user-dependent part of the order customer search document."""
+    parts = [user.email, user.first_name, user.last_name]
+    address = user.default_billing_address
+    if address:
+        parts += [address.first_name, address.last_name]
+    return prepare_search_document(parts)
+
+
+def prepare_order_customer_search_document(order):
+    """Return the denormalized customer search document of an order.
+
+    The document is stored on the order so customer lookups can hit a single
+    trigram-indexed column instead of joining users and addresses.
+    """
+    parts = [order.user_email]
+    if order.user:
+        parts.append(prepare_user_search_document_value(order.user))
+    return prepare_search_document(parts)
+
+
+def update_user_orders_customer_search_document(user):
+    """Refresh the customer search document of all orders placed by the user."""
+    user_value = prepare_user_search_document_value(user)
+    orders = user.orders.all()
+    # Orders of a user share a handful of emails, update them per email; the
+    # default ordering is cleared, otherwise the pk would be distinct as well
+    user_emails = orders.order_by().values_list("user_email", flat=True).distinct()
+    for user_email in user_emails:
+        orders.filter(user_email=user_email).update(
+            customer_search_document=prepare_search_document([user_email, user_value])
+        )
+
+
+def search_orders_by_customer(queryset, value):
+    return queryset.filter(customer_search_document__contains=value.lower())
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from . import OrderEvents
+from .models import OrderEvent
+from .statistics import HOMEPAGE_EVENT_TYPES, add_homepage_event, add_to_orders_total
+
+
+def update_statistics(event):
+    if event.type in HOMEPAGE_EVENT_TYPES:
+        add_homepage_event(event)
+    if event.type in [OrderEvents.PLACED, OrderEvents.PLACED_FROM_DRAFT]:
+        add_to_orders_total(event.order)
+    elif event.type == OrderEvents.CANCELED:
+        add_to_orders_total(event.order, sign=-1)
+
+
+def handle_order_event_created(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: update_statistics(instance))
+
+
+def connect_signals():
+    post_save.connect(
+        handle_order_event_created,
+        sender=OrderEvent,
+        dispatch_uid="order_statistics_event_created",
+    )
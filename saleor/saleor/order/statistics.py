@@ -0,0 +1,144 @@
+"""Cached order statistics displayed on the dashboard homepage.
+
+The caches are updated when order events are created, so the homepage does
+not query the order history on every load.
+"""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+from prices import Money, TaxedMoney
+
+from . import OrderEvents, OrderStatus
+from .models import Order, OrderEvent
+
+HOMEPAGE_EVENT_TYPES = [
+    OrderEvents.PLACED,
+    OrderEvents.PLACED_FROM_DRAFT,
+    OrderEvents.ORDER_FULLY_PAID,
+]
+HOMEPAGE_EVENTS_KEY = "homepage-event-ids"
+# Number of the most recent events displayed on the homepage
+HOMEPAGE_EVENTS_LIMIT = 100
+HOMEPAGE_EVENTS_CACHE_TIMEOUT = 60 * 5
+
+# Totals of the current day are recalculated often to bound the drift of the
+# running sums; past days change only when their orders are canceled
+ORDERS_TOTAL_TODAY_CACHE_TIMEOUT = 60 * 5
+ORDERS_TOTAL_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Running sums are kept in the smallest currency unit, so they can be
+# updated atomically with `cache.incr`
+AMOUNT_UNIT = Decimal(10) ** -settings.DEFAULT_DECIMAL_PLACES
+
+
+def get_homepage_event_ids():
+    """Return ids of the most recent homepage events, the oldest first."""
+    event_ids = cache.get(HOMEPAGE_EVENTS_KEY)
+    if event_ids is None:
+        event_ids = OrderEvent.objects.filter(type__in=HOMEPAGE_EVENT_TYPES).order_by(
+            "-date", "-pk"
+        )
+        event_ids = list(
+            reversed(event_ids.values_list("pk", flat=True)[:HOMEPAGE_EVENTS_LIMIT])
+        )
+        cache.set(HOMEPAGE_EVENTS_KEY, event_ids, HOMEPAGE_EVENTS_CACHE_TIMEOUT)
+    return event_ids
+
+
+def get_homepage_events():
+    """Return the most recent homepage events, the oldest first.
+
+    Only the ids of the events are cached, so the API can still paginate and
+    optimize the returned queryset.
+    """
+    return OrderEvent.objects.filter(pk__in=get_homepage_event_ids()).order_by(
+        "date", "pk"
+    )
+
+
+def add_homepage_event(event):
+    event_ids = cache.get(HOMEPAGE_EVENTS_KEY)
+    if event_ids is not None:
+        event_ids = (event_ids + [event.pk])[-HOMEPAGE_EVENTS_LIMIT:]
+        cache.set(HOMEPAGE_EVENTS_KEY, event_ids, HOMEPAGE_EVENTS_CACHE_TIMEOUT)
+
+
+def get_orders_total_keys(day):
+    return "orders-total:%s:net" % day, "orders-total:%s:gross" % day
+
+
+def get_day(date):
+    return date.astimezone(timezone.utc).date()
+
+
+def calculate_orders_totals(days):
+    """Return a dict of net and gross totals of orders created in given days."""
+    start_date = datetime.combine(min(days), time.min, tzinfo=timezone.utc)
+    stop_date = datetime.combine(max(days), time.min, tzinfo=timezone.utc)
+    qs = (
+        Order.objects.confirmed()
+        .exclude(status=OrderStatus.CANCELED)
+        .filter(created__gte=start_date, created__lt=stop_date + timedelta(days=1))
+        .annotate(day=TruncDay("created", tzinfo=timezone.utc))
+        .values("day")
+        .annotate(net=Sum("total_net"), gross=Sum("total_gross"))
+    )
+    totals = {day: (Decimal(0), Decimal(0)) for day in days}
+    for row in qs:
+        day = get_day(row["day"])
+        if day in totals:
+            totals[day] = (row["net"], row["gross"])
+    return totals
+
+
+def get_orders_total(start_date):
+    """Return the total of orders created since the start date.
+
+    Totals are summed from cached daily running sums; only days missing in
+    the cache are calculated from the orders.
+    """
+    today = get_day(timezone.now())
+    days = [
+        today - timedelta(days=days_ago)
+        for days_ago in range((today - get_day(start_date)).days + 1)
+    ]
+    keys = {day: get_orders_total_keys(day) for day in days}
+    cached = cache.get_many([key for day_keys in keys.values() for key in day_keys])
+    missing = [day for day in days if not all(key in cached for key in keys[day])]
+    if missing:
+        for day, (net, gross) in calculate_orders_totals(missing).items():
+            net_key, gross_key = keys[day]
+            timeout = (
+                ORDERS_TOTAL_TODAY_CACHE_TIMEOUT
+                if day == today
+                else ORDERS_TOTAL_CACHE_TIMEOUT
+            )
+            day_totals = {
+                net_key: int(net / AMOUNT_UNIT),
+                gross_key: int(gross / AMOUNT_UNIT),
+            }
+            cache.set_many(day_totals, timeout)
+            cached.update(day_totals)
+
+    net = sum(cached[net_key] for net_key, _ in keys.values())
+    gross = sum(cached[gross_key] for _, gross_key in keys.values())
+    return TaxedMoney(
+        net=Money(net * AMOUNT_UNIT, settings.DEFAULT_CURRENCY),
+        gross=Money(gross * AMOUNT_UNIT, settings.DEFAULT_CURRENCY),
+    )
+
+
+def add_to_orders_total(order, sign=1):
+    """Add the total of an order to the running sums of its creation day."""
+    net_key, gross_key = get_orders_total_keys(get_day(order.created))
+    try:
+        cache.incr(net_key, sign * int(order.total.net.amount / AMOUNT_UNIT))
+        cache.incr(gross_key, sign * int(order.total.gross.amount / AMOUNT_UNIT))
+    except ValueError:
+        # The sums are not cached, they are calculated on the next read
+        cache.delete_many([net_key, gross_key])
@@ -0,0 +1,54 @@
+from django.utils import translation
+
+from ..celeryconf import app
+from .models import Fulfillment, Order
+from .pdf import (
+    create_bulk_invoices_pdf,
+    create_invoice_pdf,
+    create_packing_slip_pdf,
+    get_bulk_invoices_pdf_path,
+    get_invoice_pdf_path,
+    get_packing_slip_pdf_path,
+    store_pdf,
+)
+
+
+def _get_orders_for_pdf():
+    return Order.objects.select_related(
+        "user", "shipping_address", "billing_address", "voucher"
+    ).prefetch_related("lines")
+
+
+@app.task
+def generate_invoice_pdf(order_pk, absolute_url, language):
+    """Render the invoice of an order and store it in the default storage."""
+    order = _get_orders_for_pdf().get(pk=order_pk)
+    with translation.override(language):
+        path = get_invoice_pdf_path(order)
+        pdf_file, order = create_invoice_pdf(order, absolute_url)
+    return store_pdf(path, pdf_file)
+
+
+@app.task
+def generate_packing_slip_pdf(order_pk, fulfillment_pk, absolute_url, language):
+    """Render the packing slip of a fulfillment and store it."""
+    order = _get_orders_for_pdf().get(pk=order_pk)
+    fulfillment = Fulfillment.objects.prefetch_related("lines__order_line").get(
+        pk=fulfillment_pk, order=order
+    )
+    with translation.override(language):
+        path = get_packing_slip_pdf_path(order, fulfillment)
+        pdf_file, order = create_packing_slip_pdf(order, fulfillment, absolute_url)
+    return store_pdf(path, pdf_file)
+
+
+@app.task
+def generate_bulk_invoices_pdf(order_pks, absolute_url, language):
+    """Render invoices of many orders into a single stored document."""
+    orders = list(_get_orders_for_pdf().filter(pk__in=order_pks).order_by("pk"))
+    if not orders:
+        return None
+    with translation.override(language):
+        path = get_bulk_invoices_pdf_path(orders)
+        pdf_file = create_bulk_invoices_pdf(orders, absolute_url)
+    return store_pdf(path, pdf_file)
@@ -2,10 +2,12 @@ from functools import wraps
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, DecimalField, Max, Sum
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
-from prices import Money, TaxedMoney
+from prices import Money
 
+from ..account.models import CustomerStats, User
 from ..account.utils import store_user_address
 from ..checkout import AddressType
 from ..core.taxes import zero_money
@@ -192,6 +194,7 @@ def cancel_order(user, order, restock):
         fulfillment.save(update_fields=["status"])
     order.status = OrderStatus.CANCELED
     order.save(update_fields=["status"])
+    update_customer_stats([order.user_id])
 
     payments = order.payments.filter(is_active=True).exclude(
         charge_status=ChargeStatus.FULLY_REFUNDED
@@ -252,6 +255,7 @@ def attach_order_to_user(order, user):
     if order.shipping_address:
         store_user_address(user, order.shipping_address, AddressType.SHIPPING)
     order.save(update_fields=["user"])
+    update_customer_stats([user.pk])
 
 
 @transaction.atomic
@@ -370,7 +374,74 @@ def restock_fulfillment_lines(fulfillment):
             increase_stock(line.order_line.variant, line.quantity, allocate=True)
 
 
-def sum_order_totals(qs):
-    zero = Money(0, currency=settings.DEFAULT_CURRENCY)
-    taxed_zero = TaxedMoney(zero, zero)
-    return sum([order.total for order in qs], taxed_zero)
+def calculate_customer_stats(user_ids):
+    """Return order statistics of customers as a dict keyed by user id.
+
+    Draft and canceled orders are skipped and successful refunds are
+    subtracted from the money spent.
+    """
+    from ..payment import TransactionKind
+    from ..payment.models import Transaction
+
+    orders = Order.objects.confirmed().exclude(status=OrderStatus.CANCELED)
+    orders = orders.filter(user_id__in=user_ids)
+    stats = {
+        row["user_id"]: row
+        for row in orders.values("user_id").annotate(
+            number_of_orders=Count("pk"),
+            money_spent=Sum(
+                "total_gross",
+                output_field=DecimalField(
+                    max_digits=settings.DEFAULT_MAX_DIGITS,
+                    decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+                ),
+            ),
+            last_order_date=Max("created"),
+        )
+    }
+    refunds = (
+        Transaction.objects.filter(
+            payment__order__in=orders, kind=TransactionKind.REFUND, is_success=True
+        )
+        .values("payment__order__user_id")
+        .annotate(refunded=Sum("amount"))
+    )
+    for row in refunds:
+        stats[row["payment__order__user_id"]]["money_spent"] -= row["refunded"]
+    return {
+        user_id: CustomerStats(
+            user_id=user_id,
+            number_of_orders=row["number_of_orders"],
+            money_spent=Money(row["money_spent"], settings.DEFAULT_CURRENCY),
+            last_order_date=row["last_order_date"],
+        )
+        for user_id, row in stats.items()
+    }
+
+
+@transaction.atomic
+def update_customer_stats(user_ids):
+    """Recalculate the stored order statistics of customers.
+
+    The customers' rows are locked first, so concurrent updates of the same
+    customer run one after another and each sees the orders committed by the
+    previous one.
+    """
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    list(
+        User.objects.select_for_update()
+        .filter(pk__in=user_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    stats = calculate_customer_stats(user_ids)
+    for user_id in user_ids:
+        user_stats = stats.get(user_id) or CustomerStats(user_id=user_id)
+        CustomerStats.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                "number_of_orders": user_stats.number_of_orders,
+                "money_spent": user_stats.money_spent,
+                "last_order_date": user_stats.last_order_date,
+            },
+        )
@@ -104,9 +104,6 @@ def handle_fully_paid_order(order):
     events.order_fully_paid_event(order=order)
 
     if order.get_user_current_email():
-        events.email_sent_event(
-            order=order, user=None, email_type=events.OrderEventsEmails.PAYMENT
-        )
         send_payment_confirmation.delay(order.pk)
 
         if order_utils.order_needs_automatic_fullfilment(order):
@@ -510,6 +507,8 @@ def gateway_refund(payment, amount: Decimal = None) -> Transaction:
     )
 
     _gateway_postprocess(transaction, payment)
+    if transaction.is_success and payment.order_id:
+        order_utils.update_customer_stats([payment.order.user_id])
     return transaction
 
 
@@ -1,8 +1,10 @@
 from collections import OrderedDict
+from uuid import uuid4
 
+from django.core.cache import cache
 from django.db.models import Q
 from django.forms import CheckboxSelectMultiple
-from django.utils.translation import pgettext_lazy
+from django.utils.translation import get_language, pgettext_lazy
 from django_filters import MultipleChoiceFilter, OrderingFilter, RangeFilter
 
 from ..core.filters import SortedFilterSet
@@ -16,6 +18,23 @@ SORT_BY_FIELDS = OrderedDict(
     ]
 )
 
+ATTRIBUTE_FILTERS_VERSION_KEY = "product-attribute-filters-version"
+ATTRIBUTE_FILTERS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_attribute_filters_version():
+    version = cache.get(ATTRIBUTE_FILTERS_VERSION_KEY)
+    if version is None:
+        version = invalidate_attribute_filters()
+    return version
+
+
+def invalidate_attribute_filters():
+    """Make all cached attribute filters stale."""
+    version = uuid4().hex
+    cache.set(ATTRIBUTE_FILTERS_VERSION_KEY, version, None)
+    return version
+
 
 class ProductFilter(SortedFilterSet):
     sort_by = OrderingFilter(
@@ -31,11 +50,55 @@ class ProductFilter(SortedFilterSet):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.product_attributes, self.variant_attributes = self._get_attributes()
-        self.filters.update(self._get_product_attributes_filters())
-        self.filters.update(self._get_product_variants_attributes_filters())
+        self.filters.update(self._get_attributes_filters())
         self.filters = OrderedDict(sorted(self.filters.items()))
 
+    def _get_attributes_filters(self):
+        filters = {}
+        for slug, field_name, label, choices in self._get_attribute_filters_data():
+            filters[slug] = MultipleChoiceFilter(
+                field_name=field_name,
+                label=label,
+                widget=CheckboxSelectMultiple,
+                choices=choices,
+            )
+        return filters
+
+    def _get_attribute_filters_data(self):
+        """Return definitions of the attribute filters of the listed products.
+
+        They are the same for every visitor so they are cached per filtered
+        object and language until attributes, product types or categories
+        change.
+        """
+        cache_key = "product-attribute-filters:%s:%s:%s" % (
+            get_attribute_filters_version(),
+            self._get_cache_key(),
+            get_language(),
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            product_attributes, variant_attributes = self._get_attributes()
+            data = [
+                (
+                    attribute.slug,
+                    "attributes__%s" % attribute.pk,
+                    attribute.translated.name,
+                    self._get_attribute_choices(attribute),
+                )
+                for attribute in product_attributes
+            ] + [
+                (
+                    attribute.slug,
+                    "variants__attributes__%s" % attribute.pk,
+                    attribute.translated.name,
+                    self._get_attribute_choices(attribute),
+                )
+                for attribute in variant_attributes
+            ]
+            cache.set(cache_key, data, ATTRIBUTE_FILTERS_CACHE_TIMEOUT)
+        return data
+
     def _get_attributes(self):
         q_product_attributes = self._get_product_attributes_lookup()
         q_variant_attributes = self._get_variant_attributes_lookup()
@@ -53,34 +116,15 @@ class ProductFilter(SortedFilterSet):
         )
         return product_attributes, variant_attributes
 
+    def _get_cache_key(self):
+        raise NotImplementedError()
+
     def _get_product_attributes_lookup(self):
         raise NotImplementedError()
 
     def _get_variant_attributes_lookup(self):
         raise NotImplementedError()
 
-    def _get_product_attributes_filters(self):
-        filters = {}
-        for attribute in self.product_attributes:
-            filters[attribute.slug] = MultipleChoiceFilter(
-                field_name="attributes__%s" % attribute.pk,
-                label=attribute.translated.name,
-                widget=CheckboxSelectMultiple,
-                choices=self._get_attribute_choices(attribute),
-            )
-        return filters
-
-    def _get_product_variants_attributes_filters(self):
-        filters = {}
-        for attribute in self.variant_attributes:
-            filters[attribute.slug] = MultipleChoiceFilter(
-                field_name="variants__attributes__%s" % attribute.pk,
-                label=attribute.translated.name,
-                widget=CheckboxSelectMultiple,
-                choices=self._get_attribute_choices(attribute),
-            )
-        return filters
-
     def _get_attribute_choices(self, attribute):
         return [
             (choice.pk, choice.translated.name) for choice in attribute.values.all()
@@ -90,15 +134,22 @@ class ProductFilter(SortedFilterSet):
 class ProductCategoryFilter(ProductFilter):
     def __init__(self, *args, **kwargs):
         self.category = kwargs.pop("category")
+        self._categories = None
         super().__init__(*args, **kwargs)
 
+    def _get_cache_key(self):
+        return "category:%s" % self.category.pk
+
+    def _get_categories(self):
+        if self._categories is None:
+            self._categories = self.category.get_descendants(include_self=True)
+        return self._categories
+
     def _get_product_attributes_lookup(self):
-        categories = self.category.get_descendants(include_self=True)
-        return Q(product_type__products__category__in=categories)
+        return Q(product_type__products__category__in=self._get_categories())
 
     def _get_variant_attributes_lookup(self):
-        categories = self.category.get_descendants(include_self=True)
-        return Q(product_variant_type__products__category__in=categories)
+        return Q(product_variant_type__products__category__in=self._get_categories())
 
 
 class ProductCollectionFilter(ProductFilter):
@@ -106,6 +157,9 @@ class ProductCollectionFilter(ProductFilter):
         self.collection = kwargs.pop("collection")
         super().__init__(*args, **kwargs)
 
+    def _get_cache_key(self):
+        return "collection:%s" % self.collection.pk
+
     def _get_product_attributes_lookup(self):
         return Q(product_type__products__collections=self.collection)
 
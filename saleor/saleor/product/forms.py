@@ -3,9 +3,9 @@ import json
 from django import forms
 from django.utils.encoding import smart_text
 from django.utils.translation import pgettext_lazy
-from django_prices.templatetags.prices_i18n import amount
 
 from ..checkout.forms import AddToCheckoutForm
+from ..core.money_format import amount
 from ..core.taxes import display_gross_prices
 from ..core.taxes.interface import apply_taxes_to_product
 
@@ -13,7 +13,6 @@ from django.utils.text import slugify
 from django.utils.translation import pgettext_lazy
 from django_measurement.models import MeasurementField
 from django_prices.models import MoneyField
-from django_prices.templatetags import prices_i18n
 from measurement.measures import Weight
 from mptt.managers import TreeManager
 from mptt.models import MPTTModel
@@ -21,6 +20,7 @@ from prices import MoneyRange
 from text_unidecode import unidecode
 from versatileimagefield.fields import PPOIField, VersatileImageField
 
+from ..core import money_format
 from ..core.exceptions import InsufficientStock
 from ..core.models import PublishableModel, PublishedQuerySet, SortableModel
 from ..core.utils import build_absolute_uri
@@ -335,7 +335,7 @@ class ProductVariant(models.Model):
         return "%s, %s, %s" % (
             self.sku,
             self.display_product(),
-            prices_i18n.amount(price),
+            money_format.amount(price),
         )
 
 
@@ -0,0 +1,92 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .filters import invalidate_attribute_filters
+from .models import (
+    Attribute,
+    AttributeTranslation,
+    AttributeValue,
+    AttributeValueTranslation,
+    Category,
+    Collection,
+    CollectionProduct,
+    Product,
+    ProductImage,
+    ProductTranslation,
+    ProductType,
+    ProductVariant,
+    VariantImage,
+)
+from .utils.product_cards import invalidate_product_card
+
+# Models whose changes affect the attribute filters of category and
+# collection pages; products are left out as they are saved far more often,
+# so filters of a product moved to another category or product type are
+# refreshed when the cache expires
+ATTRIBUTE_FILTERS_MODELS = [
+    Attribute,
+    AttributeTranslation,
+    AttributeValue,
+    AttributeValueTranslation,
+    Category,
+    CollectionProduct,
+    ProductType,
+]
+
+# Models shown on product list cards, with the lookup of the product id
+PRODUCT_CARD_MODELS = [
+    (Product, "pk"),
+    (ProductImage, "product_id"),
+    (ProductTranslation, "product_id"),
+    (ProductVariant, "product_id"),
+    (VariantImage, "variant.product_id"),
+]
+
+
+def handle_attribute_filters_change(sender, **kwargs):
+    invalidate_attribute_filters()
+
+
+def get_product_id(instance, lookup):
+    value = instance
+    for attr in lookup.split("."):
+        value = getattr(value, attr)
+    return value
+
+
+def connect_product_card_signals(model, lookup):
+    def handle_product_card_change(sender, instance, **kwargs):
+        invalidate_product_card(get_product_id(instance, lookup))
+
+    post_save.connect(
+        handle_product_card_change,
+        sender=model,
+        weak=False,
+        dispatch_uid="product_card_save_%s" % model._meta.model_name,
+    )
+    post_delete.connect(
+        handle_product_card_change,
+        sender=model,
+        weak=False,
+        dispatch_uid="product_card_delete_%s" % model._meta.model_name,
+    )
+
+
+def connect_signals():
+    for model in ATTRIBUTE_FILTERS_MODELS:
+        post_save.connect(
+            handle_attribute_filters_change,
+            sender=model,
+            dispatch_uid="attribute_filters_save_%s" % model._meta.model_name,
+        )
+        post_delete.connect(
+            handle_attribute_filters_change,
+            sender=model,
+            dispatch_uid="attribute_filters_delete_%s" % model._meta.model_name,
+        )
+    m2m_changed.connect(
+        handle_attribute_filters_change,
+        sender=Collection.products.through,
+        dispatch_uid="attribute_filters_collection_products",
+    )
+    for model, lookup in PRODUCT_CARD_MODELS:
+        connect_product_card_signals(model, lookup)
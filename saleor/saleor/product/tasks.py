@@ -1,27 +1,56 @@
 from ..celeryconf import app
 from .models import Attribute, ProductType, ProductVariant
 from .utils.attributes import get_name_from_attributes
+from .utils.product_cards import invalidate_product_card
+
+# Number of variants renamed by a single subtask
+VARIANTS_NAMES_CHUNK_SIZE = 1000
 
 
 def _update_variants_names(instance, saved_attributes):
     """Product variant names are created from names of assigned attributes.
     After change in attribute value name, for all product variants using this
-    attributes we need to update the names."""
+    attributes we need to update the names.
+
+    Variants are renamed in chunks by subtasks, so renaming many variants is
+    spread over the workers."""
     initial_attributes = set(instance.variant_attributes.all())
     attributes_changed = initial_attributes.intersection(saved_attributes)
     if not attributes_changed:
         return
-    variants_to_be_updated = ProductVariant.objects.filter(
-        product__in=instance.products.all(),
-        product__product_type__variant_attributes__in=attributes_changed,
+    variants_to_be_updated = (
+        ProductVariant.objects.filter(product__product_type=instance)
+        .filter(attributes__has_any_keys=[str(attr.pk) for attr in attributes_changed])
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    chunk = []
+    for variant_pk in variants_to_be_updated.iterator():
+        chunk.append(variant_pk)
+        if len(chunk) == VARIANTS_NAMES_CHUNK_SIZE:
+            update_variants_names_chunk.delay(instance.pk, chunk)
+            chunk = []
+    if chunk:
+        update_variants_names_chunk.delay(instance.pk, chunk)
+
+
+def _update_variants_names_chunk(instance, variant_pks):
+    attributes = list(
+        instance.variant_attributes.prefetch_related("values__translations")
     )
-    variants_to_be_updated = variants_to_be_updated.prefetch_related(
-        "product__product_type__variant_attributes__values"
-    ).all()
-    attributes = instance.variant_attributes.prefetch_related("values__translations")
-    for variant in variants_to_be_updated:
-        variant.name = get_name_from_attributes(variant, attributes)
-        variant.save(update_fields=["name"])
+    variants = ProductVariant.objects.filter(pk__in=variant_pks).only(
+        "pk", "product_id", "name", "attributes"
+    )
+    variants_to_save = []
+    for variant in variants.iterator():
+        name = get_name_from_attributes(variant, attributes)
+        if name != variant.name:
+            variant.name = name
+            variants_to_save.append(variant)
+    ProductVariant.objects.bulk_update(variants_to_save, ["name"])
+    # Bulk updates do not send the signals invalidating the product cards
+    for product_pk in {variant.product_id for variant in variants_to_save}:
+        invalidate_product_card(product_pk)
 
 
 @app.task
@@ -29,3 +58,9 @@ def update_variants_names(product_type_pk, saved_attributes_ids):
     instance = ProductType.objects.get(pk=product_type_pk)
     saved_attributes = Attribute.objects.filter(pk__in=saved_attributes_ids)
     return _update_variants_names(instance, saved_attributes)
+
+
+@app.task
+def update_variants_names_chunk(product_type_pk, variant_pks):
+    instance = ProductType.objects.get(pk=product_type_pk)
+    return _update_variants_names_chunk(instance, variant_pks)
@@ -6,6 +6,12 @@ from django import template
 from django.conf import settings
 from django.templatetags.static import static
 
+from ...core.thumbnails import (
+    get_on_demand_thumbnail_url,
+    is_size_allowed,
+    is_thumbnail_stored,
+)
+
 logger = logging.getLogger(__name__)
 register = template.Library()
 
@@ -54,7 +60,7 @@ def get_available_sizes_by_method(method, rendition_key_set):
 
 
 def get_thumbnail_size(size, method, rendition_key_set):
-    """ Return closest larger size if not more than 2 times larger, otherwise
+    """Return closest larger size if not more than 2 times larger, otherwise
     return closest smaller size
     """
     on_demand = settings.VERSATILEIMAGEFIELD_SETTINGS["create_images_on_demand"]
@@ -63,7 +69,11 @@ def get_thumbnail_size(size, method, rendition_key_set):
     else:
         size_str = size
     size_name = "%s__%s" % (method, size_str)
-    if size_name in AVAILABLE_SIZES[rendition_key_set] or on_demand:
+    if (
+        size_name in AVAILABLE_SIZES[rendition_key_set]
+        or is_size_allowed(method, size_str)
+        or on_demand
+    ):
         return size_str
     avail_sizes = sorted(get_available_sizes_by_method(method, rendition_key_set))
     larger = [x for x in avail_sizes if size < x <= size * 2]
@@ -85,6 +95,14 @@ def get_thumbnail_size(size, method, rendition_key_set):
 def get_thumbnail(image_file, size, method, rendition_key_set="products"):
     if image_file:
         used_size = get_thumbnail_size(size, method, rendition_key_set)
+        on_demand = settings.VERSATILEIMAGEFIELD_SETTINGS["create_images_on_demand"]
+        if not on_demand:
+            # Renditions that were not pre-generated, either because their
+            # size is not in a key set or because the images were not warmed
+            # yet, are rendered by the thumbnail view
+            url = get_on_demand_thumbnail_url(image_file, method, used_size)
+            if url and not is_thumbnail_stored(image_file, method, used_size):
+                return url
         try:
             thumbnail = getattr(image_file, method)[used_size]
         except Exception:
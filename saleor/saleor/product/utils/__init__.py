@@ -11,7 +11,7 @@ from ...core.taxes import TaxedMoney, zero_taxed_money
 from ...core.utils import get_paginator_items
 from ...core.utils.filters import get_now_sorted_by
 from ..forms import ProductForm
-from .availability import products_with_availability
+from .product_cards import render_product_cards
 
 
 def products_visible_to_user(user):
@@ -142,21 +142,14 @@ def get_product_list_context(request, filter_set):
     products_paginated = get_paginator_items(
         qs, settings.PAGINATE_BY, request.GET.get("page")
     )
-    products_and_availability = list(
-        products_with_availability(
-            products_paginated,
-            request.discounts,
-            request.country,
-            request.currency,
-            request.taxes,
-        )
-    )
+    products = list(products_paginated)
     now_sorted_by = get_now_sorted_by(filter_set)
     arg_sort_by = request.GET.get("sort_by")
     is_descending = arg_sort_by.startswith("-") if arg_sort_by else False
     return {
         "filter_set": filter_set,
-        "products": products_and_availability,
+        "products": products,
+        "product_cards": render_product_cards(request, products),
         "products_paginated": products_paginated,
         "sort_by_choices": SORT_BY_FIELDS,
         "now_sorted_by": now_sorted_by,
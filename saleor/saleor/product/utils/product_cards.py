@@ -0,0 +1,69 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from ...core.taxes import get_taxes_version
+from ...discount.utils import get_discounts_version
+from .availability import products_with_availability
+
+# Bounds the staleness of cards depending on time, e.g. the publication date
+PRODUCT_CARD_CACHE_TIMEOUT = 60 * 5
+
+
+def get_product_card_version_key(product_id):
+    return "product-card-version:%s" % product_id
+
+
+def invalidate_product_card(product_id):
+    """Make cached cards of the product stale."""
+    cache.set(get_product_card_version_key(product_id), uuid4().hex, None)
+
+
+def get_product_cards_versions(product_ids):
+    keys = {get_product_card_version_key(pk): pk for pk in product_ids}
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def render_product_cards(request, products):
+    """Return HTML of the product list cards of products.
+
+    Cards are cached per product, discounts, taxes, country, currency and
+    language; availability is computed only for products missing in the cache.
+    """
+    products = list(products)
+    versions = get_product_cards_versions([product.pk for product in products])
+    context_key = "%s:%s:%s:%s:%s" % (
+        get_discounts_version(request.discounts),
+        get_taxes_version(request.taxes),
+        request.country,
+        request.currency,
+        get_language(),
+    )
+    keys = {
+        product.pk: "product-card:%s:%s:%s"
+        % (product.pk, versions[product.pk], context_key)
+        for product in products
+    }
+    cards = cache.get_many(keys.values())
+
+    missing = [product for product in products if keys[product.pk] not in cards]
+    rendered = {}
+    for product, availability in products_with_availability(
+        missing, request.discounts, request.country, request.currency, request.taxes
+    ):
+        rendered[keys[product.pk]] = render_to_string(
+            "product/_item.html",
+            {"product": product, "availability": availability, "site": request.site},
+        )
+    if rendered:
+        cache.set_many(rendered, PRODUCT_CARD_CACHE_TIMEOUT)
+        cards.update(rendered)
+    return [mark_safe(cards[keys[product.pk]]) for product in products]
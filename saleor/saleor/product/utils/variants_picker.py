@@ -1,14 +1,58 @@
+import hashlib
 from collections import defaultdict
 from typing import Iterable
 
-from django_prices.templatetags import prices_i18n
+from django.core.cache import cache
+from django.utils.translation import get_language
+from prices import TaxedMoneyRange
 
-from ...core.taxes import display_gross_prices
+from ...core import money_format
+from ...core.taxes import display_gross_prices, get_taxes_version
 from ...core.taxes.interface import apply_taxes_to_product, show_taxes_on_storefront
 from ...core.utils import to_local_currency
+from ...core.utils.translations import prefetch_translations
 from ...discount import DiscountInfo
+from ...discount.utils import calculate_discounted_price, get_discounts_version
 from ...seo.schema.product import variant_json_ld
-from .availability import get_product_availability
+from ..models import AttributeValue
+from .availability import _get_product_price_range, _get_total_discount
+
+VARIANT_PICKER_CACHE_TIMEOUT = 60 * 15
+
+
+def get_variant_picker_cache_key(product, discounts, taxes, country, local_currency):
+    """Return a cache key of the variant picker data of a product.
+
+    The key changes whenever the product, its variants or stock, the active
+    discounts, the tax rates or the tax display settings, the country, the
+    currency or the language changes.
+    """
+    variants_state = [
+        (
+            variant.pk,
+            variant.name,
+            variant.sku,
+            variant.quantity,
+            variant.quantity_allocated,
+            variant.track_inventory,
+            str(variant.price_override),
+            sorted(variant.attributes.items()),
+            variant.dkftest,
+        )
+        for variant in product.variants.all()
+    ]
+    product_state = repr(
+        (product.updated_at, str(product.price), variants_state)
+    ).encode("utf-8")
+    return "variant-picker:%s:%s:%s:%s:%s:%s:%s" % (
+        product.pk,
+        hashlib.md5(product_state).hexdigest(),
+        get_discounts_version(discounts),
+        get_taxes_version(taxes),
+        country or "",
+        local_currency or "",
+        get_language(),
+    )
 
 
 def get_variant_picker_data(
@@ -18,32 +62,60 @@ def get_variant_picker_data(
     local_currency=None,
     country=None,
 ):
-    availability = get_product_availability(
-        product, discounts, country, local_currency, taxes
+    cache_key = get_variant_picker_cache_key(
+        product, discounts, taxes, country, local_currency
     )
+    data = cache.get(cache_key)
+    if data is None:
+        data = build_variant_picker_data(
+            product, discounts, taxes, local_currency, country
+        )
+        cache.set(cache_key, data, VARIANT_PICKER_CACHE_TIMEOUT)
+    return data
+
+
+def build_variant_picker_data(
+    product,
+    discounts: Iterable[DiscountInfo] = None,
+    taxes=None,
+    local_currency=None,
+    country=None,
+):
+    """Compute the variant picker data in a single pass over the variants.
+
+    Taxes are applied once per distinct price and the product price range is
+    derived from the variant prices instead of being computed again.
+    """
+    taxed_prices = {}
+
+    def apply_taxes(price):
+        if price not in taxed_prices:
+            taxed_prices[price] = apply_taxes_to_product(
+                product, price, country, taxes=taxes
+            )
+        return taxed_prices[price]
+
     variants = product.variants.all()
     data = {"variantAttributes": [], "variants": []}
 
     variant_attributes = product.product_type.variant_attributes.all()
-    print("这是product--------------------")
-    print(product)
-    print(variant_attributes)
     # Collect only available variants
     filter_available_variants = defaultdict(list)
+    prices, prices_undiscounted = [], []
 
     for variant in variants:
-        data['testtest'] = 'ddddddddddddcdd' 
-        price = apply_taxes_to_product(
-            variant.product, variant.get_price(discounts), country, taxes=taxes
-        )
-        price_undiscounted = apply_taxes_to_product(
-            variant.product, variant.get_price(), country, taxes=taxes
-        )
+        price = apply_taxes(variant.get_price(discounts))
+        price_undiscounted = apply_taxes(variant.get_price())
+        prices.append(price)
+        prices_undiscounted.append(price_undiscounted)
         if local_currency:
             price_local_currency = to_local_currency(price, local_currency)
         else:
             price_local_currency = None
         in_stock = variant.is_in_stock()
+        # Not taken from the cached product JSON-LD, whose offers have
+        # untaxed prices and hide variants of invisible products; the picker
+        # data is cached as a whole instead
         schema_data = variant_json_ld(price.net, variant, in_stock)
         variant_data = {
             "id": variant.id,
@@ -53,13 +125,24 @@ def get_variant_picker_data(
             "attributes": variant.attributes,
             "priceLocalCurrency": price_as_dict(price_local_currency),
             "schemaData": schema_data,
-            'dkftest':variant.dkftest,
+            "dkftest": variant.dkftest,
         }
         data["variants"].append(variant_data)
 
         for variant_key, variant_value in variant.attributes.items():
             filter_available_variants[int(variant_key)].append(int(variant_value))
 
+    available_values = list(
+        AttributeValue.objects.filter(
+            attribute__in=variant_attributes,
+            pk__in=[pk for pks in filter_available_variants.values() for pk in pks],
+        )
+    )
+    attribute_values = defaultdict(list)
+    for value in available_values:
+        attribute_values[value.attribute_id].append(value)
+    prefetch_translations(list(variant_attributes) + available_values)
+
     for attribute in variant_attributes:
         available_variants = filter_available_variants.get(attribute.pk, None)
 
@@ -74,30 +157,38 @@ def get_variant_picker_data(
                             "pk": value.pk,
                             "name": value.translated.name,
                             "slug": value.translated.slug,
-                            "type_ini":value.translated.type_ini,
+                            "type_ini": value.translated.type_ini,
                         }
-                        for value in attribute.values.filter(
-                            pk__in=available_variants
-                        ).prefetch_related("translations")
+                        for value in attribute_values[attribute.pk]
                     ],
                 }
             )
 
-    product_price = apply_taxes_to_product(product, product.price, country, taxes=taxes)
+    if not prices:
+        price = calculate_discounted_price(product, product.price, discounts)
+        prices = [apply_taxes(price)]
+        prices_undiscounted = [apply_taxes(product.price)]
+    price_range = TaxedMoneyRange(start=min(prices), stop=max(prices))
+    price_range_undiscounted = TaxedMoneyRange(
+        start=min(prices_undiscounted), stop=max(prices_undiscounted)
+    )
+    price_range_local, _ = _get_product_price_range(
+        price_range, price_range_undiscounted, local_currency
+    )
+
+    product_price = apply_taxes(product.price)
     tax_rates = 0
     if product_price.tax and product_price.net:
         tax_rates = int((product_price.tax / product_price.net) * 100)
 
     data["availability"] = {
-        "discount": price_as_dict(availability.discount),
-        "taxRate": tax_rates,
-        "priceRange": price_range_as_dict(availability.price_range),
-        "priceRangeUndiscounted": price_range_as_dict(
-            availability.price_range_undiscounted
-        ),
-        "priceRangeLocalCurrency": price_range_as_dict(
-            availability.price_range_local_currency
+        "discount": price_as_dict(
+            _get_total_discount(price_range_undiscounted, price_range)
         ),
+        "taxRate": tax_rates,
+        "priceRange": price_range_as_dict(price_range),
+        "priceRangeUndiscounted": price_range_as_dict(price_range_undiscounted),
+        "priceRangeLocalCurrency": price_range_as_dict(price_range_local),
     }
     data["priceDisplay"] = {
         "displayGross": display_gross_prices(),
@@ -112,9 +203,9 @@ def price_as_dict(price):
     return {
         "currency": price.currency,
         "gross": price.gross.amount,
-        "grossLocalized": prices_i18n.amount(price.gross),
+        "grossLocalized": money_format.amount(price.gross),
         "net": price.net.amount,
-        "netLocalized": prices_i18n.amount(price.net),
+        "netLocalized": money_format.amount(price.net),
     }
 
 
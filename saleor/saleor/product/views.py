@@ -16,7 +16,7 @@ from django.urls import reverse
 
 from ..checkout.utils import set_checkout_cookie
 from ..core.utils import serialize_decimal
-from ..seo.schema.product import product_json_ld
+from ..seo.schema.product import get_product_json_ld
 from .filters import ProductCategoryFilter, ProductCollectionFilter
 from .models import Category, DigitalContentUrl
 from .utils import (
@@ -88,7 +88,7 @@ def product_details(request, slug, product_id, form=None):
     product_attributes = get_product_attributes_data(product)
     # show_variant_picker determines if variant picker is used or select input
     show_variant_picker = all([v.attributes for v in product.variants.all()])
-    json_ld_data = product_json_ld(product, product_attributes)
+    json_ld_data = get_product_json_ld(product, request.discounts)
     ctx = {
         "is_visible": is_visible,
         "form": form,
@@ -1,9 +1,14 @@
 import json
 
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.serializers.json import DjangoJSONEncoder
 
 from ...core.utils import build_absolute_uri
+from ...product.utils.product_cards import get_product_cards_versions
+
+# Bounds the staleness of data depending on the site, e.g. its domain
+PRODUCT_ITEM_CACHE_TIMEOUT = 60 * 60
 
 
 def get_organization():
@@ -11,7 +16,35 @@ def get_organization():
     return {"@type": "Organization", "name": site.name}
 
 
-def get_product_data(line, organization):
+def get_products_items_data(products):
+    """Return the URLs and images of products offered in emails.
+
+    The data is cached per product version, so it is computed once for all
+    orders of a product.
+    """
+    versions = get_product_cards_versions([product.pk for product in products])
+    keys = {
+        product.pk: "product-schema-item:%s:%s" % (product.pk, versions[product.pk])
+        for product in products
+    }
+    items = cache.get_many(keys.values())
+    missing = {}
+    for product in products:
+        key = keys[product.pk]
+        if key in items or key in missing:
+            continue
+        item = {"url": build_absolute_uri(product.get_absolute_url())}
+        product_image = product.get_first_image()
+        if product_image:
+            item["image"] = build_absolute_uri(location=product_image.image.url)
+        missing[key] = item
+    if missing:
+        cache.set_many(missing, PRODUCT_ITEM_CACHE_TIMEOUT)
+        items.update(missing)
+    return {pk: items[key] for pk, key in keys.items()}
+
+
+def get_product_data(line, organization, item_data=None):
     gross_product_price = line.get_total().gross
     product_data = {
         "@type": "Offer",
@@ -26,14 +59,10 @@ def get_product_data(line, organization):
         "seller": organization,
     }
 
-    product = line.variant.product
-    product_url = build_absolute_uri(product.get_absolute_url())
-    product_data["itemOffered"]["url"] = product_url
-
-    product_image = product.get_first_image()
-    if product_image:
-        image = product_image.image
-        product_data["itemOffered"]["image"] = build_absolute_uri(location=image.url)
+    if item_data is None:
+        product = line.variant.product
+        item_data = get_products_items_data([product])[product.pk]
+    product_data["itemOffered"].update(item_data)
     return product_data
 
 
@@ -55,8 +84,13 @@ def get_order_confirmation_markup(order):
         "orderDate": order.created,
     }
 
-    lines = order.lines.prefetch_related("variant")
+    lines = list(order.lines.select_related("variant__product"))
+    items_data = get_products_items_data([line.variant.product for line in lines])
     for line in lines:
-        product_data = get_product_data(line=line, organization=organization)
+        product_data = get_product_data(
+            line=line,
+            organization=organization,
+            item_data=items_data[line.variant.product_id],
+        )
         data["acceptedOffer"].append(product_data)
     return json.dumps(data, cls=DjangoJSONEncoder)
@@ -1,8 +1,17 @@
+from django.core.cache import cache
 from django.utils.encoding import smart_text
+from django.utils.translation import get_language
+
+from ...discount.utils import get_discounts_version
+from ...product.utils.attributes import get_product_attributes_data
+from ...product.utils.product_cards import get_product_cards_versions
 
 IN_STOCK = "http://schema.org/InStock"
 OUT_OF_STOCK = "http://schema.org/OutOfStock"
 
+# Bounds the staleness of data depending on time, e.g. the publication date
+PRODUCT_JSON_LD_CACHE_TIMEOUT = 60 * 5
+
 
 def get_brand_from_attributes(attributes):
     if attributes is None:
@@ -17,8 +26,29 @@ def get_brand_from_attributes(attributes):
     return brand
 
 
-def product_json_ld(product, attributes=None):
-    # type: (saleor.product.models.Product, saleor.product.utils.ProductAvailability, dict) -> dict  # noqa
+def get_product_json_ld(product, discounts=None):
+    """Return JSON-LD data of the product.
+
+    The data is cached per product version, discounts and language; the
+    version changes along with the product, its variants and images.
+    """
+    version = get_product_cards_versions([product.pk])[product.pk]
+    key = "product-json-ld:%s:%s:%s:%s" % (
+        product.pk,
+        version,
+        get_discounts_version(discounts),
+        get_language(),
+    )
+    data = cache.get(key)
+    if data is None:
+        attributes = get_product_attributes_data(product)
+        data = product_json_ld(product, attributes, discounts)
+        cache.set(key, data, PRODUCT_JSON_LD_CACHE_TIMEOUT)
+    return data
+
+
+def product_json_ld(product, attributes=None, discounts=None):
+    # type: (saleor.product.models.Product, dict, Iterable[DiscountInfo]) -> dict  # noqa
     """Generate JSON-LD data for product."""
     data = {
         "@context": "http://schema.org/",
@@ -30,7 +60,7 @@ def product_json_ld(product, attributes=None):
     }
 
     for variant in product.variants.all():
-        price = variant.get_price()
+        price = variant.get_price(discounts)
         in_stock = True
         if not product.is_visible or not variant.is_in_stock():
             in_stock = False
@@ -7,6 +7,7 @@ import django_cache_url
 from django.contrib.messages import constants as messages
 from django.utils.translation import gettext_lazy as _, pgettext_lazy
 from django_prices.templatetags.prices_i18n import get_currency_fraction
+from kombu import Queue
 
 from . import __version__
 
@@ -127,6 +128,11 @@ EMAIL_BACKEND = email_config["EMAIL_BACKEND"]
 EMAIL_USE_TLS = email_config["EMAIL_USE_TLS"]
 EMAIL_USE_SSL = email_config["EMAIL_USE_SSL"]
 
+# Number of messages sent over a single connection by the bulk email tasks
+EMAIL_BATCH_SIZE = int(os.environ.get("EMAIL_BATCH_SIZE", 100))
+# Celery rate limit of the bulk email tasks, e.g. "10/s"; unlimited if not set
+EMAIL_RATE_LIMIT = os.environ.get("EMAIL_RATE_LIMIT")
+
 ENABLE_SSL = get_bool_from_env("ENABLE_SSL", False)
 
 if ENABLE_SSL:
@@ -214,6 +220,7 @@ MIDDLEWARE = [
     "saleor.core.middleware.currency",
     "saleor.core.middleware.site",
     "saleor.core.middleware.taxes",
+    "saleor.core.middleware.translations",
     "social_django.middleware.SocialAuthExceptionMiddleware",
     "impersonate.middleware.ImpersonateMiddleware",
     "saleor.graphql.middleware.jwt_middleware",
@@ -403,6 +410,9 @@ ALLOWED_HOSTS = get_list(os.environ.get("ALLOWED_HOSTS", "*,localhost,127.0.0.1"
 ALLOWED_GRAPHQL_ORIGINS = os.environ.get("ALLOWED_GRAPHQL_ORIGINS", "*")
 
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+# Number of reverse proxies in front of the application that append the
+# address of their client to the X-Forwarded-For header
+TRUSTED_PROXIES_COUNT = int(os.environ.get("TRUSTED_PROXIES_COUNT", 0))
 
 # Amazon S3 configuration
 AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
@@ -459,6 +469,30 @@ VERSATILEIMAGEFIELD_SETTINGS = {
     "create_images_on_demand": get_bool_from_env("CREATE_IMAGES_ON_DEMAND", DEBUG)
 }
 
+# Renditions that the thumbnail endpoint is allowed to render on request,
+# e.g. "thumbnail__540x540,crop__100x100"; all rendition key set sizes by default
+THUMBNAIL_ON_DEMAND_SIZES = get_list(
+    os.environ.get(
+        "THUMBNAIL_ON_DEMAND_SIZES",
+        ",".join(
+            sorted(
+                {
+                    size
+                    for sizes in VERSATILEIMAGEFIELD_RENDITION_KEY_SETS.values()
+                    for _, size in sizes
+                }
+            )
+        ),
+    )
+)
+THUMBNAIL_CACHE_DIR = os.environ.get(
+    "THUMBNAIL_CACHE_DIR", os.path.join(PROJECT_ROOT, "thumbnail-cache")
+)
+# Maximum size of the thumbnail disk cache in bytes
+THUMBNAIL_CACHE_MAX_SIZE = int(
+    os.environ.get("THUMBNAIL_CACHE_MAX_SIZE", 512 * 1024 * 1024)
+)
+
 PLACEHOLDER_IMAGES = {
     60: "images/placeholder60x60.png",
     120: "images/placeholder120x120.png",
@@ -537,6 +571,87 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", None)
 
+
+def get_task_priority(priority):
+    """Return the broker's value of a task priority from 0 (lowest) to 9.
+
+    Redis sorts priorities in reverse, 0 being the highest priority there.
+    """
+    if CELERY_BROKER_URL.startswith("redis"):
+        return 9 - priority
+    return priority
+
+
+# Tasks are split into queues consumed by separate workers so every kind of
+# task can be scaled on its own; a worker started without the `-Q` option
+# consumes all of them. Tasks not listed in the routes go to the `celery`
+# queue.
+CELERY_TASK_QUEUES = [
+    Queue("celery", routing_key="celery"),
+    Queue("emails", routing_key="emails", queue_arguments={"x-max-priority": 9}),
+    Queue("media", routing_key="media", queue_arguments={"x-max-priority": 9}),
+    Queue("search", routing_key="search"),
+    Queue("maintenance", routing_key="maintenance"),
+]
+CELERY_TASK_ROUTES = {
+    # Bulk emails must not delay the emails customers are waiting for
+    "saleor.order.emails.send_order_confirmations": {
+        "queue": "emails",
+        "priority": get_task_priority(0),
+    },
+    "saleor.*.emails.*": {"queue": "emails", "priority": get_task_priority(9)},
+    "saleor.*.thumbnails.*": {"queue": "media", "priority": get_task_priority(3)},
+    "saleor.order.tasks.*": {"queue": "media", "priority": get_task_priority(6)},
+    "saleor.product.tasks.*": {"queue": "search"},
+    "saleor.discount.tasks.*": {"queue": "maintenance"},
+    "saleor.graphql.tasks.*": {"queue": "maintenance"},
+    "saleor.core.utils.update_conversion_rates_from_openexchangerates": {
+        "queue": "maintenance"
+    },
+}
+# Soft time limit of tasks in seconds; limits of long running tasks and rate
+# limits are set in the annotations below
+CELERY_TASK_SOFT_TIME_LIMIT = int(os.environ.get("CELERY_TASK_SOFT_TIME_LIMIT", 60))
+# Celery rate limit of each worker creating thumbnails, e.g. "10/s"
+THUMBNAIL_RATE_LIMIT = os.environ.get("THUMBNAIL_RATE_LIMIT")
+CELERY_TASK_ANNOTATIONS = {
+    "saleor.order.emails.send_order_confirmations": {"soft_time_limit": 300},
+    "saleor.account.thumbnails.create_user_avatar_thumbnails": {
+        "soft_time_limit": 120,
+        "rate_limit": THUMBNAIL_RATE_LIMIT,
+    },
+    "saleor.product.thumbnails.create_product_thumbnails": {
+        "soft_time_limit": 120,
+        "rate_limit": THUMBNAIL_RATE_LIMIT,
+    },
+    "saleor.product.thumbnails.create_category_background_image_thumbnails": {
+        "soft_time_limit": 120,
+        "rate_limit": THUMBNAIL_RATE_LIMIT,
+    },
+    "saleor.product.thumbnails.create_collection_background_image_thumbnails": {
+        "soft_time_limit": 120,
+        "rate_limit": THUMBNAIL_RATE_LIMIT,
+    },
+    "saleor.order.tasks.generate_invoice_pdf": {"soft_time_limit": 120},
+    "saleor.order.tasks.generate_packing_slip_pdf": {"soft_time_limit": 120},
+    "saleor.order.tasks.generate_bulk_invoices_pdf": {"soft_time_limit": 600},
+    "saleor.product.tasks.update_variants_names": {"soft_time_limit": 600},
+    "saleor.product.tasks.update_variants_names_chunk": {"soft_time_limit": 300},
+    "saleor.discount.tasks.reconcile_voucher_usage_task": {"soft_time_limit": 300},
+    "saleor.graphql.tasks.run_bulk_mutation": {"soft_time_limit": 3600},
+    # Requests to the exchange rates API count against the plan's quota
+    "saleor.core.utils.update_conversion_rates_from_openexchangerates": {
+        "soft_time_limit": 120,
+        "rate_limit": "1/m",
+    },
+}
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-voucher-usage": {
+        "task": "saleor.discount.tasks.reconcile_voucher_usage_task",
+        "schedule": int(os.environ.get("VOUCHER_USAGE_RECONCILE_INTERVAL", 60)),
+    }
+}
+
 # Impersonate module settings
 IMPERSONATE = {
     "URI_EXCLUSIONS": [r"^dashboard/"],
@@ -664,8 +779,84 @@ PAYMENT_GATEWAYS = {
 GRAPHENE = {
     "RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST": True,
     "RELAY_CONNECTION_MAX_LIMIT": 100,
+    "MIDDLEWARE": [
+        "saleor.graphql.tracing.TracingMiddleware",
+        "saleor.graphql.cache_control.SurrogateKeyMiddleware",
+    ],
+}
+
+# Queries are rejected when their estimated cost, the number of objects they
+# may resolve, or their depth exceeds the limits
+GRAPHQL_QUERY_MAX_COST = int(os.environ.get("GRAPHQL_QUERY_MAX_COST", 50000))
+GRAPHQL_QUERY_MAX_DEPTH = int(os.environ.get("GRAPHQL_QUERY_MAX_DEPTH", 20))
+# Estimated size of lists that are not paginated
+GRAPHQL_QUERY_DEFAULT_LIST_SIZE = 10
+# Total cost of queries a client can run per minute; unlimited if not set
+GRAPHQL_QUERY_COST_LIMIT_PER_MINUTE = int(
+    os.environ.get("GRAPHQL_QUERY_COST_LIMIT_PER_MINUTE", 0)
+)
+
+# Fraction of GraphQL requests whose resolvers are traced
+GRAPHQL_TRACING_SAMPLE_RATE = float(os.environ.get("GRAPHQL_TRACING_SAMPLE_RATE", 0))
+# Bearer token granting access to the metrics of traced requests
+GRAPHQL_METRICS_TOKEN = os.environ.get("GRAPHQL_METRICS_TOKEN")
+# JSON library encoding the API responses, "json" or "orjson"; the fastest
+# installed one is used if not set
+GRAPHQL_JSON_BACKEND = os.environ.get("GRAPHQL_JSON_BACKEND")
+
+# Number of seconds the results of GET queries can be cached for by HTTP
+# caches, by "Type" or "Type.field". Types hinted with None and scalar fields
+# inherit the max age of their parent; other types are not cached.
+GRAPHQL_CACHE_DEFAULT_MAX_AGE = 0
+GRAPHQL_CACHE_CONTROL = {
+    "Attribute": 60 * 60,
+    "AttributeValue": 60 * 60,
+    "Category": 60 * 60,
+    "Collection": 60 * 60,
+    "Menu": 60 * 60,
+    "MenuItem": 60 * 60,
+    "Navigation": None,
+    "Page": 60 * 60,
+    "Product": 60 * 5,
+    "ProductImage": 60 * 60,
+    "ProductType": 60 * 60,
+    "ProductVariant": 60 * 5,
+    "SelectedAttribute": None,
+    "Shop": 60 * 5,
+    "CountryDisplay": None,
+    "Domain": None,
+    "Image": None,
+    "LanguageDisplay": None,
+    "Money": None,
+    "PageInfo": None,
+    "Weight": None,
+    "AttributeTranslation": None,
+    "AttributeValueTranslation": None,
+    "CategoryTranslation": None,
+    "CollectionTranslation": None,
+    "MenuItemTranslation": None,
+    "PageTranslation": None,
+    "ProductTranslation": None,
+    "ProductVariantTranslation": None,
+    "ShopTranslation": None,
+    # Prices and stock depend on the country and change often
+    "Product.pricing": 0,
+    "Product.isAvailable": 60,
+    "ProductVariant.pricing": 0,
+    "ProductVariant.stockQuantity": 60,
+    "ProductVariant.isAvailable": 60,
+    "Shop.geolocalization": 0,
 }
 
+# Number of objects a bulk mutation processes in a single transaction
+GRAPHQL_BULK_MUTATION_CHUNK_SIZE = int(
+    os.environ.get("GRAPHQL_BULK_MUTATION_CHUNK_SIZE", 1000)
+)
+# Bulk mutations of more objects are processed in the background
+GRAPHQL_BULK_MUTATION_BACKGROUND_THRESHOLD = int(
+    os.environ.get("GRAPHQL_BULK_MUTATION_BACKGROUND_THRESHOLD", 5000)
+)
+
 # 支付宝参数配置
 class AliPayConfig(object):
 
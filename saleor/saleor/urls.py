@@ -11,10 +11,11 @@ from .account.urls import urlpatterns as account_urls
 from .checkout.urls import checkout_urlpatterns as checkout_urls
 from .core.sitemaps import sitemaps
 from .core.urls import urlpatterns as core_urls
+from .core.views import thumbnail
 from .dashboard.urls import urlpatterns as dashboard_urls
 from .data_feeds.urls import urlpatterns as feed_urls
 from .graphql.api import schema
-from .graphql.views import GraphQLView
+from .graphql.views import GraphQLView, metrics as graphql_metrics
 from .order.urls import urlpatterns as order_urls
 from .page.urls import urlpatterns as page_urls
 from .product.urls import urlpatterns as product_urls
@@ -25,6 +26,7 @@ handler404 = "saleor.core.views.handle_404"
 
 non_translatable_urlpatterns = [
     url(r"^dashboard/", include((dashboard_urls, "dashboard"), namespace="dashboard")),
+    url(r"^graphql/metrics/$", graphql_metrics, name="api-metrics"),
     url(r"^graphql/", csrf_exempt(GraphQLView.as_view(schema=schema)), name="api"),
     url(
         r"^sitemap\.xml$",
@@ -33,6 +35,12 @@ non_translatable_urlpatterns = [
         name="django.contrib.sitemaps.views.sitemap",
     ),
     url(r"^i18n/$", set_language, name="set_language"),
+    url(
+        r"^thumbnail/(?P<model_key>[\w-]+)/(?P<pk>\d+)/(?P<version>[0-9a-f]+)/"
+        r"(?P<method>thumbnail|crop)/(?P<size>\d+x\d+)/$",
+        thumbnail,
+        name="thumbnail",
+    ),
     url("", include("social_django.urls", namespace="social")),
     url(r"^pays/", include(alipay_urls)),
 ]
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import pytest
+
+from saleor.graphql import encoding
+from tests.api.utils import get_graphql_content
+
+QUERY_PRODUCTS = """
+    query ProductsList {
+      products(first: 20) {
+        edges {
+          node {
+            id
+            name
+            thumbnail {
+              url
+              alt
+            }
+            pricing {
+              priceRange {
+                start {
+                  gross {
+                    amount
+                    currency
+                    localized
+                  }
+                }
+              }
+            }
+            variants {
+              id
+              sku
+              name
+              price {
+                amount
+                currency
+                localized
+              }
+              attributes {
+                attribute {
+                  id
+                  name
+                }
+                value {
+                  id
+                  name
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+"""
+
+
+@pytest.fixture
+def product_list_result(api_client, product_list):
+    """Return the response data of a product listing before it is encoded.
+
+    It is the result of the execution with nested `OrderedDict`s, not the
+    decoded content of the response.
+    """
+    with patch("saleor.graphql.views.encoding.dumps", wraps=encoding.dumps) as dumps:
+        get_graphql_content(api_client.post_graphql(QUERY_PRODUCTS))
+    return dumps.call_args[0][0]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_encode_product_list(backend, product_list_result, benchmark):
+    if backend not in encoding.BACKENDS:
+        pytest.skip("%s is not installed" % backend)
+    dumps, loads = encoding.BACKENDS[backend]
+
+    encoded = benchmark(dumps, product_list_result)
+
+    assert loads(encoded)["data"]["products"]["edges"]
@@ -24,7 +24,9 @@ from saleor.graphql.account.mutations import (
     UserDelete,
 )
 from saleor.graphql.core.enums import PermissionEnum
+from saleor.order import OrderStatus
 from saleor.order.models import FulfillmentStatus, Order
+from saleor.order.utils import update_customer_stats
 from tests.api.utils import get_graphql_content
 from tests.utils import create_image
 
@@ -1914,6 +1916,7 @@ def test_query_customers_with_filter_placed_orders_(
     second_customer = User.objects.create(email="second_example@example.com")
     with freeze_time("2012-01-14 11:00:00"):
         Order.objects.create(user=second_customer)
+    update_customer_stats([customer_user.pk, second_customer.pk])
     variables = {"filter": customer_filter}
     response = staff_api_client.post_graphql(
         query_customer_with_filter, variables, permissions=[permission_manage_users]
@@ -1924,6 +1927,36 @@ def test_query_customers_with_filter_placed_orders_(
     assert len(users) == count
 
 
+def test_query_customers_with_filter_placed_orders_skips_draft_and_canceled(
+    query_customer_with_filter,
+    staff_api_client,
+    permission_manage_users,
+    customer_user,
+):
+    # Only placed orders are counted, drafts and canceled orders are not
+    Order.objects.bulk_create(
+        [
+            Order(user=customer_user, token=str(uuid.uuid4())),
+            Order(
+                user=customer_user, token=str(uuid.uuid4()), status=OrderStatus.DRAFT
+            ),
+            Order(
+                user=customer_user,
+                token=str(uuid.uuid4()),
+                status=OrderStatus.CANCELED,
+            ),
+        ]
+    )
+    update_customer_stats([customer_user.pk])
+    variables = {"filter": {"numberOfOrders": {"gte": 2}}}
+    response = staff_api_client.post_graphql(
+        query_customer_with_filter, variables, permissions=[permission_manage_users]
+    )
+    content = get_graphql_content(response)
+
+    assert not content["data"]["customers"]["edges"]
+
+
 @pytest.mark.parametrize(
     "customer_filter, count",
     [
@@ -1956,6 +1989,7 @@ def test_query_customers_with_filter_placed_orders__(
             ),
         ]
     )
+    update_customer_stats([customer_user.pk, second_customer.pk])
 
     variables = {"filter": customer_filter}
     response = staff_api_client.post_graphql(
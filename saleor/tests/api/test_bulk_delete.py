@@ -689,3 +689,129 @@ def test_delete_vouchers(staff_api_client, voucher_list, permission_manage_disco
     assert not Voucher.objects.filter(
         id__in=[voucher.id for voucher in voucher_list]
     ).exists()
+
+
+def test_delete_draft_orders_validates_status(
+    staff_api_client, order_list, permission_manage_orders
+):
+    order_1, order_2, *_ = order_list
+    order_1.status = OrderStatus.DRAFT
+    order_1.save()
+
+    query = """
+    mutation draftOrderBulkDelete($ids: [ID]!) {
+        draftOrderBulkDelete(ids: $ids) {
+            count
+            errors {
+                field
+                message
+            }
+        }
+    }
+    """
+
+    order_2_id = graphene.Node.to_global_id("Order", order_2.id)
+    variables = {"ids": [graphene.Node.to_global_id("Order", order_1.id), order_2_id]}
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_orders]
+    )
+    content = get_graphql_content(response)
+
+    data = content["data"]["draftOrderBulkDelete"]
+    assert data["count"] == 1
+    assert data["errors"] == [
+        {"field": order_2_id, "message": "Cannot delete non-draft orders."}
+    ]
+    assert not order_models.Order.objects.filter(id=order_1.id).exists()
+    assert order_models.Order.objects.filter(id=order_2.id).exists()
+
+
+def test_delete_vouchers_clears_relations(
+    staff_api_client, voucher, order, permission_manage_discounts
+):
+    order.voucher = voucher
+    order.save()
+    voucher.translations.create(language_code="pl", name="Bon")
+
+    query = """
+    mutation voucherBulkDelete($ids: [ID]!) {
+        voucherBulkDelete(ids: $ids) {
+            count
+        }
+    }
+    """
+
+    variables = {"ids": [graphene.Node.to_global_id("Voucher", voucher.id)]}
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_discounts]
+    )
+    content = get_graphql_content(response)
+
+    assert content["data"]["voucherBulkDelete"]["count"] == 1
+    assert not Voucher.objects.filter(id=voucher.id).exists()
+    order.refresh_from_db()
+    assert order.voucher is None
+
+
+@patch(
+    "saleor.graphql.core.mutations.transaction.on_commit",
+    side_effect=lambda func: func(),
+)
+def test_delete_products_in_background(
+    mocked_on_commit,
+    staff_api_client,
+    product_list,
+    permission_manage_products,
+    settings,
+):
+    settings.GRAPHQL_BULK_MUTATION_BACKGROUND_THRESHOLD = 1
+    settings.GRAPHQL_BULK_MUTATION_CHUNK_SIZE = 2
+
+    query = """
+    mutation productBulkDelete($ids: [ID]!) {
+        productBulkDelete(ids: $ids) {
+            count
+            job {
+                id
+                status
+                total
+            }
+        }
+    }
+    """
+
+    variables = {
+        "ids": [
+            graphene.Node.to_global_id("Product", product.id)
+            for product in product_list
+        ]
+    }
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_products]
+    )
+    content = get_graphql_content(response)
+
+    data = content["data"]["productBulkDelete"]
+    assert data["count"] == len(product_list)
+    assert data["job"]["status"] == "PENDING"
+    assert data["job"]["total"] == len(product_list)
+    assert not Product.objects.filter(
+        id__in=[product.id for product in product_list]
+    ).exists()
+
+    query = """
+    query bulkJob($id: ID!) {
+        bulkJob(id: $id) {
+            status
+            processed
+            total
+        }
+    }
+    """
+    response = staff_api_client.post_graphql(query, {"id": data["job"]["id"]})
+    content = get_graphql_content(response)
+    assert content["data"]["bulkJob"] == {
+        "status": "SUCCESS",
+        "processed": len(product_list),
+        "total": len(product_list),
+    }
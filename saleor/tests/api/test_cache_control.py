@@ -0,0 +1,175 @@
+import hashlib
+import json
+
+from graphql import parse
+
+from saleor.graphql import cache_control
+from saleor.graphql.api import schema
+from saleor.graphql.cache_control import CacheControlAnalyzer
+
+from .conftest import API_PATH
+from .utils import _get_graphql_content_from_response, get_graphql_content
+
+QUERY_PRODUCTS = """
+    query Products {
+        products(first: 2) {
+            edges {
+                node {
+                    name
+                    category {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def get_max_age(query):
+    return CacheControlAnalyzer(schema, parse(query)).get_max_age()
+
+
+def test_max_age_is_the_lowest_hint(settings):
+    settings.GRAPHQL_CACHE_CONTROL = {"Product": 300, "Category": 3600}
+    assert get_max_age(QUERY_PRODUCTS) == 300
+
+
+def test_max_age_of_field_hint(settings):
+    settings.GRAPHQL_CACHE_CONTROL = {"Product": 300, "Product.name": 10}
+    assert get_max_age("{ products(first: 2) { edges { node { name } } } }") == 10
+
+
+def test_types_without_hint_are_not_cached(settings):
+    settings.GRAPHQL_CACHE_CONTROL = {"Product": 300}
+    settings.GRAPHQL_CACHE_DEFAULT_MAX_AGE = 0
+    assert get_max_age(QUERY_PRODUCTS) == 0
+    assert get_max_age("{ me { email } }") == 0
+
+
+def test_mutations_are_not_cached():
+    assert get_max_age('mutation { tokenVerify(token: "") { payload } }') == 0
+
+
+def get_persisted_query(client, query, **kwargs):
+    """Store the query and return the response to a request sending its hash."""
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    extensions = json.dumps(
+        {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+    )
+    client.get(API_PATH, {"query": query, "extensions": extensions}, **kwargs)
+    return client.get(API_PATH, {"extensions": extensions}, **kwargs)
+
+
+def test_get_persisted_query_is_cacheable(client, product, settings):
+    settings.GRAPHQL_CACHE_CONTROL = {"Product": 300, "Category": 3600}
+    response = get_persisted_query(client, QUERY_PRODUCTS)
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+    assert response["Cache-Control"] == "public, max-age=300"
+    assert response["Surrogate-Key"].split() == sorted(
+        [
+            "category",
+            "category-%s" % product.category_id,
+            "product",
+            "product-%s" % product.pk,
+        ]
+    )
+
+
+def test_get_query_is_not_cached(client, product, settings):
+    settings.GRAPHQL_CACHE_CONTROL = {"Product": 300, "Category": 3600}
+    response = client.get(API_PATH, {"query": QUERY_PRODUCTS})
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+    assert "no-cache" in response["Cache-Control"]
+    assert not response.has_header("Surrogate-Key")
+
+
+def test_get_query_with_uncacheable_field(client, product, settings):
+    settings.GRAPHQL_CACHE_CONTROL = {"Product": 300, "Product.name": 0}
+    query = "{ products(first: 2) { edges { node { name } } } }"
+    response = get_persisted_query(client, query)
+    assert response.status_code == 200
+    assert "no-cache" in response["Cache-Control"]
+    assert not response.has_header("Surrogate-Key")
+
+
+def test_get_query_of_authenticated_user_is_not_cached(
+    staff_api_client, product, settings
+):
+    settings.GRAPHQL_CACHE_CONTROL = {"Product": 300}
+    query = "{ products(first: 2) { edges { node { name } } } }"
+    response = get_persisted_query(staff_api_client, query)
+    assert response.status_code == 200
+    assert "no-cache" in response["Cache-Control"]
+
+
+def test_get_query_of_user_authenticated_by_cookie_is_not_cached(
+    admin_client, product, settings
+):
+    settings.GRAPHQL_CACHE_CONTROL = {"Product": 300}
+    query = "{ products(first: 2) { edges { node { name } } } }"
+    response = get_persisted_query(admin_client, query)
+    assert response.status_code == 200
+    assert "no-cache" in response["Cache-Control"]
+    assert "Cookie" not in response["Vary"]
+
+
+def test_get_mutation_is_rejected(client):
+    query = 'mutation { tokenVerify(token: "") { payload } }'
+    response = client.get(API_PATH, {"query": query})
+    content = _get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == (
+        "Only queries can be executed with GET requests."
+    )
+
+
+def test_post_query_is_not_cached(api_client, product):
+    response = api_client.post_graphql(QUERY_PRODUCTS)
+    assert response.status_code == 200
+    assert not response.has_header("Cache-Control")
+
+
+def test_persisted_query(client, product):
+    query_hash = hashlib.sha256(QUERY_PRODUCTS.encode("utf-8")).hexdigest()
+    extensions = json.dumps(
+        {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+    )
+
+    response = client.get(API_PATH, {"extensions": extensions})
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+    response = client.get(API_PATH, {"query": QUERY_PRODUCTS, "extensions": extensions})
+    get_graphql_content(response)
+
+    response = client.get(API_PATH, {"extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+
+def test_persisted_query_with_invalid_hash(client):
+    extensions = json.dumps({"persistedQuery": {"version": 1, "sha256Hash": "abc"}})
+    response = client.get(API_PATH, {"query": QUERY_PRODUCTS, "extensions": extensions})
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match the query."
+    )
+
+
+def test_too_large_persisted_query_is_not_stored(client, product, monkeypatch):
+    monkeypatch.setattr(cache_control, "PERSISTED_QUERY_MAX_LENGTH", 10)
+    query_hash = hashlib.sha256(QUERY_PRODUCTS.encode("utf-8")).hexdigest()
+    extensions = json.dumps(
+        {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+    )
+
+    response = client.get(API_PATH, {"query": QUERY_PRODUCTS, "extensions": extensions})
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+    response = client.get(API_PATH, {"extensions": extensions})
+    content = _get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
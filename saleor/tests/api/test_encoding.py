@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import pgettext_lazy
+from prices import Money
+
+from saleor.graphql import check_json_backend, encoding
+
+from .utils import get_graphql_content
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_dumps_serializes_decimals_and_money(backend, settings):
+    if backend not in encoding.BACKENDS:
+        pytest.skip("%s is not installed" % backend)
+    settings.GRAPHQL_JSON_BACKEND = backend
+    data = OrderedDict(
+        [
+            ("price", Money("10.50", "USD")),
+            ("amount", Decimal("1.25")),
+            ("name", pgettext_lazy("Test", "Żółw")),
+        ]
+    )
+    encoded = encoding.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert encoding.loads(encoded) == {
+        "price": {"amount": 10.5, "currency": "USD"},
+        "amount": 1.25,
+        "name": "Żółw",
+    }
+
+
+def test_dumps_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        encoding.dumps({"value": object()})
+
+
+def test_json_backend_from_settings(settings):
+    settings.GRAPHQL_JSON_BACKEND = "json"
+    assert encoding.get_backend() == encoding.BACKENDS["json"]
+
+
+def test_api_response_is_encoded_with_backend(api_client, product, settings):
+    settings.GRAPHQL_JSON_BACKEND = "json"
+    query = "{ products(first: 1) { edges { node { name } } } }"
+    response = api_client.post_graphql(query)
+    assert response["Content-Type"] == "application/json"
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+
+def test_unavailable_backend_falls_back(settings):
+    settings.GRAPHQL_JSON_BACKEND = "unavailable"
+
+    assert encoding.loads(encoding.dumps({"name": "Żółw"})) == {"name": "Żółw"}
+    [warning] = check_json_backend(None)
+    assert warning.id == "saleor.W002"
@@ -11,10 +11,12 @@ from graphql_jwt.shortcuts import get_token
 from graphql_relay import to_global_id
 
 from saleor.graphql.middleware import jwt_middleware
-from saleor.graphql.product.types import Product
+from saleor.graphql.product.types import Product, ProductVariant
 from saleor.graphql.utils import (
+    _resolve_graphene_type,
     filter_by_query_param,
     generate_query_argument_description,
+    get_database_ids,
     get_nodes,
 )
 from tests.api.utils import get_graphql_content
@@ -244,6 +246,29 @@ def test_get_nodes(product_list):
         get_nodes(global_ids, Product)
 
 
+def test_get_nodes_in_single_query(product_list, django_assert_num_queries):
+    global_ids = [to_global_id("Product", product.pk) for product in product_list]
+    global_ids.reverse()
+    with django_assert_num_queries(1):
+        products = get_nodes(global_ids)
+    assert products == list(reversed(product_list))
+
+
+def test_resolve_graphene_type():
+    assert _resolve_graphene_type("Product") is Product
+    with pytest.raises(AssertionError):
+        _resolve_graphene_type("Unknown")
+
+
+def test_get_database_ids(product_list):
+    global_ids = [to_global_id("Product", product.pk) for product in product_list]
+    assert get_database_ids(global_ids, Product) == [
+        str(product.pk) for product in product_list
+    ]
+    with pytest.raises(AssertionError):
+        get_database_ids(global_ids, ProductVariant)
+
+
 @patch("saleor.product.models.Product.objects")
 def test_filter_by_query_param(qs):
     qs.filter.return_value = qs
@@ -2010,8 +2010,8 @@ def test_order_query_with_filter_customer_fields(
     customer_user.save()
     customer_user.refresh_from_db()
 
-    order = Order(user=customer_user, token=str(uuid.uuid4()))
-    Order.objects.bulk_create([order, Order(token=str(uuid.uuid4()))])
+    order = Order.objects.create(user=customer_user, token=str(uuid.uuid4()))
+    Order.objects.create(token=str(uuid.uuid4()))
 
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
@@ -2045,10 +2045,10 @@ def test_draft_order_query_with_filter_customer_fields(
     customer_user.save()
     customer_user.refresh_from_db()
 
-    order = Order(status=OrderStatus.DRAFT, user=customer_user, token=str(uuid.uuid4()))
-    Order.objects.bulk_create(
-        [order, Order(token=str(uuid.uuid4()), status=OrderStatus.DRAFT)]
+    order = Order.objects.create(
+        status=OrderStatus.DRAFT, user=customer_user, token=str(uuid.uuid4())
     )
+    Order.objects.create(token=str(uuid.uuid4()), status=OrderStatus.DRAFT)
 
     variables = {"filter": orders_filter}
     staff_api_client.user.user_permissions.add(permission_manage_orders)
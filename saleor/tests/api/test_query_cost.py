@@ -0,0 +1,154 @@
+from graphql import parse
+
+from saleor.graphql.api import schema
+from saleor.graphql.query_cost import QueryCostAnalyzer
+
+from .utils import _get_graphql_content_from_response, get_graphql_content
+
+QUERY_PRODUCTS = """
+    query {
+        products(first: 2) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+def analyze(query, variables=None):
+    return QueryCostAnalyzer(schema, parse(query), variables).analyze()
+
+
+def test_query_cost_of_connection():
+    assert analyze(QUERY_PRODUCTS) == (5, 4)
+
+
+def test_query_cost_of_nested_lists(settings):
+    settings.GRAPHQL_QUERY_DEFAULT_LIST_SIZE = 10
+    query = """
+    query {
+        products(first: 10) {
+            edges {
+                node {
+                    variants {
+                        id
+                    }
+                }
+            }
+        }
+    }
+    """
+    assert analyze(query) == (121, 5)
+
+
+def test_query_cost_with_fragments_and_variables():
+    query = """
+    query Products($first: Int) {
+        products(first: $first) {
+            ...ProductsFragment
+        }
+    }
+    fragment ProductsFragment on ProductCountableConnection {
+        edges {
+            node {
+                name
+            }
+        }
+    }
+    """
+    assert analyze(query, {"first": 2}) == (5, 4)
+
+
+def test_query_cost_is_reported(api_client, product_list):
+    response = api_client.post_graphql(QUERY_PRODUCTS)
+    content = get_graphql_content(response)
+    assert content["extensions"]["cost"] == {
+        "requestedQueryCost": 5,
+        "actualQueryCost": 5,
+        "maximumAvailable": 50000,
+    }
+
+
+def test_query_above_max_cost_is_rejected(api_client, product_list, settings):
+    settings.GRAPHQL_QUERY_MAX_COST = 4
+    response = api_client.post_graphql(QUERY_PRODUCTS)
+    content = _get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == (
+        "Query cost 5 exceeds the maximum cost of 4."
+    )
+
+
+def test_query_above_max_depth_is_rejected(api_client, product_list, settings):
+    settings.GRAPHQL_QUERY_MAX_DEPTH = 3
+    response = api_client.post_graphql(QUERY_PRODUCTS)
+    content = _get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == (
+        "Query depth 4 exceeds the maximum depth of 3."
+    )
+
+
+def test_query_cost_limit_per_minute(api_client, product_list, settings):
+    settings.GRAPHQL_QUERY_COST_LIMIT_PER_MINUTE = 6
+    response = api_client.post_graphql(QUERY_PRODUCTS)
+    assert response.status_code == 200
+
+    response = api_client.post_graphql(QUERY_PRODUCTS)
+    content = _get_graphql_content_from_response(response)
+    assert response.status_code == 400
+    assert content["errors"][0]["message"] == (
+        "Query cost limit per minute exceeded, retry later."
+    )
+
+
+def test_query_cost_limit_per_minute_per_client_ip(api_client, product_list, settings):
+    settings.GRAPHQL_QUERY_COST_LIMIT_PER_MINUTE = 6
+    settings.TRUSTED_PROXIES_COUNT = 1
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS, HTTP_X_FORWARDED_FOR="203.0.113.1"
+    )
+    assert response.status_code == 200
+
+    # Clients behind the same proxy have their own budgets
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS, HTTP_X_FORWARDED_FOR="203.0.113.2"
+    )
+    assert response.status_code == 200
+
+
+def test_query_cost_limit_per_minute_with_spoofed_client_ip(
+    api_client, product_list, settings
+):
+    settings.GRAPHQL_QUERY_COST_LIMIT_PER_MINUTE = 6
+    settings.TRUSTED_PROXIES_COUNT = 1
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS, HTTP_X_FORWARDED_FOR="198.51.100.1, 203.0.113.1"
+    )
+    assert response.status_code == 200
+
+    # The leftmost address is sent by the client, the proxy added the last one
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS, HTTP_X_FORWARDED_FOR="198.51.100.2, 203.0.113.1"
+    )
+    assert response.status_code == 400
+
+
+def test_query_cost_limit_per_minute_without_trusted_proxies(
+    api_client, product_list, settings
+):
+    settings.GRAPHQL_QUERY_COST_LIMIT_PER_MINUTE = 6
+    settings.TRUSTED_PROXIES_COUNT = 0
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS, HTTP_X_FORWARDED_FOR="203.0.113.1"
+    )
+    assert response.status_code == 200
+
+    # The header is ignored, the budget is kept per connecting address
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS, HTTP_X_FORWARDED_FOR="203.0.113.2"
+    )
+    assert response.status_code == 400
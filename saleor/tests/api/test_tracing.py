@@ -0,0 +1,133 @@
+from django.shortcuts import reverse
+from graphql import parse
+
+from saleor.graphql import tracing
+from saleor.graphql.tracing import (
+    Tracer,
+    format_metrics,
+    get_operation_name,
+    get_traces,
+    record_trace,
+)
+
+from .utils import get_graphql_content
+
+QUERY_PRODUCTS = """
+    query Products {
+        products(first: 2) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+def get_resolver(report, path):
+    return next(
+        resolver for resolver in report["resolvers"] if resolver["path"] == path
+    )
+
+
+def test_tracing_is_returned_to_staff(staff_api_client, product_list, settings):
+    settings.GRAPHQL_TRACING_SAMPLE_RATE = 0
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS, HTTP_X_GRAPHQL_TRACING="1")
+    content = get_graphql_content(response)
+    tracing = content["extensions"]["tracing"]
+    assert tracing["operationName"] == "Products"
+    assert tracing["queries"] > 0
+    products = get_resolver(tracing, "products")
+    assert products["calls"] == 1
+    names = get_resolver(tracing, "products.edges.node.name")
+    assert names["calls"] == 2
+    assert names["queries"] == 0
+
+
+def test_tracing_is_not_returned_to_customers(user_api_client, product_list, settings):
+    settings.GRAPHQL_TRACING_SAMPLE_RATE = 1
+    response = user_api_client.post_graphql(QUERY_PRODUCTS, HTTP_X_GRAPHQL_TRACING="1")
+    content = get_graphql_content(response)
+    assert "tracing" not in content["extensions"]
+    # The request was sampled
+    assert get_traces()["Products"]["requests"][0] == 1
+
+
+def test_tracing_is_not_returned_to_customers_in_debug(
+    user_api_client, product_list, settings
+):
+    settings.DEBUG = True
+    response = user_api_client.post_graphql(QUERY_PRODUCTS, HTTP_X_GRAPHQL_TRACING="1")
+    content = get_graphql_content(response)
+    assert "tracing" not in content.get("extensions", {})
+
+
+def test_get_operation_name_from_document():
+    document_ast = parse(
+        "query Products { shop { name } } query Shop { shop { name } }"
+    )
+
+    assert get_operation_name(document_ast, "Shop") == "Shop"
+    assert get_operation_name(document_ast, "Unknown") == "anonymous"
+    assert get_operation_name(parse(QUERY_PRODUCTS)) == "Products"
+    assert get_operation_name(parse("{ shop { name } }")) == "anonymous"
+
+
+def test_record_trace_limits_number_of_operations(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACING_MAX_OPERATIONS", 1)
+    record_trace(Tracer("Products"))
+    record_trace(Tracer("Categories"))
+
+    assert set(get_traces()) == {"Products", "anonymous"}
+
+
+def test_requests_are_not_traced_without_sampling(api_client, product_list, settings):
+    settings.GRAPHQL_TRACING_SAMPLE_RATE = 0
+    api_client.post_graphql(QUERY_PRODUCTS)
+    assert get_traces() == {}
+
+
+def test_record_trace_aggregates_by_operation():
+    for _ in range(2):
+        tracer = Tracer("Products")
+        tracer.duration = 0.5
+        tracer.queries = 2
+        tracer.add_resolver("products", 0.25, 2)
+        record_trace(tracer)
+
+    totals = get_traces()["Products"]
+    assert totals["requests"] == [2, 1.0, 4]
+    assert totals["resolvers"] == {"products": [2, 0.5, 4]}
+
+
+def test_format_metrics():
+    traces = {
+        "Products": {"requests": [2, 1.0, 4], "resolvers": {"products": [2, 0.5, 4]}}
+    }
+    metrics = format_metrics(traces)
+    assert 'saleor_graphql_requests_total{operation="Products"} 2' in metrics
+    assert (
+        'saleor_graphql_resolver_queries_total{operation="Products",path="products"} 4'
+        in metrics
+    )
+    assert "# TYPE saleor_graphql_resolver_seconds_total counter" in metrics
+
+
+def test_metrics_view_requires_token(client, settings):
+    settings.GRAPHQL_TRACING_SAMPLE_RATE = 0.1
+    settings.GRAPHQL_METRICS_TOKEN = "secret"
+    url = reverse("api-metrics")
+
+    response = client.get(url)
+    assert response.status_code == 403
+
+    response = client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+
+
+def test_metrics_view_disabled_without_tracing(client, settings):
+    settings.GRAPHQL_TRACING_SAMPLE_RATE = 0
+    response = client.get(reverse("api-metrics"))
+    assert response.status_code == 404
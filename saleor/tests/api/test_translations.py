@@ -1,7 +1,10 @@
 import graphene
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from saleor.graphql.translations.schema import TranslatableKinds
+from saleor.product.models import ProductTranslation, ProductVariantTranslation
 from tests.api.utils import get_graphql_content
 
 
@@ -29,6 +32,47 @@ def test_product_translation(user_api_client, product):
     assert data["product"]["translation"]["language"]["code"] == "PL"
 
 
+def test_translations_are_loaded_in_batches(user_api_client, product_list):
+    for product in product_list:
+        product.translations.create(language_code="pl", name="Produkt")
+
+    query = """
+    query products {
+        products(first: 10) {
+            edges {
+                node {
+                    translation(languageCode: PL) {
+                        name
+                    }
+                    variants {
+                        translation(languageCode: PL) {
+                            name
+                        }
+                    }
+                }
+            }
+        }
+    }
+    """
+
+    with CaptureQueriesContext(connection) as queries:
+        response = user_api_client.post_graphql(query)
+    data = get_graphql_content(response)["data"]
+
+    translations = [edge["node"]["translation"] for edge in data["products"]["edges"]]
+    assert translations == [{"name": "Produkt"}] * len(product_list)
+    for table in [
+        ProductTranslation._meta.db_table,
+        ProductVariantTranslation._meta.db_table,
+    ]:
+        table_queries = [
+            query
+            for query in queries.captured_queries
+            if 'FROM "%s"' % table in query["sql"]
+        ]
+        assert len(table_queries) == 1
+
+
 def test_product_variant_translation(user_api_client, variant):
     variant.translations.create(language_code="pl", name="Wariant")
 
@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, Mock
 import pytest
 from django.contrib.auth.models import Permission
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.forms import ModelForm
@@ -53,6 +54,12 @@ from saleor.site.models import AuthorizationKey, SiteSettings
 from tests.utils import create_image
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Prevent cached data from leaking between tests."""
+    cache.clear()
+
+
 @pytest.fixture(autouse=True)
 def site_settings(db, settings):
     """Create a site and matching site settings.
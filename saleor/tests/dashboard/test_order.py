@@ -3,6 +3,7 @@ from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
+from django.core import mail
 from django.urls import reverse
 from phonenumber_field.phonenumber import PhoneNumber
 from prices import Money, TaxedMoney
@@ -462,7 +463,7 @@ def test_ordered_item_change_quantity(transactional_db, order_with_lines):
 
 
 @pytest.mark.integration
-def test_view_order_invoice(admin_client, order_with_lines):
+def test_view_order_invoice(admin_client, order_with_lines, media_root):
     url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
     response = admin_client.get(url)
     assert response.status_code == 200
@@ -472,7 +473,9 @@ def test_view_order_invoice(admin_client, order_with_lines):
 
 
 @pytest.mark.integration
-def test_view_order_invoice_without_shipping(admin_client, order_with_lines):
+def test_view_order_invoice_without_shipping(
+    admin_client, order_with_lines, media_root
+):
     order_with_lines.shipping_address.delete()
     # Regression test for #1536:
     url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
@@ -482,7 +485,7 @@ def test_view_order_invoice_without_shipping(admin_client, order_with_lines):
 
 
 @pytest.mark.integration
-def test_view_fulfillment_packing_slips(admin_client, fulfilled_order):
+def test_view_fulfillment_packing_slips(admin_client, fulfilled_order, media_root):
     fulfillment = fulfilled_order.fulfillments.first()
     url = reverse(
         "dashboard:fulfillment-packing-slips",
@@ -496,7 +499,9 @@ def test_view_fulfillment_packing_slips(admin_client, fulfilled_order):
 
 
 @pytest.mark.integration
-def test_view_fulfillment_packing_slips_without_shipping(admin_client, fulfilled_order):
+def test_view_fulfillment_packing_slips_without_shipping(
+    admin_client, fulfilled_order, media_root
+):
     # Regression test for #1536
     fulfilled_order.shipping_address.delete()
     fulfillment = fulfilled_order.fulfillments.first()
@@ -509,6 +514,49 @@ def test_view_fulfillment_packing_slips_without_shipping(admin_client, fulfilled
     assert response["content-type"] == "application/pdf"
 
 
+@patch("saleor.order.pdf._create_pdf")
+def test_view_order_invoice_is_rendered_once(
+    mocked_create_pdf, admin_client, order_with_lines, media_root
+):
+    mocked_create_pdf.return_value = b"%PDF"
+    url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
+
+    admin_client.get(url)
+    response = admin_client.get(url)
+
+    assert response.status_code == 200
+    assert response.content == b"%PDF"
+    mocked_create_pdf.assert_called_once()
+
+
+@patch("saleor.dashboard.order.views.generate_invoice_pdf.delay")
+def test_view_order_invoice_queues_rendering(
+    mocked_task, admin_client, order_with_lines, media_root
+):
+    url = reverse("dashboard:order-invoice", kwargs={"order_pk": order_with_lines.id})
+
+    response = admin_client.get(url)
+
+    assert response.status_code == 202
+    mocked_task.assert_called_once()
+
+
+@patch("saleor.order.tasks.create_bulk_invoices_pdf")
+def test_view_order_invoices_bulk(
+    mocked_create_pdf, admin_client, order_list, media_root
+):
+    mocked_create_pdf.return_value = b"%PDF"
+    url = reverse("dashboard:order-invoices-bulk")
+    data = {"orders": [order.pk for order in order_list]}
+
+    response = admin_client.get(url, data)
+
+    assert response.status_code == 200
+    assert response["content-type"] == "application/pdf"
+    rendered_orders = mocked_create_pdf.call_args[0][0]
+    assert {order.pk for order in rendered_orders} == set(data["orders"])
+
+
 def test_view_add_variant_to_order(admin_client, order_with_lines, admin_user):
     order_with_lines.status = OrderStatus.DRAFT
     order_with_lines.save()
@@ -1044,18 +1092,11 @@ def test_view_mark_order_as_paid(admin_client, order_with_lines):
     ).exists()
 
 
-@patch("saleor.order.utils.emails.send_fulfillment_confirmation")
 @pytest.mark.parametrize(
     "has_standard,has_digital", ((True, True), (True, False), (False, True))
 )
 def test_send_fulfillment_order_lines_mails(
-    mocked_send_fulfillment_confirmation,
-    staff_user,
-    fulfilled_order,
-    fulfillment,
-    digital_content,
-    has_standard,
-    has_digital,
+    staff_user, fulfilled_order, fulfillment, digital_content, has_standard, has_digital
 ):
 
     order = fulfilled_order
@@ -1078,9 +1119,7 @@ def test_send_fulfillment_order_lines_mails(
     )
     events = OrderEvent.objects.all()
 
-    mocked_send_fulfillment_confirmation.delay.assert_called_once_with(
-        order.pk, fulfillment.pk
-    )
+    assert len(mail.outbox) == 1
 
     # Ensure the standard fulfillment event was triggered
     assert events[0].user == staff_user
@@ -1254,3 +1293,13 @@ def test_filter_order_by_status(admin_client):
     data = {"status": "unfulfilled", "payment_status": ChargeStatus.FULLY_REFUNDED}
     response = admin_client.get(url, data)
     assert response.status_code == 200
+
+
+def test_filter_order_by_customer_name_or_email(admin_client, order):
+    Order.objects.create(user_email="other@example.com")
+    url = reverse("dashboard:orders")
+
+    response = admin_client.get(url, {"name_or_email": "test@example"})
+
+    assert response.status_code == 200
+    assert list(response.context["filter_set"].qs) == [order]
@@ -1,6 +1,8 @@
 import pytest
 
+from saleor.celeryconf import app
 from saleor.order.emails import send_order_confirmation, send_payment_confirmation
+from saleor.settings import get_task_priority
 
 
 @pytest.mark.integration
@@ -11,3 +13,29 @@ def test_email_sending_asynchronously(
     payment = send_payment_confirmation.delay(order_with_lines.pk)
     order.get()
     payment.get()
+
+
+@pytest.mark.parametrize(
+    "task_name, queue",
+    [
+        ("saleor.order.emails.send_order_confirmation", "emails"),
+        ("saleor.order.emails.send_order_confirmations", "emails"),
+        ("saleor.dashboard.emails.send_set_password_staff_email", "emails"),
+        ("saleor.product.thumbnails.create_product_thumbnails", "media"),
+        ("saleor.order.tasks.generate_invoice_pdf", "media"),
+        ("saleor.product.tasks.update_variants_names", "search"),
+        ("saleor.discount.tasks.reconcile_voucher_usage_task", "maintenance"),
+        ("saleor.core.analytics.ga_report", "celery"),
+    ],
+)
+def test_task_routing(task_name, queue):
+    route = app.amqp.router.route({}, task_name)
+    assert route["queue"].name == queue
+
+
+def test_customer_emails_have_priority_over_bulk_emails():
+    router = app.amqp.router
+    customer_email = router.route({}, "saleor.order.emails.send_order_confirmation")
+    bulk_email = router.route({}, "saleor.order.emails.send_order_confirmations")
+    assert customer_email["priority"] == get_task_priority(9)
+    assert bulk_email["priority"] == get_task_priority(0)
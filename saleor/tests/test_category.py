@@ -12,3 +12,39 @@ def test_product_category_filter_filters_from_child_category(
 
     assert attribut in product_attributes
     assert variant in variant_attributes
+
+
+def test_product_category_filter_is_cached(
+    product_type, categories_tree, django_assert_num_queries
+):
+    ProductCategoryFilter(data={}, category=categories_tree)
+
+    with django_assert_num_queries(0):
+        product_filter = ProductCategoryFilter(data={}, category=categories_tree)
+
+    attribute = product_type.product_attributes.get()
+    assert attribute.slug in product_filter.filters
+
+
+def test_product_category_filter_cache_invalidated_on_attribute_change(
+    product_type, categories_tree
+):
+    ProductCategoryFilter(data={}, category=categories_tree)
+    attribute = product_type.product_attributes.get()
+    attribute.name = "New name"
+    attribute.save()
+
+    product_filter = ProductCategoryFilter(data={}, category=categories_tree)
+
+    assert product_filter.filters[attribute.slug].label == "New name"
+
+
+def test_product_category_filter_cache_kept_on_product_change(
+    product, categories_tree, django_assert_num_queries
+):
+    ProductCategoryFilter(data={}, category=categories_tree)
+    product.name = "New name"
+    product.save()
+
+    with django_assert_num_queries(0):
+        ProductCategoryFilter(data={}, category=categories_tree)
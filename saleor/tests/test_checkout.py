@@ -3,6 +3,8 @@ from unittest.mock import Mock, patch
 
 import pytest
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django_countries.fields import Country
@@ -15,6 +17,7 @@ from saleor.checkout import views
 from saleor.checkout.forms import CheckoutVoucherForm, CountryForm
 from saleor.checkout.utils import (
     add_variant_to_checkout,
+    add_variants_to_checkout,
     add_voucher_to_checkout,
     change_billing_address_in_checkout,
     change_shipping_address_in_checkout,
@@ -34,6 +37,7 @@ from saleor.core.taxes import zero_money, zero_taxed_money
 from saleor.core.taxes.interface import taxes_are_enabled
 from saleor.discount import DiscountValueType, VoucherType
 from saleor.discount.models import NotApplicable, Voucher
+from saleor.discount.utils import reconcile_voucher_usage
 from saleor.order import OrderEvents, OrderEventsEmails
 from saleor.order.models import OrderEvent
 from saleor.product.models import Category
@@ -302,6 +306,7 @@ def test_view_checkout_summary_finalize_with_voucher(
     assert checkout.pk is None
 
     # Ensure the voucher was updated
+    reconcile_voucher_usage()
     voucher.refresh_from_db(fields=["used"])
     assert voucher.used == expected_voucher_usage_count
 
@@ -1467,3 +1472,49 @@ def test_add_voucher_to_checkout_fail(
         add_voucher_to_checkout(checkout_with_item, voucher_with_high_min_amount_spent)
 
     assert checkout_with_item.voucher_code is None
+
+
+def test_add_variants_to_checkout(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    add_variant_to_checkout(checkout, variants[0], 2)
+
+    add_variants_to_checkout(
+        checkout, [variants[0], variants[1], variants[1]], [1, 3, 2]
+    )
+
+    quantities = {line.variant: line.quantity for line in checkout.lines.all()}
+    assert quantities == {variants[0]: 3, variants[1]: 5}
+    assert checkout.quantity == 8
+
+
+def test_add_variants_to_checkout_replace(checkout, product_list):
+    variants = [product.variants.get() for product in product_list]
+    add_variants_to_checkout(checkout, variants[:2], [2, 2])
+
+    add_variants_to_checkout(checkout, variants[:2], [5, 0], replace=True)
+
+    quantities = {line.variant: line.quantity for line in checkout.lines.all()}
+    assert quantities == {variants[0]: 5}
+    assert checkout.quantity == 5
+
+
+def test_add_variants_to_checkout_insufficient_stock(checkout, product_list):
+    variant = product_list[0].variants.get()
+    add_variant_to_checkout(checkout, variant, 90)
+
+    with pytest.raises(InsufficientStock):
+        add_variants_to_checkout(checkout, [variant], [20])
+
+
+def test_add_variants_to_checkout_queries_do_not_depend_on_lines(
+    checkout, product_list
+):
+    variants = [product.variants.get() for product in product_list]
+    with CaptureQueriesContext(connection) as single_line:
+        add_variants_to_checkout(checkout, variants[:1], [1])
+    checkout.lines.all().delete()
+
+    with CaptureQueriesContext(connection) as many_lines:
+        add_variants_to_checkout(checkout, variants, [1, 1, 1])
+
+    assert len(many_lines) == len(single_line)
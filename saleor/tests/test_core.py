@@ -1,18 +1,25 @@
 import io
+import json
+import os
 from contextlib import redirect_stdout
 from unittest.mock import Mock, patch
 from urllib.parse import urljoin
 
 import pytest
+from django.core.management import CommandError, call_command
 from django.shortcuts import reverse
 from django.templatetags.static import static
 from django.test import Client, override_settings
 from django.urls import translate_url
+from django.utils import translation
+from django_prices.templatetags import prices_i18n
 from measurement.measures import Weight
 from prices import Money
 
 from saleor.account.models import Address, User
+from saleor.core import money_format
 from saleor.core.storages import S3MediaStorage
+from saleor.core.thumbnails import ThumbnailCache, get_image_version
 from saleor.core.utils import (
     Country,
     build_absolute_uri,
@@ -20,15 +27,17 @@ from saleor.core.utils import (
     create_thumbnails,
     format_money,
     get_country_by_ip,
+    get_country_code_by_ip,
     get_currency_for_country,
     random_data,
 )
+from saleor.core.utils.deletion import delete_without_signals
 from saleor.core.utils.text import get_cleaner, strip_html
 from saleor.core.weight import WeightUnits, convert_weight
 from saleor.discount.models import Sale, Voucher
 from saleor.giftcard.models import GiftCard
 from saleor.order.models import Order
-from saleor.product.models import ProductImage
+from saleor.product.models import Category, ProductImage
 from saleor.shipping.models import ShippingZone
 
 type_schema = {
@@ -50,6 +59,24 @@ def test_format_money():
     assert format_money(money) == "$123.99"
 
 
+@pytest.mark.parametrize("language", ["en", "pl", "de", "unknown"])
+@pytest.mark.parametrize("format", ["text", "html"])
+def test_money_format_amount_matches_prices_i18n(language, format):
+    money = Money("1234.5", "USD")
+    with translation.override(language):
+        assert money_format.amount(money, format) == prices_i18n.amount(money, format)
+
+
+def test_money_format_amount_is_memoized():
+    money_format.format_amount.cache_clear()
+    money = Money("10", "EUR")
+    with translation.override("en"):
+        money_format.amount(money)
+        result = money_format.amount(Money("10.00", "EUR"))
+    assert result == "€10.00"
+    assert money_format.format_amount.cache_info().hits == 1
+
+
 @pytest.mark.parametrize(
     "ip_data, expected_country",
     [
@@ -61,11 +88,23 @@ def test_format_money():
     ],
 )
 def test_get_country_by_ip(ip_data, expected_country, monkeypatch):
-    monkeypatch.setattr("saleor.core.utils.georeader.get", Mock(return_value=ip_data))
+    get_country_code_by_ip.cache_clear()
+    georeader = Mock(get=Mock(return_value=ip_data))
+    monkeypatch.setattr("saleor.core.utils.get_georeader", lambda: georeader)
     country = get_country_by_ip("127.0.0.1")
     assert country == expected_country
 
 
+def test_get_country_by_ip_is_cached(monkeypatch):
+    get_country_code_by_ip.cache_clear()
+    georeader = Mock(get=Mock(return_value={"country": {"iso_code": "PL"}}))
+    monkeypatch.setattr("saleor.core.utils.get_georeader", lambda: georeader)
+
+    assert get_country_by_ip("127.0.0.1") == Country("PL")
+    assert get_country_by_ip("127.0.0.1") == Country("PL")
+    georeader.get.assert_called_once_with("127.0.0.1")
+
+
 @pytest.mark.parametrize(
     "country, expected_currency",
     [(Country("PL"), "PLN"), (Country("US"), "USD"), (Country("GB"), "GBP")],
@@ -75,6 +114,10 @@ def test_get_currency_for_country(country, expected_currency, monkeypatch):
     assert currency == expected_currency
 
 
+def test_get_currency_for_unknown_country(settings):
+    assert get_currency_for_country(Country("XX")) == settings.DEFAULT_CURRENCY
+
+
 def test_create_superuser(db, client, media_root):
     credentials = {"email": "admin@example.com", "password": "admin"}
     # Test admin creation
@@ -299,3 +342,200 @@ def test_csrf_middleware_is_enabled():
     checkout_url = reverse("checkout:index")
     response = csrf_client.post(checkout_url)
     assert response.status_code == 403
+
+
+def test_create_thumbnails_command(product_with_image, tmpdir, settings):
+    sizeset = settings.VERSATILEIMAGEFIELD_RENDITION_KEY_SETS["products"]
+    product_image = product_with_image.images.first()
+    state_file = str(tmpdir.join("state.json"))
+    out = io.StringIO()
+
+    call_command("create_thumbnails", processes=1, state_file=state_file, stdout=out)
+
+    for _, method_size in sizeset:
+        method, size = method_size.split("__")
+        rendition = getattr(product_image.image, method)[size]
+        assert product_image.image.storage.exists(rendition.name)
+    assert "created %d thumbnails" % len(sizeset) in out.getvalue()
+    assert not os.path.exists(state_file)
+
+
+def test_create_thumbnails_command_skips_existing(product_with_image, tmpdir):
+    state_file = str(tmpdir.join("state.json"))
+    call_command("create_thumbnails", processes=1, state_file=state_file)
+    out = io.StringIO()
+
+    call_command("create_thumbnails", processes=1, state_file=state_file, stdout=out)
+
+    assert "created 0 thumbnails" in out.getvalue()
+
+
+def test_create_thumbnails_command_resumes(product_with_image, tmpdir):
+    product_image = product_with_image.images.first()
+    state_file = tmpdir.join("state.json")
+    start = product_image.pk // 500 * 500
+    finished = "products:product.ProductImage:image:%d-%d" % (start, start + 500)
+    state_file.write(json.dumps({"chunk_size": 500, "finished": [finished]}))
+    out = io.StringIO()
+
+    call_command(
+        "create_thumbnails", processes=1, state_file=str(state_file), stdout=out
+    )
+
+    assert "Processed 0 images" in out.getvalue()
+
+
+def test_create_thumbnails_command_rejects_other_chunk_size(product_with_image, tmpdir):
+    state_file = tmpdir.join("state.json")
+    state_file.write(json.dumps({"chunk_size": 100, "finished": []}))
+
+    with pytest.raises(CommandError):
+        call_command(
+            "create_thumbnails",
+            processes=1,
+            chunk_size=500,
+            state_file=str(state_file),
+        )
+
+
+@pytest.fixture
+def thumbnail_cache_dir(tmpdir, settings):
+    settings.THUMBNAIL_CACHE_DIR = str(tmpdir.mkdir("thumbnail-cache"))
+    return settings.THUMBNAIL_CACHE_DIR
+
+
+def get_thumbnail_url(product_image, size="540x540", version=None):
+    return reverse(
+        "thumbnail",
+        kwargs={
+            "model_key": "product-image",
+            "pk": product_image.pk,
+            "version": version or get_image_version(product_image.image),
+            "method": "thumbnail",
+            "size": size,
+        },
+    )
+
+
+def test_thumbnail_view_renders_thumbnail(
+    client, product_with_image, thumbnail_cache_dir
+):
+    product_image = product_with_image.images.first()
+
+    response = client.get(get_thumbnail_url(product_image))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["ETag"]
+    assert response["Last-Modified"]
+    assert b"".join(response.streaming_content)
+    rendition = product_image.image.thumbnail["540x540"]
+    assert not product_image.image.storage.exists(rendition.name)
+
+
+@patch("saleor.core.thumbnails.render_thumbnail", return_value=b"thumbnail")
+def test_thumbnail_view_renders_thumbnail_once(
+    mocked_render, client, product_with_image, thumbnail_cache_dir
+):
+    url = get_thumbnail_url(product_with_image.images.first())
+
+    client.get(url)
+    client.get(url)
+
+    mocked_render.assert_called_once()
+
+
+def test_thumbnail_view_not_modified(client, product_with_image, thumbnail_cache_dir):
+    url = get_thumbnail_url(product_with_image.images.first())
+    response = client.get(url)
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    assert response.status_code == 304
+
+
+def test_thumbnail_view_redirects_outdated_version(
+    client, product_with_image, thumbnail_cache_dir
+):
+    product_image = product_with_image.images.first()
+
+    response = client.get(get_thumbnail_url(product_image, version="0123456789ab"))
+
+    assert response.status_code == 302
+    assert response["Location"] == get_thumbnail_url(product_image)
+
+
+def test_thumbnail_view_does_not_serve_avatars(client, staff_user, thumbnail_cache_dir):
+    url = "/thumbnail/user/%s/0123456789ab/thumbnail/540x540/" % staff_user.pk
+
+    response = client.get(url)
+
+    assert response.status_code == 404
+
+
+def test_thumbnail_view_size_not_allowed(
+    client, product_with_image, thumbnail_cache_dir
+):
+    url = get_thumbnail_url(product_with_image.images.first(), size="333x333")
+
+    response = client.get(url)
+
+    assert response.status_code == 404
+
+
+@patch("saleor.core.thumbnails.render_thumbnail", return_value=b"x" * 10)
+def test_thumbnail_cache_evicts_least_recently_used(
+    mocked_render, product_with_images, thumbnail_cache_dir
+):
+    first_image, second_image = [
+        image.image for image in product_with_images.images.all()
+    ]
+    cache = ThumbnailCache(thumbnail_cache_dir, max_size=15)
+    _, first_path = cache.get_or_render(first_image, "thumbnail", "540x540")
+    os.utime(first_path, (0, 0))
+
+    _, second_path = cache.get_or_render(second_image, "thumbnail", "540x540")
+
+    assert not os.path.exists(first_path)
+    assert os.path.exists(second_path)
+
+
+@patch("saleor.core.thumbnails.ThumbnailCache.evict")
+@patch("saleor.core.thumbnails.render_thumbnail", return_value=b"x" * 10)
+def test_thumbnail_cache_tracks_size_without_walking(
+    mocked_render, mocked_evict, product_with_images, thumbnail_cache_dir
+):
+    first_image, second_image = [
+        image.image for image in product_with_images.images.all()
+    ]
+    cache = ThumbnailCache(thumbnail_cache_dir, max_size=100)
+    cache.get_or_render(first_image, "thumbnail", "540x540")
+
+    with patch.object(cache, "get_entries") as mocked_get_entries:
+        cache.get_or_render(second_image, "thumbnail", "540x540")
+
+    mocked_get_entries.assert_not_called()
+    mocked_evict.assert_not_called()
+    with open(os.path.join(thumbnail_cache_dir, ".size")) as size_file:
+        assert size_file.read() == "20"
+
+
+def test_delete_without_signals(sale, category, voucher, order):
+    order.voucher = voucher
+    order.save()
+    sale.translations.create(language_code="pl", name="Promocja")
+
+    assert delete_without_signals(Sale.objects.filter(pk=sale.pk)) == 1
+    assert delete_without_signals(Voucher.objects.filter(pk=voucher.pk)) == 1
+
+    assert not Sale.objects.exists()
+    assert not Sale.categories.through.objects.exists()
+    assert Category.objects.filter(pk=category.pk).exists()
+    order.refresh_from_db()
+    assert order.voucher is None
+
+
+def test_delete_without_signals_rejects_self_references(category):
+    with pytest.raises(ValueError):
+        delete_without_signals(Category.objects.all())
+    assert Category.objects.filter(pk=category.pk).exists()
@@ -6,14 +6,16 @@ from prices import Money
 
 from saleor.checkout.utils import get_voucher_discount_for_checkout
 from saleor.discount import DiscountInfo, DiscountValueType, VoucherType
-from saleor.discount.models import NotApplicable, Sale, Voucher
+from saleor.discount.models import NotApplicable, Sale, Voucher, VoucherUsageCounter
 from saleor.discount.utils import (
     decrease_voucher_usage,
+    get_active_voucher,
     get_product_discount_on_sale,
     get_products_voucher_discount,
     get_shipping_voucher_discount,
     get_value_voucher_discount,
     increase_voucher_usage,
+    reconcile_voucher_usage,
 )
 from saleor.product.models import Product, ProductVariant
 
@@ -181,6 +183,67 @@ def test_decrease_voucher_usage():
     assert voucher.used == 9
 
 
+def test_increase_voucher_usage_limit_reached():
+    voucher = Voucher.objects.create(
+        code="unique", discount_value=10, usage_limit=1, used=1
+    )
+    assert not increase_voucher_usage(voucher)
+    voucher.refresh_from_db()
+    assert voucher.used == 1
+
+
+def test_voucher_usage_without_limit_is_reconciled(voucher):
+    increase_voucher_usage(voucher)
+    increase_voucher_usage(voucher)
+    decrease_voucher_usage(voucher)
+    voucher.refresh_from_db()
+    assert voucher.used == 0
+
+    reconcile_voucher_usage()
+
+    voucher.refresh_from_db()
+    assert voucher.used == 1
+    assert not VoucherUsageCounter.objects.exclude(used=0).exists()
+
+
+def test_setting_voucher_usage_limit_reconciles_usage(voucher):
+    increase_voucher_usage(voucher)
+
+    voucher.usage_limit = 1
+    voucher.save()
+
+    voucher.refresh_from_db()
+    assert voucher.used == 1
+    assert not increase_voucher_usage(voucher)
+
+
+def test_get_active_voucher_is_cached(voucher, django_assert_num_queries):
+    assert get_active_voucher(voucher.code) == voucher
+    assert get_active_voucher("missing") is None
+    with django_assert_num_queries(0):
+        assert get_active_voucher(voucher.code) == voucher
+        assert get_active_voucher("missing") is None
+
+
+def test_get_active_voucher_invalidated_on_save(voucher):
+    assert get_active_voucher(voucher.code) == voucher
+
+    voucher.end_date = timezone.now() - timedelta(days=1)
+    voucher.save()
+
+    assert get_active_voucher(voucher.code) is None
+
+
+def test_get_active_voucher_usage_limit_reached(voucher):
+    voucher.usage_limit = 1
+    voucher.save()
+    assert get_active_voucher(voucher.code) == voucher
+
+    increase_voucher_usage(voucher)
+
+    assert get_active_voucher(voucher.code) is None
+
+
 @pytest.mark.parametrize(
     "total, min_amount_spent, total_quantity, min_checkout_items_quantity, "
     "discount_value, discount_value_type, expected_value",
@@ -1,12 +1,19 @@
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
 from unittest import mock
 
 import pytest
+from django.core import mail
 from django.templatetags.static import static
-from templated_email import get_connection
 
 import saleor.order.emails as emails
-from saleor.core.emails import get_email_base_context
+from saleor.core.emails import (
+    close_pooled_email_connection,
+    get_email_base_context,
+    send_email_messages,
+)
 from saleor.core.utils import build_absolute_uri
+from saleor.order import OrderEvents, OrderEventsEmails
+from saleor.order.models import Order, OrderEvent
 from saleor.order.utils import add_variant_to_order
 
 
@@ -61,27 +68,19 @@ def test_collect_data_for_email(order):
         (emails.send_order_confirmation, emails.CONFIRM_ORDER_TEMPLATE),
     ],
 )
-@mock.patch("saleor.order.emails.send_templated_mail")
-def test_send_emails(mocked_templated_email, order, template, send_email, settings):
+def test_send_emails(order, template, send_email, settings):
     send_email(order.pk)
-    email_data = emails.collect_data_for_email(order.pk, template)
-
-    recipients = [order.get_user_current_email()]
 
-    expected_call_kwargs = {
-        "context": email_data["context"],
-        "from_email": settings.ORDER_FROM_EMAIL,
-        "template_name": template,
+    message = mail.outbox[0]
+    assert len(mail.outbox) == 1
+    assert message.to == [order.get_user_current_email()]
+    assert message.from_email == settings.ORDER_FROM_EMAIL
+    event = OrderEvent.objects.get(order=order, type=OrderEvents.EMAIL_SENT)
+    assert event.parameters == {
+        "email": order.get_user_current_email(),
+        "email_type": emails.EMAIL_TYPES[template],
     }
 
-    mocked_templated_email.assert_called_once_with(
-        recipient_list=recipients, **expected_call_kwargs
-    )
-
-    # Render the email to ensure there is no error
-    email_connection = get_connection()
-    email_connection.get_email_message(to=recipients, **expected_call_kwargs)
-
 
 @pytest.mark.parametrize(
     "send_email,template",
@@ -90,9 +89,8 @@ def test_send_emails(mocked_templated_email, order, template, send_email, settin
         (emails.send_order_confirmation, emails.CONFIRM_ORDER_TEMPLATE),
     ],
 )
-@mock.patch("saleor.order.emails.send_templated_mail")
 def test_send_confirmation_emails_without_addresses(
-    mocked_templated_email, order, template, send_email, settings, digital_content
+    order, template, send_email, settings, digital_content
 ):
 
     assert not order.lines.count()
@@ -104,23 +102,9 @@ def test_send_confirmation_emails_without_addresses(
     order.save(update_fields=["shipping_address", "shipping_method", "billing_address"])
 
     send_email(order.pk)
-    email_data = emails.collect_data_for_email(order.pk, template)
-
-    recipients = [order.get_user_current_email()]
 
-    expected_call_kwargs = {
-        "context": email_data["context"],
-        "from_email": settings.ORDER_FROM_EMAIL,
-        "template_name": template,
-    }
-
-    mocked_templated_email.assert_called_once_with(
-        recipient_list=recipients, **expected_call_kwargs
-    )
-
-    # Render the email to ensure there is no error
-    email_connection = get_connection()
-    email_connection.get_email_message(to=recipients, **expected_call_kwargs)
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [order.get_user_current_email()]
 
 
 @pytest.mark.parametrize(
@@ -133,28 +117,115 @@ def test_send_confirmation_emails_without_addresses(
         (emails.send_fulfillment_update, emails.UPDATE_FULFILLMENT_TEMPLATE),
     ],
 )
-@mock.patch("saleor.order.emails.send_templated_mail")
 def test_send_fulfillment_emails(
-    mocked_templated_email, template, send_email, fulfilled_order, settings
+    template, send_email, fulfilled_order, staff_user, settings
 ):
     fulfillment = fulfilled_order.fulfillments.first()
-    send_email(order_pk=fulfilled_order.pk, fulfillment_pk=fulfillment.pk)
-    email_data = emails.collect_data_for_fullfillment_email(
-        fulfilled_order.pk, template, fulfillment.pk
+    send_email(
+        order_pk=fulfilled_order.pk,
+        fulfillment_pk=fulfillment.pk,
+        user_pk=staff_user.pk,
     )
 
-    recipients = [fulfilled_order.get_user_current_email()]
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [fulfilled_order.get_user_current_email()]
+    event = OrderEvent.objects.get(type=OrderEvents.EMAIL_SENT)
+    assert event.user == staff_user
+    assert event.parameters["email_type"] == emails.EMAIL_TYPES[template]
 
-    expected_call_kwargs = {
-        "context": email_data["context"],
-        "from_email": settings.ORDER_FROM_EMAIL,
-        "template_name": template,
-    }
 
-    mocked_templated_email.assert_called_once_with(
-        recipient_list=recipients, **expected_call_kwargs
+@mock.patch("saleor.order.emails.send_email_messages")
+def test_send_order_emails_records_events_only_for_sent_messages(
+    mocked_send_email_messages, order
+):
+    other_order = Order.objects.create(user_email="other@example.com")
+    mocked_send_email_messages.side_effect = lambda messages: [
+        message for message in messages if message.to == [other_order.user_email]
+    ]
+
+    emails.send_order_emails(emails.CONFIRM_ORDER_TEMPLATE, [order.pk, other_order.pk])
+
+    event = OrderEvent.objects.get(type=OrderEvents.EMAIL_SENT)
+    assert event.order == other_order
+
+
+def test_send_order_emails_skips_orders_without_email(order):
+    order.user = None
+    order.user_email = ""
+    order.save(update_fields=["user", "user_email"])
+
+    emails.send_order_emails(emails.CONFIRM_ORDER_TEMPLATE, [order.pk])
+
+    assert not mail.outbox
+    assert not OrderEvent.objects.exists()
+
+
+def test_send_order_confirmations_batches_messages(order, staff_user, settings):
+    settings.EMAIL_BATCH_SIZE = 1
+    other_order = Order.objects.create(user_email="other@example.com")
+
+    emails.send_order_confirmations([order.pk, other_order.pk], staff_user.pk)
+
+    assert sorted(message.to[0] for message in mail.outbox) == sorted(
+        [order.get_user_current_email(), other_order.user_email]
+    )
+    events = OrderEvent.objects.filter(type=OrderEvents.EMAIL_SENT)
+    assert {event.order for event in events} == {order, other_order}
+    assert all(event.user == staff_user for event in events)
+    assert all(
+        event.parameters["email_type"] == OrderEventsEmails.ORDER for event in events
     )
 
-    # Render the email to ensure there is no error
-    email_connection = get_connection()
-    email_connection.get_email_message(to=recipients, **expected_call_kwargs)
+
+@mock.patch("saleor.order.emails.send_order_confirmations.delay")
+def test_queue_order_confirmations_splits_batches(mocked_task, settings):
+    settings.EMAIL_BATCH_SIZE = 2
+
+    emails.queue_order_confirmations([1, 2, 3], user_pk=4)
+
+    mocked_task.assert_has_calls([mock.call([1, 2], 4), mock.call([3], 4)])
+
+
+@mock.patch("saleor.core.emails.get_connection")
+def test_send_email_messages_reuses_connection(mocked_get_connection):
+    connection = mocked_get_connection.return_value
+    connection.send_messages.return_value = 1
+    close_pooled_email_connection()
+
+    sent = send_email_messages(["first", "second"])
+
+    assert sent == ["first", "second"]
+    mocked_get_connection.assert_called_once_with()
+    connection.send_messages.assert_has_calls(
+        [mock.call(["first"]), mock.call(["second"])]
+    )
+    close_pooled_email_connection()
+
+
+@mock.patch("saleor.core.emails.get_connection")
+def test_send_email_messages_reconnects_after_disconnect(mocked_get_connection):
+    connection = mocked_get_connection.return_value
+    connection.send_messages.side_effect = [SMTPServerDisconnected(), 1]
+    close_pooled_email_connection()
+
+    sent = send_email_messages(["message"])
+
+    assert sent == ["message"]
+    assert mocked_get_connection.call_count == 2
+    close_pooled_email_connection()
+
+
+@mock.patch("saleor.core.emails.get_connection")
+def test_send_email_messages_skips_refused_messages(mocked_get_connection):
+    refused = mock.Mock(to=["refused@example.com"])
+    connection = mocked_get_connection.return_value
+    connection.send_messages.side_effect = [
+        SMTPRecipientsRefused({"refused@example.com": (550, b"Unknown user")}),
+        1,
+    ]
+    close_pooled_email_connection()
+
+    sent = send_email_messages([refused, "message"])
+
+    assert sent == ["message"]
+    close_pooled_email_connection()
@@ -2,16 +2,26 @@ from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import translation
 from prices import Money, TaxedMoney
 
 from saleor.account import events as account_events
-from saleor.account.models import User
+from saleor.account.models import CustomerStats, User
 from saleor.checkout.utils import create_order, prepare_order_data
 from saleor.core.exceptions import InsufficientStock
 from saleor.core.weight import zero_weight
 from saleor.order import FulfillmentStatus, OrderStatus, events as order_events, models
-from saleor.order.models import Fulfillment, Order
+from saleor.order.models import Fulfillment, Order, OrderEvent
+from saleor.order.pdf import get_order_content_hash
+from saleor.order.search import (
+    prepare_order_customer_search_document,
+    search_orders_by_customer,
+    update_user_orders_customer_search_document,
+)
+from saleor.order.signals import update_statistics
+from saleor.order.statistics import get_homepage_events, get_orders_total
 from saleor.order.utils import (
     add_variant_to_order,
     automatically_fulfill_digital_lines,
@@ -23,11 +33,13 @@ from saleor.order.utils import (
     recalculate_order,
     restock_fulfillment_lines,
     restock_order_lines,
+    update_customer_stats,
     update_order_prices,
     update_order_status,
 )
 from saleor.payment import ChargeStatus
 from saleor.payment.models import Payment
+from saleor.payment.utils import gateway_refund
 from saleor.product.models import DigitalContent
 from tests.utils import create_image, get_redirect_location
 
@@ -702,3 +714,191 @@ def test_fulfill_order_line_without_inventory_tracking(order_with_lines):
     variant.refresh_from_db()
     assert variant.quantity == stock_quantity_after
     assert line.quantity_fulfilled == quantity_fulfilled_before + line.quantity
+
+
+def test_order_customer_search_document_filled_on_create(customer_user):
+    order = Order.objects.create(user=customer_user, user_email="guest@example.com")
+
+    document = order.customer_search_document
+    assert "guest@example.com" in document
+    assert customer_user.email.lower() in document
+    assert customer_user.default_billing_address.first_name.lower() in document
+    assert customer_user.default_billing_address.last_name.lower() in document
+    assert document == document.lower()
+
+
+def test_order_customer_search_document_updated_on_user_change(customer_user):
+    order = Order.objects.create(user=customer_user)
+
+    customer_user.first_name = "Arthur"
+    customer_user.save(update_fields=["first_name"])
+
+    order.refresh_from_db()
+    assert "arthur" in order.customer_search_document
+    assert search_orders_by_customer(Order.objects.all(), "ARTH").exists()
+
+
+def test_order_customer_search_document_updated_on_address_change(customer_user):
+    order = Order.objects.create(user=customer_user)
+    address = customer_user.default_billing_address
+
+    address.last_name = "Dent"
+    address.save()
+
+    order.refresh_from_db()
+    assert "dent" in order.customer_search_document
+
+
+def test_order_customer_search_document_without_user_email(customer_user):
+    order = Order.objects.create(user=customer_user)
+
+    customer_user.first_name = "Arthur"
+    customer_user.save(update_fields=["first_name"])
+
+    order.refresh_from_db()
+    assert order.customer_search_document == prepare_order_customer_search_document(
+        order
+    )
+    assert not order.customer_search_document.startswith(" ")
+
+
+def test_update_user_orders_customer_search_document_per_email(
+    customer_user, django_assert_num_queries
+):
+    for _ in range(3):
+        Order.objects.create(user=customer_user, user_email=customer_user.email)
+    customer_user.default_billing_address
+
+    # One query for the emails and one update per email
+    with django_assert_num_queries(2):
+        update_user_orders_customer_search_document(customer_user)
+
+
+def test_order_content_hash_changes_with_order(order_with_lines):
+    content_hash = get_order_content_hash(order_with_lines)
+    assert get_order_content_hash(order_with_lines) == content_hash
+
+    line = order_with_lines.lines.first()
+    line.quantity += 1
+    line.save()
+    order_with_lines = Order.objects.get(pk=order_with_lines.pk)
+
+    assert get_order_content_hash(order_with_lines) != content_hash
+
+
+def test_order_content_hash_changes_with_language(order_with_lines):
+    with translation.override("en"):
+        content_hash = get_order_content_hash(order_with_lines)
+    with translation.override("pl"):
+        assert get_order_content_hash(order_with_lines) != content_hash
+
+
+@patch("saleor.order.pdf.get_templates_version")
+def test_order_content_hash_changes_with_templates(
+    mocked_templates_version, order_with_lines
+):
+    mocked_templates_version.return_value = "1"
+    content_hash = get_order_content_hash(order_with_lines)
+
+    mocked_templates_version.return_value = "2"
+    assert get_order_content_hash(order_with_lines) != content_hash
+
+
+def test_update_customer_stats(order_with_lines, customer_user):
+    Order.objects.create(user=customer_user, status=OrderStatus.DRAFT)
+
+    update_customer_stats([customer_user.pk])
+
+    stats = CustomerStats.objects.get(user=customer_user)
+    assert stats.number_of_orders == 1
+    assert stats.money_spent == order_with_lines.total.gross
+    assert stats.last_order_date == order_with_lines.created
+
+
+def test_cancel_order_updates_customer_stats(order_with_lines, customer_user):
+    update_customer_stats([customer_user.pk])
+
+    cancel_order(customer_user, order_with_lines, restock=False)
+
+    stats = CustomerStats.objects.get(user=customer_user)
+    assert stats.number_of_orders == 0
+    assert stats.money_spent.amount == 0
+
+
+def test_refund_updates_customer_stats(payment_txn_captured, customer_user):
+    order = payment_txn_captured.order
+
+    gateway_refund(payment_txn_captured, amount=Decimal(10))
+
+    stats = CustomerStats.objects.get(user=customer_user)
+    assert stats.number_of_orders == 1
+    assert stats.money_spent.amount == order.total.gross.amount - 10
+
+
+def test_update_customer_stats_command(order_with_lines, customer_user):
+    CustomerStats.objects.all().delete()
+
+    call_command("update_customer_stats")
+
+    stats = CustomerStats.objects.get(user=customer_user)
+    assert stats.number_of_orders == 1
+
+
+def test_get_orders_total_uses_running_sums(
+    order_with_lines, django_assert_num_queries
+):
+    start_date = order_with_lines.created.replace(hour=0, minute=0, second=0)
+    assert get_orders_total(start_date) == order_with_lines.total
+
+    event = OrderEvent.objects.create(
+        order=order_with_lines, type=order_events.OrderEvents.PLACED
+    )
+    with django_assert_num_queries(0):
+        update_statistics(event)
+        total = get_orders_total(start_date)
+    assert total == order_with_lines.total * 2
+
+
+def test_get_orders_total_skips_canceled_orders(order_with_lines):
+    start_date = order_with_lines.created.replace(hour=0, minute=0, second=0)
+    assert get_orders_total(start_date) == order_with_lines.total
+
+    event = OrderEvent.objects.create(
+        order=order_with_lines, type=order_events.OrderEvents.CANCELED
+    )
+    update_statistics(event)
+
+    zero = Money(0, "USD")
+    assert get_orders_total(start_date) == TaxedMoney(net=zero, gross=zero)
+
+
+def test_get_homepage_events(order, django_assert_num_queries):
+    placed = OrderEvent.objects.create(
+        order=order, type=order_events.OrderEvents.PLACED
+    )
+    OrderEvent.objects.create(order=order, type=order_events.OrderEvents.CANCELED)
+    assert list(get_homepage_events()) == [placed]
+
+    paid = OrderEvent.objects.create(
+        order=order, type=order_events.OrderEvents.ORDER_FULLY_PAID
+    )
+    # Only the events are queried, their ids are updated in the cache
+    with django_assert_num_queries(1):
+        update_statistics(paid)
+        events = list(get_homepage_events())
+    assert events == [placed, paid]
+
+
+@patch("saleor.order.statistics.HOMEPAGE_EVENTS_LIMIT", 2)
+def test_get_homepage_events_limit(order):
+    events = [
+        OrderEvent.objects.create(order=order, type=order_events.OrderEvents.PLACED)
+        for _ in range(3)
+    ]
+    assert list(get_homepage_events()) == events[1:]
+
+    event = OrderEvent.objects.create(
+        order=order, type=order_events.OrderEvents.ORDER_FULLY_PAID
+    )
+    update_statistics(event)
+    assert list(get_homepage_events()) == [events[2], event]
@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 import pytest
 from django.core.exceptions import ImproperlyConfigured
 
-from saleor.order.events import OrderEvents, OrderEventsEmails
+from saleor.order.events import OrderEvents
 from saleor.payment import (
     ChargeStatus,
     GatewayError,
@@ -133,14 +133,9 @@ def test_handle_fully_paid_order_no_email(mock_send_payment_confirmation, order)
 @patch("saleor.order.emails.send_payment_confirmation.delay")
 def test_handle_fully_paid_order(mock_send_payment_confirmation, order):
     handle_fully_paid_order(order)
-    event_order_paid, event_email_sent = order.events.all()
-    assert event_order_paid.type == OrderEvents.ORDER_FULLY_PAID
-
-    assert event_email_sent.type == OrderEvents.EMAIL_SENT
-    assert event_email_sent.parameters == {
-        "email": order.get_user_current_email(),
-        "email_type": OrderEventsEmails.PAYMENT,
-    }
+    # The email sent event is recorded by the task once the email is delivered
+    event = order.events.get()
+    assert event.type == OrderEvents.ORDER_FULLY_PAID
 
     mock_send_payment_confirmation.assert_called_once_with(order.pk)
 
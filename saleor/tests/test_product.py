@@ -29,10 +29,17 @@ from saleor.product.utils import (
     increase_stock,
 )
 from saleor.product.utils.attributes import get_product_attributes_data
-from saleor.product.utils.availability import get_product_availability_status
+from saleor.product.utils.availability import (
+    get_product_availability_status,
+    products_with_availability,
+)
 from saleor.product.utils.costs import get_margin_for_variant
 from saleor.product.utils.digital_products import increment_download_count
-from saleor.product.utils.variants_picker import get_variant_picker_data
+from saleor.product.utils.product_cards import render_product_cards
+from saleor.product.utils.variants_picker import (
+    build_variant_picker_data,
+    get_variant_picker_data,
+)
 
 from .utils import filter_products_by_attribute
 
@@ -731,6 +738,62 @@ def test_variant_picker_data_with_translations(
     assert attribute["name"] == translated_variant_fr.name
 
 
+@patch(
+    "saleor.product.utils.variants_picker.build_variant_picker_data",
+    wraps=build_variant_picker_data,
+)
+def test_variant_picker_data_is_cached(mocked_build, product):
+    first = get_variant_picker_data(product, country="US", local_currency="USD")
+    second = get_variant_picker_data(product, country="US", local_currency="USD")
+
+    assert first == second
+    mocked_build.assert_called_once()
+
+
+@patch(
+    "saleor.product.utils.variants_picker.build_variant_picker_data",
+    wraps=build_variant_picker_data,
+)
+def test_variant_picker_data_cache_invalidated_by_stock_and_discounts(
+    mocked_build, product, discount_info
+):
+    get_variant_picker_data(product)
+    variant = product.variants.get()
+    variant.quantity_allocated += 1
+    variant.save()
+    product = models.Product.objects.get(pk=product.pk)
+    get_variant_picker_data(product)
+    get_variant_picker_data(product, discounts=[discount_info])
+
+    assert mocked_build.call_count == 3
+
+
+@patch(
+    "saleor.product.utils.variants_picker.build_variant_picker_data",
+    wraps=build_variant_picker_data,
+)
+def test_variant_picker_data_cache_invalidated_by_taxes(mocked_build, product):
+    taxes = {"standard": {"value": 23, "tax": None}}
+
+    get_variant_picker_data(product)
+    get_variant_picker_data(product, taxes=taxes)
+    with patch("saleor.core.taxes.display_gross_prices", return_value=False):
+        get_variant_picker_data(product, taxes=taxes)
+
+    assert mocked_build.call_count == 3
+
+
+def test_build_variant_picker_data_applies_discounts(product, discount_info):
+    data = build_variant_picker_data(product, discounts=[discount_info])
+
+    variant = product.variants.get()
+    expected_price = variant.get_price([discount_info])
+    assert data["variants"][0]["price"]["net"] == expected_price.amount
+    price_range = data["availability"]["priceRange"]
+    assert price_range["minPrice"]["net"] == expected_price.amount
+    assert data["availability"]["discount"] is not None
+
+
 def test_get_product_attributes_data_translation(
     product, settings, translated_attribute
 ):
@@ -878,3 +941,47 @@ def test_costs_get_margin_for_variant(variant, price, cost):
     variant.cost_price = cost
     variant.price_override = price
     assert not get_margin_for_variant(variant)
+
+
+@pytest.fixture
+def product_list_request(rf, site_settings):
+    request = rf.get("/")
+    request.discounts = None
+    request.taxes = None
+    request.country = "US"
+    request.currency = "USD"
+    request.site = site_settings.site
+    return request
+
+
+@patch(
+    "saleor.product.utils.product_cards.products_with_availability",
+    wraps=products_with_availability,
+)
+def test_render_product_cards_uses_cache(
+    mocked_availability, product, product_list_request
+):
+    cards = render_product_cards(product_list_request, [product])
+    cached_cards = render_product_cards(product_list_request, [product])
+
+    assert cached_cards == cards
+    assert product.name in cards[0]
+    mocked_availability.assert_called_once()
+
+
+def test_render_product_cards_invalidated_on_variant_change(
+    product, product_list_request
+):
+    render_product_cards(product_list_request, [product])
+    variant = product.variants.first()
+    variant.quantity = 0
+    variant.quantity_allocated = 0
+    variant.save()
+
+    with patch(
+        "saleor.product.utils.product_cards.products_with_availability",
+        wraps=products_with_availability,
+    ) as mocked_availability:
+        render_product_cards(product_list_request, [product])
+
+    mocked_availability.assert_called_once()
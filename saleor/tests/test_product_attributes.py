@@ -1,9 +1,15 @@
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
 
-from saleor.product.models import Attribute, AttributeValue, Product, ProductType
-from saleor.product.tasks import _update_variants_names
+from saleor.product.models import (
+    Attribute,
+    AttributeValue,
+    Product,
+    ProductType,
+    ProductVariant,
+)
+from saleor.product.tasks import _update_variants_names, _update_variants_names_chunk
 from saleor.product.utils.attributes import (
     generate_name_from_values,
     get_attributes_display_map,
@@ -85,6 +91,39 @@ def test_product_type_update_changes_variant_name(product):
     assert product_variant.name == new_name
 
 
+@patch("saleor.product.tasks.VARIANTS_NAMES_CHUNK_SIZE", 1)
+@patch("saleor.product.tasks.update_variants_names_chunk.delay")
+def test_update_variants_names_in_chunks(mock_update_chunk, product):
+    variant = product.variants.first()
+    second_variant = ProductVariant.objects.create(
+        product=product, sku="SKU_B", attributes=variant.attributes
+    )
+    ProductVariant.objects.create(product=product, sku="SKU_C", attributes={})
+    product_type = product.product_type
+    attribute = product_type.variant_attributes.first()
+
+    _update_variants_names(product_type, [attribute])
+
+    assert mock_update_chunk.call_args_list == [
+        call(product_type.pk, [variant.pk]),
+        call(product_type.pk, [second_variant.pk]),
+    ]
+
+
+def test_update_variants_names_chunk_skips_unchanged_names(product):
+    variant = product.variants.first()
+    product_type = product.product_type
+    variant.name = get_name_from_attributes(
+        variant, product_type.variant_attributes.all()
+    )
+    variant.save()
+
+    with patch.object(ProductVariant.objects, "bulk_update") as mock_bulk_update:
+        _update_variants_names_chunk(product_type, [variant.pk])
+
+    mock_bulk_update.assert_called_once_with([], ["name"])
+
+
 def test_update_variants_changed_does_nothing_with_no_attributes():
     product_type = MagicMock(spec=ProductType)
     product_type.variant_attributes.all = Mock(return_value=[])
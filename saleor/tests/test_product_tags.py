@@ -3,7 +3,9 @@ from unittest.mock import Mock, patch
 import pytest
 from django.templatetags.static import static
 from django.test import override_settings
+from django.urls import reverse
 
+from saleor.core.thumbnails import get_image_version
 from saleor.product.templatetags.product_images import (
     choose_placeholder,
     get_product_image_thumbnail,
@@ -130,3 +132,54 @@ def test_choose_placeholder(settings):
 
     # when too big requested, choose the biggest available
     assert choose_placeholder("1500x1500") == settings.PLACEHOLDER_IMAGES[30]
+
+
+@override_settings(
+    VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": False},
+    THUMBNAIL_ON_DEMAND_SIZES=["thumbnail__1080x440"],
+)
+def test_get_thumbnail_on_demand(product_with_image):
+    product_image = product_with_image.images.first()
+
+    url = get_thumbnail(product_image.image, "1080x440", method="thumbnail")
+
+    assert url == reverse(
+        "thumbnail",
+        kwargs={
+            "model_key": "product-image",
+            "pk": product_image.pk,
+            "version": get_image_version(product_image.image),
+            "method": "thumbnail",
+            "size": "1080x440",
+        },
+    )
+
+
+@override_settings(VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": False})
+def test_get_thumbnail_on_demand_when_not_warmed(product_with_image, settings):
+    product_image = product_with_image.images.first()
+    assert "thumbnail__540x540" in settings.THUMBNAIL_ON_DEMAND_SIZES
+
+    url = get_thumbnail(product_image.image, "540x540", method="thumbnail")
+
+    assert url == reverse(
+        "thumbnail",
+        kwargs={
+            "model_key": "product-image",
+            "pk": product_image.pk,
+            "version": get_image_version(product_image.image),
+            "method": "thumbnail",
+            "size": "540x540",
+        },
+    )
+
+
+@override_settings(VERSATILEIMAGEFIELD_SETTINGS={"create_images_on_demand": False})
+def test_get_thumbnail_when_warmed(product_with_image):
+    product_image = product_with_image.images.first()
+    rendition = product_image.image.thumbnail["540x540"]
+
+    with patch.object(product_image.image.storage, "exists", return_value=True):
+        url = get_thumbnail(product_image.image, "540x540", method="thumbnail")
+
+    assert url == rendition.url
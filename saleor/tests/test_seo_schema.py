@@ -1,4 +1,5 @@
 import json
+from unittest.mock import patch
 
 import pytest
 
@@ -6,7 +7,9 @@ from saleor.seo.schema.email import (
     get_order_confirmation_markup,
     get_organization,
     get_product_data,
+    get_products_items_data,
 )
+from saleor.seo.schema.product import get_product_json_ld, product_json_ld
 
 
 def test_get_organization(site_settings):
@@ -50,3 +53,39 @@ def test_get_order_confirmation_markup(order_with_lines):
         json.loads(result)
     except ValueError:
         pytest.fail("Response is not a valid json")
+
+
+def test_get_products_items_data_is_cached(
+    product_with_image, django_assert_num_queries
+):
+    first = get_products_items_data([product_with_image])
+    with django_assert_num_queries(0):
+        second = get_products_items_data([product_with_image])
+
+    assert first == second
+    assert "image" in first[product_with_image.pk]
+
+
+@patch("saleor.seo.schema.product.product_json_ld", wraps=product_json_ld)
+def test_get_product_json_ld_is_cached(mocked_json_ld, product, discount_info):
+    first = get_product_json_ld(product)
+    second = get_product_json_ld(product)
+
+    assert first == second
+    assert first["offers"][0]["sku"] == product.variants.get().sku
+    mocked_json_ld.assert_called_once()
+
+    get_product_json_ld(product, discounts=[discount_info])
+    assert mocked_json_ld.call_count == 2
+
+
+@patch("saleor.seo.schema.product.product_json_ld", wraps=product_json_ld)
+def test_get_product_json_ld_invalidated_by_variant_change(mocked_json_ld, product):
+    get_product_json_ld(product)
+    variant = product.variants.get()
+    variant.quantity = 0
+    variant.save()
+    data = get_product_json_ld(product)
+
+    assert mocked_json_ld.call_count == 2
+    assert data["offers"][0]["availability"] == "http://schema.org/OutOfStock"
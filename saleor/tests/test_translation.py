@@ -1,5 +1,13 @@
 import pytest
 
+from saleor.core.middleware import translations
+from saleor.core.utils.translations import (
+    activate_translation_cache,
+    deactivate_translation_cache,
+    get_translation,
+    get_translation_cache,
+    prefetch_translations,
+)
 from saleor.product.models import (
     AttributeTranslation,
     AttributeValueTranslation,
@@ -137,3 +145,71 @@ def shipping_method_translation(
     assert not shipping_method.translated.name == "French name"
     settings.LANGUAGE_CODE = "fr"
     assert shipping_method.translated.name == "French name"
+
+
+@pytest.fixture
+def translation_cache():
+    activate_translation_cache()
+    yield get_translation_cache()
+    deactivate_translation_cache()
+
+
+def test_translation_cache_queries_once_per_instance(
+    product, product_translation_fr, translation_cache, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        assert get_translation(product, "fr") == product_translation_fr
+        assert get_translation(product, "fr") == product_translation_fr
+
+
+def test_translation_cache_stores_missing_translations(
+    product, translation_cache, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        assert get_translation(product, "fr") is None
+        assert get_translation(product, "fr") is None
+
+
+def test_translation_cache_drops_saved_translation(product, translation_cache):
+    assert get_translation(product, "fr") is None
+
+    translation = ProductTranslation.objects.create(
+        language_code="fr", product=product, name="French name"
+    )
+
+    assert get_translation(product, "fr") == translation
+    translation.name = "New French name"
+    translation.save()
+    assert get_translation(product, "fr").name == "New French name"
+
+
+def test_prefetch_translations_loads_one_query_per_model(
+    product,
+    collection,
+    product_translation_fr,
+    translation_cache,
+    django_assert_num_queries,
+):
+    with django_assert_num_queries(2):
+        prefetch_translations([product, collection], "fr")
+    with django_assert_num_queries(0):
+        assert get_translation(product, "fr") == product_translation_fr
+        assert get_translation(collection, "fr") is None
+
+
+def test_prefetch_translations_without_cache(product, product_translation_fr):
+    prefetch_translations([product], "fr")
+
+    assert "translations" in product._prefetched_objects_cache
+    assert get_translation(product, "fr") == product_translation_fr
+
+
+def test_translations_middleware_deactivates_cache(rf):
+    def get_response(request):
+        assert get_translation_cache() is not None
+        return "response"
+
+    middleware = translations(get_response)
+
+    assert middleware(rf.get("/")) == "response"
+    assert get_translation_cache() is None